@@ -1,22 +1,204 @@
-from fastapi import APIRouter
-from .schema import HealthResp, EmbedReq, EmbedResp, JudgeReq, JudgeResp
-from .model import embed_texts
-from .service import cosine_sim, judge_similarity
+import base64
+import time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import ValidationError
+from .schema import (
+    HealthResp, ReadyResp, EmbedReq, EmbedResp, EmbedFullReq, EmbedFullResp, JudgeReq, JudgeResp, BatchStatsResp, CacheStatsResp, CascadeStatsResp,
+    JudgeBatchReq, JudgeBatchResp, JudgeBatchItemResp, JudgeRefReq,
+    JudgeDetailedReq, JudgeDetailedResp,
+    SearchReq, SearchResp, SearchHit,
+    SentenceItem, SentenceSampleResp, CatalogStatsResp,
+)
+from .model import embed_texts, embed_with_words, batch_stats, cache_stats
+from . import vector_codec
+from .metrics import STAGE_LATENCY, render as render_metrics
+from .catalog import get_catalog
+from .ref_store import get_ref_store
+from .search import get_search_index
+from .startup import state as startup_state
+from .stream import NDJSONStreamingResponse, judge_ndjson
+from .service import budget_errors, cosine_sim, judge_similarity, score_pairs, cascade_stats, word_alignment, record_labels
 
-router = APIRouter()
+def _record_threadpool_wait(request: Request):
+    # sync 의존성은 스레드풀에서 실행되므로, 요청 수신부터 여기까지가 스레드풀 대기 시간
+    start = getattr(request.state, "request_start", None)
+    if start is not None:
+        STAGE_LATENCY.observe(time.perf_counter() - start, "threadpool_wait")
+
+def _require_ready():
+    # 모델 로딩/워밍업이 끝나기 전에는 모델을 쓰는 요청을 받지 않는다
+    if not startup_state.ready:
+        raise HTTPException(status_code=503, detail=f"not ready ({startup_state.phase})",
+                            headers={"Retry-After": "1"})
+
+router = APIRouter(dependencies=[Depends(_record_threadpool_wait)])
+ready = [Depends(_require_ready)]
 
 @router.get("/health", response_model=HealthResp)
 def health():
+    # liveness: 프로세스가 살아 있으면 ok. 기동이 실패했으면(추론 레플리카 사망 포함) 스스로 회복하지 못하므로
+    # 503 을 돌려 오케스트레이터가 재시작하게 한다
+    if startup_state.phase == "failed":
+        return JSONResponse(status_code=503, content=HealthResp(status="failed").model_dump())
     return HealthResp()
 
-@router.post("/embed", response_model=EmbedResp)
+@router.get("/ready", response_model=ReadyResp)
+def ready_probe():
+    # readiness: 모델 로딩과 워밍업이 끝나야 200
+    resp = ReadyResp(
+        status="ready" if startup_state.ready else "not_ready",
+        phase=startup_state.phase,
+        timings=startup_state.timings,
+        error=startup_state.error,
+    )
+    if not startup_state.ready:
+        return JSONResponse(status_code=503, content=resp.model_dump())
+    return resp
+
+@router.post("/embed", response_model=EmbedResp, dependencies=ready)
 def embed(req: EmbedReq):
     v = embed_texts([req.text])[0]
     return EmbedResp(dim=len(v), head=[float(x) for x in v[:8]])
 
-@router.post("/judge", response_model=JudgeResp)
+@router.post("/embed/full", response_model=EmbedFullResp, dependencies=ready,
+             responses={200: {"content": {"application/octet-stream": {}}}})
+def embed_full(req: EmbedFullReq):
+    vecs = embed_texts(req.texts)
+    if req.format == "base64":
+        return EmbedFullResp(
+            shape=list(vecs.shape), dtype=req.dtype,
+            data=base64.b64encode(vector_codec.to_bytes(vecs, req.dtype)).decode("ascii"),
+        )
+    return Response(
+        content=vector_codec.pack(vecs, req.dtype),
+        media_type="application/octet-stream",
+        headers={"X-Embedding-Shape": f"{vecs.shape[0]},{vecs.shape[1]}", "X-Embedding-Dtype": req.dtype},
+    )
+
+@router.post("/judge", response_model=JudgeResp, dependencies=ready)
 def judge(req: JudgeReq):
-    v_en, v_ko = embed_texts([req.en, req.ko])
-    sim = cosine_sim(v_en, v_ko)
+    sims, labels = score_pairs([req.en], [req.ko])
+    return JudgeResp(similarity=round(float(sims[0]), 6), label=labels[0])
+
+@router.post("/judge/batch", response_model=JudgeBatchResp, dependencies=ready)
+def judge_batch(req: JudgeBatchReq):
+    results = [JudgeBatchItemResp(index=i) for i in range(len(req.items))]
+    valid_idx, en, ko = [], [], []
+    for i, raw in enumerate(req.items):
+        try:
+            item = JudgeReq.model_validate(raw)
+        except ValidationError as e:
+            results[i].error = "; ".join(
+                f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            continue
+        valid_idx.append(i)
+        en.append(item.en)
+        ko.append(item.ko)
+
+    # 토큰 예산을 넘는 항목은 그 항목만 에러로 (EMBED_OVERLENGTH=reject)
+    errors = budget_errors(en, ko)
+    for i, err in zip(valid_idx, errors):
+        results[i].error = err
+    keep = [j for j, err in enumerate(errors) if err is None]
+    valid_idx, en, ko = [valid_idx[j] for j in keep], [en[j] for j in keep], [ko[j] for j in keep]
+
+    if valid_idx:
+        sims, labels = score_pairs(en, ko)
+        for i, sim, label in zip(valid_idx, sims.tolist(), labels.tolist()):
+            results[i].similarity = round(sim, 6)
+            results[i].label = label
+
+    return JudgeBatchResp(results=results)
+
+@router.post("/judge/stream", dependencies=ready, response_class=NDJSONStreamingResponse)
+async def judge_stream(request: Request):
+    # 본문(NDJSON)을 읽는 대로 청크 단위로 채점해 결과 줄을 바로 흘려보낸다
+    return NDJSONStreamingResponse(judge_ndjson(request.stream()))
+
+@router.post("/judge/detailed", response_model=JudgeDetailedResp, dependencies=ready)
+def judge_detailed(req: JudgeDetailedReq):
+    # 문장 벡터와 토큰 벡터를 같은 forward pass에서 얻는다 (단어별 개별 인코딩 없음)
+    sent_vecs, ((en_words, en_vecs), (ko_words, ko_vecs)) = embed_with_words([req.en, req.ko])
+    sim = cosine_sim(sent_vecs[0], sent_vecs[1])
     label = judge_similarity(sim)
+    record_labels([label])
+    return JudgeDetailedResp(
+        overall_similarity=round(sim, 6),
+        overall_label=label,
+        word_similarities=word_alignment(en_words, en_vecs, ko_words, ko_vecs),
+    )
+
+@router.post("/judge/ref", response_model=JudgeResp, dependencies=ready)
+def judge_ref(req: JudgeRefReq):
+    store = get_ref_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="reference embeddings not built")
+    v_ref = store.get(req.sentence_id, req.against)
+    if v_ref is None:
+        raise HTTPException(status_code=404, detail=f"sentence {req.sentence_id} not found")
+    # 참조 문장은 미리 계산된 벡터를 쓰고 학습자 답안만 인코딩
+    v_ans = embed_texts([req.answer])[0]
+    sim = cosine_sim(v_ref, v_ans)
+    label = judge_similarity(sim)
+    record_labels([label])
     return JudgeResp(similarity=round(sim, 6), label=label)
+
+@router.post("/search", response_model=SearchResp, dependencies=ready)
+def search(req: SearchReq):
+    index = get_search_index()
+    if index is None:
+        raise HTTPException(status_code=503, detail="reference embeddings not built")
+    try:
+        mode = index.resolve_mode(req.mode, req.against)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    q = embed_texts([req.query])[0]
+    ids, scores = index.search(
+        q, req.k, lang=req.against, mode=mode,
+        difficulty=req.difficulty, category=req.category,
+    )
+    return SearchResp(mode=mode, results=[
+        SearchHit(sentence_id=i, score=round(s, 6)) for i, s in zip(ids.tolist(), scores.tolist())
+    ])
+
+def _require_catalog():
+    catalog = get_catalog()
+    if catalog is None:
+        raise HTTPException(status_code=503, detail="sentence catalog not loaded")
+    return catalog
+
+@router.get("/sentences/sample", response_model=SentenceSampleResp)
+def sentences_sample(
+    n: int = Query(10, ge=1, le=100),
+    difficulty: str | None = None,
+    category: str | None = None,
+    seed: int | None = None,
+):
+    # 모델을 쓰지 않으므로 준비 상태와 무관하게 카탈로그만 로딩되면 응답
+    catalog = _require_catalog()
+    rows, available = catalog.sample(n, difficulty=difficulty, category=category, seed=seed)
+    return SentenceSampleResp(
+        available=available, sentences=[SentenceItem(**catalog.row(i)) for i in rows.tolist()],
+    )
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@router.get("/stats/batch", response_model=BatchStatsResp)
+def stats_batch():
+    return BatchStatsResp(**batch_stats())
+
+@router.get("/stats/cache", response_model=CacheStatsResp)
+def stats_cache():
+    return CacheStatsResp(**cache_stats())
+
+@router.get("/stats/cascade", response_model=CascadeStatsResp)
+def stats_cascade():
+    return CascadeStatsResp(**cascade_stats())
+
+@router.get("/stats/catalog", response_model=CatalogStatsResp)
+def stats_catalog():
+    return CatalogStatsResp(**_require_catalog().stats())
@@ -0,0 +1,148 @@
+"""
+호스트 내 워커 프로세스들이 공유하는 영속 임베딩 캐시 (SQLite, WAL 모드)
+
+키: (모델 키, 정규화 텍스트의 SHA-1), 값: float16 벡터 바이트.
+모델 키는 모델명 + 백엔드(ONNX 면 양자화 설정) + 토큰 예산 (model.disk_cache_model_key). 설정을 바꾸면 다른 항목이 된다.
+재시작/배포 후에도 파일이 남아 있으므로 새 워커가 바로 따뜻한 캐시로 시작한다.
+용량이 상한을 넘으면 오래 조회되지 않은 항목부터 지운다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+import numpy as np
+
+_SQL_LOOKUP_CHUNK = 500
+# 조회 시각 갱신은 이 간격보다 오래된 항목만 (읽기마다 쓰기가 생기지 않도록)
+_TOUCH_INTERVAL_SEC = 3600
+_EVICT_CHECK_EVERY = 1000
+# 상한을 넘으면 상한의 90%까지 줄인다
+_EVICT_TARGET = 0.9
+
+
+def text_key(text: str) -> bytes:
+    return hashlib.sha1(text.encode("utf-8")).digest()
+
+
+class DiskEmbeddingCache:
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._since_evict_check = 0
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, key BLOB NOT NULL, vec BLOB NOT NULL,"
+            " accessed_at INTEGER NOT NULL, PRIMARY KEY (model, key)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_embeddings_accessed ON embeddings (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유하지 않는다
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, texts: List[str], model_name: str) -> List[Optional[np.ndarray]]:
+        keys = [text_key(t) for t in texts]
+        found: dict[bytes, np.ndarray] = {}
+        stale: list[bytes] = []
+        now = int(time.time())
+        conn = self._conn()
+        for lo in range(0, len(keys), _SQL_LOOKUP_CHUNK):
+            chunk = keys[lo:lo + _SQL_LOOKUP_CHUNK]
+            rows = conn.execute(
+                f"SELECT key, vec, accessed_at FROM embeddings WHERE model = ? "
+                f"AND key IN ({','.join('?' * len(chunk))})",
+                [model_name, *chunk],
+            )
+            for key, vec, accessed_at in rows:
+                v = np.frombuffer(vec, dtype="<f2").astype(np.float32)
+                # float16 반올림 오차 보정: 다시 정규화해 embed_texts 계약(L2 정규화)을 유지
+                found[key] = v / max(float(np.linalg.norm(v)), 1e-12)
+                if now - accessed_at > _TOUCH_INTERVAL_SEC:
+                    stale.append(key)
+        if stale:
+            with conn:
+                conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND key = ?",
+                    [(now, model_name, k) for k in stale],
+                )
+        result = [found.get(k) for k in keys]
+        with self._lock:
+            hits = sum(v is not None for v in result)
+            self.hits += hits
+            self.misses += len(result) - hits
+        return result
+
+    def put_many(self, texts: List[str], vecs: np.ndarray, model_name: str):
+        now = int(time.time())
+        rows = [
+            (model_name, text_key(t), np.asarray(v, dtype="<f2").tobytes(), now)
+            for t, v in zip(texts, vecs)
+        ]
+        conn = self._conn()
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, key, vec, accessed_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        with self._lock:
+            self.writes += len(rows)
+            self._since_evict_check += len(rows)
+            check = self._since_evict_check >= _EVICT_CHECK_EVERY
+            if check:
+                self._since_evict_check = 0
+        if check:
+            self._evict_if_needed()
+
+    def size_bytes(self) -> int:
+        conn = self._conn()
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - free) * page_size
+
+    def _evict_if_needed(self):
+        size = self.size_bytes()
+        if size <= self.max_bytes:
+            return
+        conn = self._conn()
+        with conn:
+            total = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            n = max(1, int(total * (1 - self.max_bytes * _EVICT_TARGET / size)) + 1)
+            # 오래 조회되지 않은 순서로 일정 비율 삭제 (빈 페이지는 이후 쓰기에 재사용됨)
+            cur = conn.execute(
+                "DELETE FROM embeddings WHERE (model, key) IN (SELECT model, key FROM embeddings "
+                "ORDER BY accessed_at LIMIT ?)",
+                (n,),
+            )
+        with self._lock:
+            self.evictions += cur.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": str(self.path),
+                "bytes": self.size_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -1,13 +1,49 @@
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from .api import router
-from .model import get_model
+from .catalog import load_catalog_background
+from .metrics import MetricsMiddleware
+from .model import get_model, start_inference_pool, warm_up, InferenceOverloaded, InputTooLong, MODEL_NAME
+from .ref_store import load_ref_store
+from .search import load_search_index
+from .service import CASCADE_ENABLED, CASCADE_SMALL_MODEL
+from .startup import WARMUP_BATCH_SIZES, WARMUP_ENABLED, WARMUP_WORD_COUNTS, state, warmup_texts
+from .worker_pool import close_pools
+
+def _startup_phases():
+    # 서버 기동 시 모델 미리 로딩(콜드스타트 감소)
+    phases = [("model_load", get_model)]
+    if CASCADE_ENABLED:
+        phases.append(("cascade_model", lambda: get_model(CASCADE_SMALL_MODEL)))
+    # INFERENCE_REPLICAS > 0 이면 추론 풀 기동 (첫 요청 전에 띄워야 배처가 레플리카 수를 안다)
+    phases.append(("inference_pool", lambda: start_inference_pool(MODEL_NAME)))
+    # 참조 문장 임베딩(mmap)과 검색 인덱스 로딩. 없으면 /judge/ref, /search 만 비활성
+    phases.append(("ref_store", lambda: load_search_index(load_ref_store(MODEL_NAME))))
+    if WARMUP_ENABLED:
+        phases.append(("warmup", lambda: warm_up(
+            WARMUP_BATCH_SIZES, lambda bs: [warmup_texts(bs, w) for w in WARMUP_WORD_COUNTS],
+        )))
+    return phases
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # 서버 기동 시 모델 미리 로딩(콜드스타트 감소)
-    _ = get_model()
+    # 무거운 기동 단계는 백그라운드에서 실행: /health 는 즉시, /ready 는 준비 완료 후 200
+    state.start_background(_startup_phases())
+    # 문장 카탈로그는 모델과 무관하므로 준비 상태와 따로 올린다 (실패해도 /sentences/sample 만 503)
+    load_catalog_background()
     yield
+    close_pools()
 
 app = FastAPI(title="project-tmi-word", lifespan=lifespan)
 app.include_router(router)
+app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(InferenceOverloaded)
+async def overloaded_handler(request: Request, exc: InferenceOverloaded):
+    # 대기열이 가득 차면 바로 거절해 클라이언트가 재시도/다른 노드로 보내도록 한다
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(InputTooLong)
+async def too_long_handler(request: Request, exc: InputTooLong):
+    return JSONResponse(status_code=413, content={"detail": str(exc)})
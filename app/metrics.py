@@ -0,0 +1,203 @@
+"""
+핫패스 계측용 경량 메트릭 (Prometheus text exposition format)
+
+외부 의존성 없이 Counter / Gauge / Histogram 만 구현한다.
+observe() 는 bisect 한 번과 짧은 lock 구간뿐이라 최대 부하에서도 켜 둘 수 있다.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _fmt_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt_value(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{_fmt_labels(self.labelnames, k)} {_fmt_value(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, *labels, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, help, buckets=LATENCY_BUCKETS, labelnames=()):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value: float, *labels):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            s[i] += 1
+            s[-2] += value
+            s[-1] += 1
+
+    def observe_many(self, values: list, *labels):
+        idx = [bisect.bisect_left(self.buckets, v) for v in values]
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            for i in idx:
+                s[i] += 1
+            s[-2] += sum(values)
+            s[-1] += len(idx)
+
+    @contextmanager
+    def time(self, *labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        lines = self.header()
+        for labels, s in items:
+            cum = 0
+            for b, c in zip(self.buckets + (float("inf"),), s):
+                cum += c
+                le = 'le="+Inf"' if b == float("inf") else f'le="{_fmt_value(b)}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, labels, le)} {cum}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {s[-2]}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {s[-1]}")
+        return lines
+
+
+_registry: list[_Metric] = []
+# 스크레이프 시점에 다른 모듈의 통계(dict)를 게이지로 노출하는 콜백
+_collectors: list[Callable[[], list[str]]] = []
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+def register_collector(fn: Callable[[], list[str]]):
+    _collectors.append(fn)
+
+def gauge_lines(name: str, help: str, values: dict, labelname: Optional[str] = None) -> list[str]:
+    # {라벨값: 값} 또는 라벨 없는 단일 값({"": 값})을 게이지 텍스트로
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+    for k, v in values.items():
+        labels = _fmt_labels((labelname,), (k,)) if labelname else ""
+        lines.append(f"{name}{labels} {_fmt_value(v)}")
+    return lines
+
+def render() -> str:
+    lines = []
+    for m in _registry:
+        lines.extend(m.render())
+    for fn in _collectors:
+        lines.extend(fn())
+    return "\n".join(lines) + "\n"
+
+
+REQUEST_LATENCY = _register(Histogram(
+    "tmi_request_duration_seconds", "HTTP request latency by route", labelnames=("route", "method", "status"),
+))
+STAGE_LATENCY = _register(Histogram(
+    "tmi_stage_duration_seconds",
+    "Hot-path stage latency (threadpool_wait, queue_wait, tokenize, encode, similarity)",
+    labelnames=("stage",),
+))
+BATCH_SIZE = _register(Histogram(
+    "tmi_encode_batch_size", "Texts per encode call", buckets=SIZE_BUCKETS, labelnames=("model",),
+))
+INPUT_TOKENS = _register(Histogram(
+    "tmi_input_tokens", "Tokenized input length per text", buckets=SIZE_BUCKETS,
+))
+JUDGE_LABELS = _register(Counter(
+    "tmi_judge_labels_total", "Judgement label distribution", labelnames=("label",),
+))
+TOKEN_BUDGET = _register(Counter(
+    "tmi_token_budget_total", "Inputs over the per-request token budget", labelnames=("action",),
+))
+MODEL_LOAD_SECONDS = _register(Gauge(
+    "tmi_model_load_seconds", "Model load time at startup", labelnames=("model", "backend"),
+))
+
+
+class MetricsMiddleware:
+    """라우트별 요청 지연을 기록하는 순수 ASGI 미들웨어 (BaseHTTPMiddleware 보다 오버헤드가 작다)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        # 핸들러 진입까지의 대기(threadpool_wait) 측정용
+        scope.setdefault("state", {})["request_start"] = start
+        status = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            REQUEST_LATENCY.observe(time.perf_counter() - start, path, scope["method"], str(status[0]))
@@ -1,17 +1,724 @@
-from functools import lru_cache
-from typing import List
+import itertools
+import json
+import os
+import queue
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from .disk_cache import DiskEmbeddingCache
+from .metrics import (
+    BATCH_SIZE, INPUT_TOKENS, MODEL_LOAD_SECONDS, STAGE_LATENCY, TOKEN_BUDGET, gauge_lines, register_collector,
+)
+from .startup import state as startup_state
+from .worker_pool import InferenceOverloaded, InferenceUnavailable, get_pool, start_pool  # noqa: F401
+
+if TYPE_CHECKING:
+    # torch / sentence_transformers 는 무거우므로 모델을 실제로 로딩할 때 import 한다
+    from sentence_transformers import SentenceTransformer
 
 MODEL_NAME = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
 
-@lru_cache(maxsize=1)
-def get_model() -> SentenceTransformer:
-    # 최초 호출 시 모델을 다운로드/로딩
-    return SentenceTransformer(MODEL_NAME)
+# 추론 백엔드: torch(기본, full precision) / onnx(scripts/export_onnx.py 로 만든 int8 양자화 모델)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+ONNX_ROOT = Path(__file__).parent.parent / "data" / "onnx"
+ONNX_MODEL_DIR = Path(os.getenv("ONNX_MODEL_DIR", ONNX_ROOT / MODEL_NAME.split("/")[-1]))
+ONNX_QUANT_CONFIG = os.getenv("ONNX_QUANT_CONFIG", "avx2")
+
+# 마이크로 배칭 설정: 동시 요청을 최대 EMBED_BATCH_MAX_WAIT_MS 동안 모아 한 번에 encode
+EMBED_BATCHING = os.getenv("EMBED_BATCHING", "1") == "1"
+EMBED_BATCH_MAX_SIZE = int(os.getenv("EMBED_BATCH_MAX_SIZE", "64"))
+EMBED_BATCH_MAX_WAIT_MS = float(os.getenv("EMBED_BATCH_MAX_WAIT_MS", "5"))
+# 추론 대기열 상한. 가득 차면 EMBED_QUEUE_TIMEOUT_MS 만큼 기다린 뒤 InferenceOverloaded (503)
+EMBED_QUEUE_MAX = int(os.getenv("EMBED_QUEUE_MAX", "1024"))
+EMBED_QUEUE_TIMEOUT_MS = float(os.getenv("EMBED_QUEUE_TIMEOUT_MS", "1000"))
+
+# 요청별 토큰 예산. 0이면 모델의 max_seq_length. 넘으면 truncate(잘라서 인코딩) 또는 reject(413)
+EMBED_MAX_TOKENS = int(os.getenv("EMBED_MAX_TOKENS", "0"))
+EMBED_OVERLENGTH = os.getenv("EMBED_OVERLENGTH", "truncate")
+# 토큰 길이 구간 경계. 한 배치 안에서도 구간별로 나눠 encode 해 짧은 입력이 긴 입력 길이로 패딩되지 않게 한다
+EMBED_LENGTH_BUCKETS = [int(x) for x in os.getenv("EMBED_LENGTH_BUCKETS", "16,32,64").split(",") if x]
+# 이 토큰 수를 넘는 텍스트는 대기열에서 후순위. 긴 텍스트만으로 된 요청은 대기열이 EMBED_SHED_QUEUE_DEPTH 이상이면 바로 503 (0이면 끔)
+EMBED_LONG_TOKENS = int(os.getenv("EMBED_LONG_TOKENS", "64"))
+EMBED_SHED_QUEUE_DEPTH = int(os.getenv("EMBED_SHED_QUEUE_DEPTH", "256"))
+# 긴 텍스트는 이만큼 늦게 도착한 것으로 취급 (에이징: 이 시간이 지나면 새로 들어오는 짧은 요청보다 앞선다)
+EMBED_LONG_DELAY_MS = float(os.getenv("EMBED_LONG_DELAY_MS", "500"))
+# 대기열 + 추론까지 기다리는 최대 시간. 넘으면 503 (0이면 무제한)
+EMBED_REQUEST_TIMEOUT_MS = float(os.getenv("EMBED_REQUEST_TIMEOUT_MS", "30000"))
+
+# 멀티 프로세스 추론 풀 (app/worker_pool.py). 0이면 현재 프로세스에서 직접 encode
+INFERENCE_REPLICAS = int(os.getenv("INFERENCE_REPLICAS", "0"))
+INFERENCE_THREADS_PER_REPLICA = int(os.getenv("INFERENCE_THREADS_PER_REPLICA", "0"))
+
+# 프로세스 내 임베딩 캐시 (자주 반복되는 짧은 답안용 LRU)
+EMBED_CACHE_ENABLED = os.getenv("EMBED_CACHE_ENABLED", "1") == "1"
+EMBED_CACHE_MAX_ENTRIES = int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "50000"))
+EMBED_CACHE_MAX_MB = float(os.getenv("EMBED_CACHE_MAX_MB", "256"))
+
+# 워커/재시작 간 공유되는 디스크 캐시 (app/disk_cache.py)
+EMBED_DISK_CACHE_ENABLED = os.getenv("EMBED_DISK_CACHE_ENABLED", "1") == "1"
+EMBED_DISK_CACHE_PATH = Path(os.getenv(
+    "EMBED_DISK_CACHE_PATH", Path(__file__).parent.parent / "data" / "embed_cache.sqlite3"
+))
+EMBED_DISK_CACHE_MAX_MB = float(os.getenv("EMBED_DISK_CACHE_MAX_MB", "2048"))
+
+def onnx_file_name(quant_config: str = ONNX_QUANT_CONFIG) -> str:
+    # export_dynamic_quantized_onnx_model 이 저장하는 파일명 규칙
+    return f"onnx/model_qint8_{quant_config}.onnx"
+
+def onnx_model_dir(model_name: str = MODEL_NAME) -> Path:
+    if model_name == MODEL_NAME:
+        return ONNX_MODEL_DIR
+    return ONNX_ROOT / model_name.split("/")[-1]
+
+def _instrument_tokenize(model: "SentenceTransformer"):
+    # encode 내부의 토크나이즈 단계 시간과 입력 토큰 길이를 기록
+    orig = model.tokenize
+
+    def tokenize(texts):
+        start = time.perf_counter()
+        features = orig(texts)
+        STAGE_LATENCY.observe(time.perf_counter() - start, "tokenize")
+        mask = features.get("attention_mask")
+        if mask is not None:
+            INPUT_TOKENS.observe_many(mask.sum(dim=1).tolist())
+        return features
+
+    model.tokenize = tokenize
+
+def _uninstrument_tokenize(model: "SentenceTransformer"):
+    # 레플리카로 넘길 때는 클로저를 pickle 할 수 없으므로 원래 메서드로 되돌린다
+    model.__dict__.pop("tokenize", None)
+
+@lru_cache(maxsize=4)
+def load_model(backend: str, model_name: str = MODEL_NAME) -> "SentenceTransformer":
+    start = time.perf_counter()
+    model = _load_model(backend, model_name)
+    MODEL_LOAD_SECONDS.set(model_name, backend, value=time.perf_counter() - start)
+    if backend != "tokenizer":
+        _instrument_tokenize(model)
+    return model
+
+class _TokenizerOnly:
+    """
+    onnx + 추론 풀: encode 는 레플리카가 하므로 부모는 토큰 예산 계산용 토크나이저와 max_seq_length 만 둔다
+    (부모에도 ORT 세션을 올리면 모델이 레플리카 수 + 1벌)
+    """
+
+    def __init__(self, path: Path):
+        from transformers import AutoTokenizer
+
+        self.tokenizer = AutoTokenizer.from_pretrained(str(path))
+        config = path / "sentence_bert_config.json"
+        self.max_seq_length = (
+            json.loads(config.read_text(encoding="utf-8"))["max_seq_length"] if config.exists()
+            else self.tokenizer.model_max_length
+        )
+
+def _load_model(backend: str, model_name: str) -> "SentenceTransformer":
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "tokenizer":
+        return _TokenizerOnly(onnx_model_dir(model_name))
+    if backend == "onnx":
+        path = onnx_model_dir(model_name)
+        if not (path / onnx_file_name()).exists():
+            raise RuntimeError(
+                f"ONNX 모델 없음: {path / onnx_file_name()} "
+                "(python scripts/export_onnx.py 를 먼저 실행하세요)"
+            )
+        return SentenceTransformer(
+            str(path), backend="onnx", model_kwargs={"file_name": onnx_file_name()},
+        )
+    raise ValueError(f"unknown EMBED_BACKEND: {backend}")
+
+_load_lock = threading.Lock()
+
+_loaded: dict[str, "SentenceTransformer"] = {}
+
+def get_model(model_name: str = MODEL_NAME) -> "SentenceTransformer":
+    # 최초 호출 시 모델을 다운로드/로딩 (동시 첫 호출에도 한 번만 로딩되도록 lock). 로딩 후에는 lock 없이 반환
+    model = _loaded.get(model_name)
+    if model is not None:
+        return model
+    with _load_lock:
+        model = _loaded.get(model_name)
+        if model is None:
+            model = _loaded[model_name] = load_model(_parent_backend(), model_name)
+        return model
+
+def _parent_backend() -> str:
+    # 가중치를 공유할 수 없는 백엔드(onnx)로 추론 풀을 쓰면 부모는 토크나이저만 로딩
+    return "tokenizer" if EMBED_BACKEND != "torch" and INFERENCE_REPLICAS > 0 else EMBED_BACKEND
+
+def start_inference_pool(model_name: str = MODEL_NAME):
+    # torch: 부모에서 한 번 로딩한 가중치를 레플리카들이 공유 메모리로 함께 쓴다
+    # onnx: ORT 세션은 넘길 수 없으므로 레플리카마다 직접 로딩
+    if INFERENCE_REPLICAS <= 0 or get_pool(model_name) is not None:
+        return
+    share = EMBED_BACKEND == "torch"
+    model = None
+    if share:
+        model = get_model(model_name)
+        _uninstrument_tokenize(model)
+    try:
+        start_pool(
+            model_name, model, partial(_load_model, EMBED_BACKEND, model_name),
+            INFERENCE_REPLICAS, INFERENCE_THREADS_PER_REPLICA,
+            share_weights=share, max_pending=EMBED_QUEUE_MAX, queue_timeout_ms=EMBED_QUEUE_TIMEOUT_MS,
+            # 레플리카가 죽으면 /ready 를 failed 로
+            on_failure=startup_state.fail,
+        )
+    finally:
+        # 레플리카 프로세스로 넘긴 뒤에는 부모 모델의 계측을 되돌린다 (레플리카 쪽 지표는 worker_pool 이 기록)
+        if model is not None:
+            _instrument_tokenize(model)
+
+def warm_up(batch_sizes: List[int], texts_for) -> None:
+    """대표적인 배치 크기 x 문장 길이 조합을 미리 한 번씩 돌려 할당자/커널 경로를 데운다 (캐시는 건드리지 않음)"""
+    for bs in batch_sizes:
+        for texts in texts_for(bs):
+            _encode(texts)
+    embed_with_words(texts_for(1)[-1] * 2)
+
+class InputTooLong(ValueError):
+    """입력이 토큰 예산을 넘음 (EMBED_OVERLENGTH=reject)"""
+
+
+def token_budget(model_name: str = MODEL_NAME) -> int:
+    max_seq = get_model(model_name).max_seq_length
+    return min(EMBED_MAX_TOKENS, max_seq) if EMBED_MAX_TOKENS > 0 else max_seq
+
+def apply_token_budget(texts: List[str], model_name: str = MODEL_NAME) -> tuple[List[str], List[int]]:
+    """
+    토큰 예산을 적용한 텍스트와 각 텍스트의 토큰 수(특수 토큰 포함)를 돌려준다.
+    예산 + 1 토큰까지만 토크나이즈하므로 붙여넣은 긴 문단도 비용이 제한된다.
+    """
+    model = get_model(model_name)
+    budget = token_budget(model_name)
+    enc = model.tokenizer(
+        texts, truncation=True, max_length=budget + 1,
+        return_attention_mask=False, return_offsets_mapping=True,
+    )
+    lengths = [len(ids) for ids in enc["input_ids"]]
+    over = [i for i, n in enumerate(lengths) if n > budget]
+    if not over:
+        return texts, lengths
+    if EMBED_OVERLENGTH == "reject":
+        TOKEN_BUDGET.inc("rejected", amount=len(over))
+        raise InputTooLong(f"input exceeds token budget ({budget} tokens)")
+
+    # 예산 안에 들어가는 마지막 토큰의 끝 위치에서 원문을 자른다
+    keep = budget - model.tokenizer.num_special_tokens_to_add()
+    texts = list(texts)
+    for i in over:
+        # 폭이 0인 토큰(SentencePiece 의 단독 "▁" 등)은 오프셋이 없으므로 남은 토큰 수가 keep 보다 적을 수 있다
+        spans = [(s, e) for s, e in enc["offset_mapping"][i][:keep + 1] if e > s]
+        cut = min(keep, len(spans))
+        texts[i] = texts[i][:spans[cut - 1][1]] if cut > 0 else ""
+        lengths[i] = budget
+    TOKEN_BUDGET.inc("truncated", amount=len(over))
+    return texts, lengths
+
+def over_budget(texts: List[str], model_name: str = MODEL_NAME) -> List[bool]:
+    """
+    EMBED_OVERLENGTH=reject 일 때 항목별로 토큰 예산 초과 여부 (truncate 면 전부 False).
+    일괄 채점에서 초과 항목만 골라 항목별 에러로 돌려주고 나머지는 그대로 채점하기 위한 사전 검사
+    """
+    if EMBED_OVERLENGTH != "reject" or not texts:
+        return [False] * len(texts)
+    budget = token_budget(model_name)
+    enc = get_model(model_name).tokenizer(
+        texts, truncation=True, max_length=budget + 1, return_attention_mask=False,
+    )
+    over = [len(ids) > budget for ids in enc["input_ids"]]
+    TOKEN_BUDGET.inc("rejected", amount=sum(over))
+    return over
+
+def encode_bucketed(encode_fn, texts: List[str], lengths: List[int], buckets: List[int]) -> np.ndarray:
+    # 토큰 길이 구간별로 나눠 encode (패딩 길이 = 구간 안의 최대 길이)
+    if not buckets or len(texts) <= 1:
+        return encode_fn(texts)
+    ids = np.searchsorted(buckets, lengths)
+    groups = np.unique(ids)
+    if len(groups) == 1:
+        return encode_fn(texts)
+    out = None
+    for g in groups:
+        idx = np.flatnonzero(ids == g)
+        vecs = encode_fn([texts[i] for i in idx])
+        if out is None:
+            out = np.empty((len(texts), vecs.shape[1]), dtype=vecs.dtype)
+        out[idx] = vecs
+    return out
+
+def _encode(texts: List[str], model_name: str = MODEL_NAME) -> np.ndarray:
+    BATCH_SIZE.observe(len(texts), model_name)
+    with STAGE_LATENCY.time("encode"):
+        pool = get_pool(model_name)
+        if pool is not None:
+            return pool.encode(texts)
+        model = get_model(model_name)
+        # ndarray(float32), shape = (N, dim)
+        return model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+class _Pending:
+    __slots__ = ("texts", "lengths", "enqueued_at", "done", "result", "error", "cancelled")
+
+    def __init__(self, texts: List[str], lengths: Optional[List[int]] = None):
+        self.texts = texts
+        self.lengths = lengths if lengths is not None else [0] * len(texts)
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # 기다리던 쪽이 시간 초과로 포기한 요청은 배치에 넣지 않는다
+        self.cancelled = False
+
+
+class MicroBatcher:
+    """동시에 들어온 encode 요청을 모아 한 번의 forward pass로 처리하는 스케줄러"""
+
+    def __init__(self, encode_fn, max_batch_size: int, max_wait_ms: float,
+                 concurrency: int = 1, max_queue: int = 0, queue_timeout_ms: float = 0,
+                 length_buckets: Optional[List[int]] = None, long_tokens: int = 0, shed_queue_depth: int = 0,
+                 long_delay_ms: float = 0, request_timeout_ms: float = 0):
+        self._encode_fn = encode_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        # 동시에 처리할 배치 수 (추론 풀 레플리카 수만큼)
+        self.concurrency = concurrency
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.length_buckets = length_buckets or []
+        self.long_tokens = long_tokens
+        self.shed_queue_depth = shed_queue_depth
+        self.long_delay = long_delay_ms / 1000
+        self.request_timeout = request_timeout_ms / 1000
+        # (처리 순서 시각, 순번, 요청): 도착 시각 순. 긴 텍스트는 long_delay 만큼 뒤로 밀리지만
+        # 그 시간이 지나면 새로 들어오는 짧은 요청보다 앞서므로 무한정 밀리지 않는다
+        self._queue: "queue.PriorityQueue[tuple[float, int, _Pending]]" = queue.PriorityQueue(maxsize=max_queue)
+        self._seq = itertools.count()
+        self._threads = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._batches = 0
+        self._requests = 0
+        self._texts = 0
+        self._max_batch = 0
+        self._wait_total = 0.0
+        # 대기 시간 평균의 분모: 대기열 항목 수 (섞인 요청은 짧은/긴 부분 두 항목)
+        self._waits = 0
+        self._wait_max = 0.0
+        self._long = 0
+        self._shed = 0
+
+    def _ensure_started(self):
+        if self._threads is not None:
+            return
+        with self._start_lock:
+            if self._threads is None:
+                threads = [
+                    threading.Thread(target=self._run, name=f"embed-batcher-{i}", daemon=True)
+                    for i in range(self.concurrency)
+                ]
+                for t in threads:
+                    t.start()
+                self._threads = threads
+
+    def submit(self, texts: List[str], lengths: Optional[List[int]] = None) -> np.ndarray:
+        self._ensure_started()
+        with self._stats_lock:
+            # 요청 수는 제출 시점에 한 번만 (나눠 넣는 요청도 1건)
+            self._requests += 1
+        lengths = lengths if lengths is not None else [0] * len(texts)
+        long_idx = [i for i, n in enumerate(lengths) if self.long_tokens > 0 and n > self.long_tokens]
+        if not long_idx:
+            return self._wait([self._put(texts, lengths, False)])[0]
+
+        # 긴 텍스트만으로 된 요청은 대기열이 깊을 때 받지 않는다 (짧은 답안의 p99 보호)
+        shed = len(long_idx) == len(texts) and 0 < self.shed_queue_depth <= self._queue.qsize()
+        with self._stats_lock:
+            self._long += 1
+            self._shed += shed
+        if shed:
+            raise InferenceOverloaded(f"long input shed (queue depth >= {self.shed_queue_depth})")
+        if len(long_idx) == len(texts):
+            return self._wait([self._put(texts, lengths, True)])[0]
+
+        # 섞인 요청은 긴 텍스트만 뒤로 미루고 나머지는 보통 순서로 처리
+        long_set = set(long_idx)
+        short_idx = [i for i in range(len(texts)) if i not in long_set]
+        parts = [self._put([texts[i] for i in short_idx], [lengths[i] for i in short_idx], False)]
+        try:
+            parts.append(self._put([texts[i] for i in long_idx], [lengths[i] for i in long_idx], True))
+        except InferenceOverloaded:
+            parts[0].cancelled = True
+            raise
+        short_vecs, long_vecs = self._wait(parts)
+        out = np.empty((len(texts), short_vecs.shape[1]), dtype=short_vecs.dtype)
+        out[short_idx] = short_vecs
+        out[long_idx] = long_vecs
+        return out
+
+    def _put(self, texts: List[str], lengths: List[int], long: bool) -> _Pending:
+        p = _Pending(texts, lengths)
+        key = p.enqueued_at + (self.long_delay if long else 0.0)
+        try:
+            self._queue.put((key, next(self._seq), p), timeout=self.queue_timeout)
+        except queue.Full:
+            raise InferenceOverloaded(f"inference queue full ({self._queue.maxsize})") from None
+        return p
+
+    def _wait(self, parts: List[_Pending]) -> List[np.ndarray]:
+        deadline = parts[0].enqueued_at + self.request_timeout
+        for p in parts:
+            if not p.done.wait(max(deadline - time.perf_counter(), 0) if self.request_timeout > 0 else None):
+                for q in parts:
+                    q.cancelled = True
+                raise InferenceOverloaded(
+                    f"inference request timed out after {self.request_timeout * 1000:.0f} ms"
+                )
+            if p.error is not None:
+                raise p.error
+        return [p.result for p in parts]
+
+    def _run(self):
+        while True:
+            _, _, first = self._queue.get()
+            if first.cancelled:
+                continue
+            batch = [first]
+            n = len(first.texts)
+            deadline = time.perf_counter() + self.max_wait
+            while n < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    _, _, p = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if p.cancelled:
+                    continue
+                batch.append(p)
+                n += len(p.texts)
+            self._flush(batch)
+
+    def _flush(self, batch: List[_Pending]):
+        started = time.perf_counter()
+        texts = [t for p in batch for t in p.texts]
+        lengths = [n for p in batch for n in p.lengths]
+        try:
+            vecs = encode_bucketed(self._encode_fn, texts, lengths, self.length_buckets)
+        except Exception as e:
+            for p in batch:
+                p.error = e
+                p.done.set()
+            return
+
+        # 요청별로 자기 행만 잘라서 돌려준다
+        offset = 0
+        for p in batch:
+            p.result = vecs[offset:offset + len(p.texts)]
+            offset += len(p.texts)
+            p.done.set()
+
+        waits = [started - p.enqueued_at for p in batch]
+        STAGE_LATENCY.observe_many(waits, "queue_wait")
+        with self._stats_lock:
+            self._batches += 1
+            self._waits += len(batch)
+            self._texts += len(texts)
+            self._max_batch = max(self._max_batch, len(texts))
+            self._wait_total += sum(waits)
+            self._wait_max = max(self._wait_max, *waits)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "batches": self._batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "avg_batch_size": round(self._texts / self._batches, 3) if self._batches else 0.0,
+                "max_batch_size": self._max_batch,
+                "avg_queue_wait_ms": round(self._wait_total / self._waits * 1000, 3) if self._waits else 0.0,
+                "max_queue_wait_ms": round(self._wait_max * 1000, 3),
+                "queue_depth": self._queue.qsize(),
+                "long_requests": self._long,
+                "shed": self._shed,
+            }
+
+
+# 모델별로 배처(=배칭 스레드)를 하나씩 둔다
+_batchers: dict[str, MicroBatcher] = {}
+_batchers_lock = threading.Lock()
+
+def _get_batcher(model_name: str) -> MicroBatcher:
+    batcher = _batchers.get(model_name)
+    if batcher is None:
+        with _batchers_lock:
+            batcher = _batchers.get(model_name)
+            if batcher is None:
+                pool = get_pool(model_name)
+                batcher = MicroBatcher(
+                    lambda texts: _encode(texts, model_name),
+                    EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS,
+                    concurrency=pool.replicas if pool is not None else 1,
+                    max_queue=EMBED_QUEUE_MAX, queue_timeout_ms=EMBED_QUEUE_TIMEOUT_MS,
+                    length_buckets=EMBED_LENGTH_BUCKETS, long_tokens=EMBED_LONG_TOKENS,
+                    shed_queue_depth=EMBED_SHED_QUEUE_DEPTH,
+                    long_delay_ms=EMBED_LONG_DELAY_MS, request_timeout_ms=EMBED_REQUEST_TIMEOUT_MS,
+                )
+                _batchers[model_name] = batcher
+    return batcher
+
+def batch_stats(model_name: str = MODEL_NAME) -> dict:
+    # 조회만으로 배처를 만들지 않는다 (추론 풀 기동 전에 동시성이 1로 고정되는 것을 방지)
+    batcher = _batchers.get(model_name)
+    if batcher is None:
+        return MicroBatcher(None, EMBED_BATCH_MAX_SIZE, EMBED_BATCH_MAX_WAIT_MS).stats()
+    return batcher.stats()
+
+
+_WS_RE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    # 캐시 키 정규화: 유니코드 NFC + 공백 정리 (대소문자는 모델이 구분하므로 유지)
+    return _WS_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class EmbeddingCache:
+    """(모델명, 정규화 텍스트) → 벡터 LRU 캐시. 동시에 같은 텍스트가 miss 나면 encode는 한 번만"""
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[tuple[str, str], np.ndarray]" = OrderedDict()
+        self._inflight: dict[tuple[str, str], _Flight] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _entry_bytes(key, vec: np.ndarray) -> int:
+        return vec.nbytes + len(key[1]) * 4 + 100
+
+    def _put(self, key, vec: np.ndarray):
+        if key in self._data:
+            return
+        self._data[key] = vec
+        self._bytes += self._entry_bytes(key, vec)
+        while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+            old_key, old_vec = self._data.popitem(last=False)
+            self._bytes -= self._entry_bytes(old_key, old_vec)
+            self.evictions += 1
+
+    def embed(self, texts: List[str], model_name: str, compute) -> np.ndarray:
+        keys = [(model_name, normalize_text(t)) for t in texts]
+        resolved: dict = {}
+        owned: dict = {}
+        waiting: dict = {}
+
+        with self._lock:
+            for key in keys:
+                if key in resolved or key in owned or key in waiting:
+                    continue
+                vec = self._data.get(key)
+                if vec is not None:
+                    self._data.move_to_end(key)
+                    resolved[key] = vec
+                    self.hits += 1
+                    continue
+                flight = self._inflight.get(key)
+                if flight is not None:
+                    # 다른 요청이 이미 계산 중 → 결과만 기다린다
+                    waiting[key] = flight
+                    self.coalesced += 1
+                else:
+                    flight = self._inflight[key] = _Flight()
+                    owned[key] = flight
+                    self.misses += 1
+
+        if owned:
+            miss_keys = list(owned)
+            try:
+                vecs = compute([k[1] for k in miss_keys], model_name)
+            except Exception as e:
+                with self._lock:
+                    for key in miss_keys:
+                        del self._inflight[key]
+                for flight in owned.values():
+                    flight.error = e
+                    flight.done.set()
+                raise
+            with self._lock:
+                for key, vec in zip(miss_keys, vecs):
+                    vec = np.array(vec, dtype=np.float32)
+                    vec.flags.writeable = False
+                    self._put(key, vec)
+                    del self._inflight[key]
+                    owned[key].value = vec
+                    resolved[key] = vec
+            for flight in owned.values():
+                flight.done.set()
+
+        for key, flight in waiting.items():
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            resolved[key] = flight.value
+
+        return np.stack([resolved[k] for k in keys])
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            }
+
+
+_cache = EmbeddingCache(EMBED_CACHE_MAX_ENTRIES, int(EMBED_CACHE_MAX_MB * 1024 * 1024))
+_disk_cache: Optional[DiskEmbeddingCache] = None
+_disk_cache_lock = threading.Lock()
+
+def _get_disk_cache() -> Optional[DiskEmbeddingCache]:
+    global _disk_cache
+    if not EMBED_DISK_CACHE_ENABLED:
+        return None
+    if _disk_cache is None:
+        with _disk_cache_lock:
+            if _disk_cache is None:
+                _disk_cache = DiskEmbeddingCache(
+                    EMBED_DISK_CACHE_PATH, int(EMBED_DISK_CACHE_MAX_MB * 1024 * 1024),
+                )
+    return _disk_cache
+
+def disk_cache_model_key(model_name: str) -> str:
+    # 디스크 캐시는 재시작/배포 후에도 남으므로 벡터를 바꾸는 설정(백엔드, 양자화 설정, 토큰 예산)을 모두 키에 넣는다
+    backend = f"onnx:{ONNX_QUANT_CONFIG}" if EMBED_BACKEND == "onnx" else EMBED_BACKEND
+    return f"{model_name}|{backend}|max_tokens={token_budget(model_name)}"
+
+def cache_stats() -> dict:
+    stats = _cache.stats()
+    disk = _get_disk_cache()
+    stats["disk"] = disk.stats() if disk is not None else None
+    return stats
+
+def _cache_metrics() -> list[str]:
+    stats = _cache.stats()
+    lines = gauge_lines("tmi_embed_cache_events", "In-process embedding cache counters",
+                        {k: stats[k] for k in ("hits", "misses", "coalesced", "evictions")}, "event")
+    lines += gauge_lines("tmi_embed_cache_entries", "In-process embedding cache entries", {"": stats["entries"]})
+    lines += gauge_lines("tmi_embed_queue_depth", "Pending requests in the micro-batcher queue",
+                         {name: b.stats()["queue_depth"] for name, b in list(_batchers.items())}, "model")
+    return lines
+
+register_collector(_cache_metrics)
+
+def _embed_model(texts: List[str], model_name: str) -> np.ndarray:
+    # 캐시 miss 난 텍스트만 토큰 예산 검사 (캐시 키는 원문, 값은 예산 적용 후의 벡터)
+    texts, lengths = apply_token_budget(texts, model_name)
+    if not EMBED_BATCHING:
+        return encode_bucketed(partial(_encode, model_name=model_name), texts, lengths, EMBED_LENGTH_BUCKETS)
+    return _get_batcher(model_name).submit(texts, lengths)
+
+def _embed_uncached(texts: List[str], model_name: str) -> np.ndarray:
+    # 메모리 캐시 miss → 디스크 캐시 → 모델 순으로 조회
+    disk = _get_disk_cache()
+    if disk is None:
+        return _embed_model(texts, model_name)
+    keys = [normalize_text(t) for t in texts]
+    model_key = disk_cache_model_key(model_name)
+    vecs = disk.get_many(keys, model_key)
+    missing = [i for i, v in enumerate(vecs) if v is None]
+    if missing:
+        computed = _embed_model([texts[i] for i in missing], model_name)
+        disk.put_many([keys[i] for i in missing], computed, model_key)
+        for i, v in zip(missing, computed):
+            vecs[i] = v
+    return np.stack(vecs).astype(np.float32, copy=False)
+
+def embed_texts(texts: List[str], model_name: str = MODEL_NAME) -> np.ndarray:
+    if not EMBED_CACHE_ENABLED or not texts:
+        return _embed_uncached(texts, model_name)
+    # 캐시에 있는 것은 바로 쓰고, miss 난 텍스트만 encode 로 보낸다
+    return _cache.embed(texts, model_name, _embed_uncached)
+
+
+def _to_numpy(t) -> np.ndarray:
+    return t.detach().cpu().float().numpy() if hasattr(t, "detach") else np.asarray(t, dtype=np.float32)
+
+def embed_with_words(texts: List[str], model_name: str = MODEL_NAME):
+    """
+    한 번의 forward pass로 문장 벡터와 단어 벡터를 함께 구한다.
+    서브워드 토큰은 공백 단위 단어로 평균 풀링한다.
+    Returns: (문장 벡터 (N, D), [(단어 목록, 단어 벡터 (W, D)), ...])
+    """
+    model = get_model(model_name)
+    texts, _ = apply_token_budget(texts, model_name)
+    # 추론 풀이 있으면 레플리카에서 (onnx + 풀이면 부모에는 토크나이저만 있다)
+    pool = get_pool(model_name)
+    outs = pool.encode(texts, output_value=None) if pool is not None else model.encode(texts, output_value=None)
+    enc = model.tokenizer(
+        texts, truncation=True, max_length=model.max_seq_length, return_offsets_mapping=True,
+    )
+
+    sent_vecs = np.stack([_to_numpy(o["sentence_embedding"]) for o in outs])
+    sent_vecs /= np.maximum(np.linalg.norm(sent_vecs, axis=1, keepdims=True), 1e-12)
+
+    words_out = []
+    for i, (text, out) in enumerate(zip(texts, outs)):
+        word_ids = np.array([-1 if w is None else w for w in enc.word_ids(i)])
+        offsets = enc["offset_mapping"][i]
+        tok = _to_numpy(out["token_embeddings"])[:len(word_ids)]
+        n_words = int(word_ids.max()) + 1 if (word_ids >= 0).any() else 0
+
+        # (단어 수 x 토큰 수) 평균 풀링 행렬 하나로 모든 단어 벡터를 계산
+        pool = np.zeros((n_words, len(word_ids)), dtype=np.float32)
+        valid = np.flatnonzero(word_ids >= 0)
+        pool[word_ids[valid], valid] = 1.0
+        pool /= np.maximum(pool.sum(axis=1, keepdims=True), 1.0)
+        word_vecs = pool @ tok
+        word_vecs /= np.maximum(np.linalg.norm(word_vecs, axis=1, keepdims=True), 1e-12)
+
+        # 토큰 offset으로 원문에서 단어 표면형을 복원
+        spans = [[None, None] for _ in range(n_words)]
+        for t in valid:
+            s, e = offsets[t]
+            w = word_ids[t]
+            spans[w][0] = s if spans[w][0] is None else min(spans[w][0], s)
+            spans[w][1] = e if spans[w][1] is None else max(spans[w][1], e)
+        words = [text[s:e].strip() for s, e in spans]
+        words_out.append((words, word_vecs))
 
-def embed_texts(texts: List[str]) -> np.ndarray:
-    model = get_model()
-    # ndarray(float32), shape = (N, 384)
-    vecs = model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
-    return vecs
+    return sent_vecs, words_out
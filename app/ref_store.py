@@ -0,0 +1,82 @@
+"""
+sentences 말뭉치의 참조 문장 임베딩 저장소 (memory-mapped)
+
+scripts/build_ref_embeddings.py 로 미리 만든 .npy 파일을 mmap으로 열기 때문에
+여러 워커 프로세스가 페이지 캐시를 통해 같은 행렬을 복사 없이 공유한다.
+
+파일 구성 (REF_EMBED_DIR):
+  ids.npy   int64 (N,)      sentence id, 오름차순 정렬
+  en.npy    float16/32 (N, D)  english_text 임베딩
+  ko.npy    float16/32 (N, D)  korean_ref 임베딩
+  difficulty.npy / category.npy  int16 (N,)  필터용 코드 (meta.json 의 어휘 목록 인덱스)
+  meta.json 모델명, dtype, 건수, 차원, difficulty/category 어휘
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+REF_EMBED_DIR = Path(os.getenv(
+    "REF_EMBED_DIR", Path(__file__).parent.parent / "data" / "ref_embeddings"
+))
+
+
+class RefEmbeddingStore:
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.meta = json.loads((self.directory / "meta.json").read_text(encoding="utf-8"))
+        self.ids = np.load(self.directory / "ids.npy", mmap_mode="r")
+        self.vectors = {
+            "en": np.load(self.directory / "en.npy", mmap_mode="r"),
+            "ko": np.load(self.directory / "ko.npy", mmap_mode="r"),
+        }
+        self.codes = {
+            "difficulty": np.load(self.directory / "difficulty.npy", mmap_mode="r"),
+            "category": np.load(self.directory / "category.npy", mmap_mode="r"),
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def model_name(self) -> str:
+        return self.meta["model_name"]
+
+    @property
+    def dim(self) -> int:
+        return int(self.meta["dim"])
+
+    def code_of(self, field: str, value: str) -> Optional[int]:
+        vocab = self.meta[field]
+        return vocab.index(value) if value in vocab else None
+
+    def row_of(self, sentence_id: int) -> Optional[int]:
+        # ids는 정렬되어 있으므로 dict 없이 이진 탐색으로 id → 행 번호
+        row = int(np.searchsorted(self.ids, sentence_id))
+        if row < len(self.ids) and int(self.ids[row]) == sentence_id:
+            return row
+        return None
+
+    def get(self, sentence_id: int, lang: str) -> Optional[np.ndarray]:
+        row = self.row_of(sentence_id)
+        if row is None:
+            return None
+        return np.asarray(self.vectors[lang][row], dtype=np.float32)
+
+
+_store: Optional[RefEmbeddingStore] = None
+
+def load_ref_store(model_name: str, directory: Path = REF_EMBED_DIR) -> Optional[RefEmbeddingStore]:
+    # 빌드 산출물이 없거나 다른 모델로 만든 것이면 None (해당 API는 503 응답)
+    global _store
+    _store = None
+    if (Path(directory) / "meta.json").exists():
+        store = RefEmbeddingStore(directory)
+        if store.model_name == model_name:
+            _store = store
+    return _store
+
+def get_ref_store() -> Optional[RefEmbeddingStore]:
+    return _store
@@ -1,8 +1,15 @@
+from typing import Annotated, Literal
 from pydantic import BaseModel, Field
 
 class HealthResp(BaseModel):
     status: str = "ok"
 
+class ReadyResp(BaseModel):
+    status: str
+    phase: str
+    timings: dict[str, float]
+    error: str | None = None
+
 class EmbedReq(BaseModel):
     text: str = Field(..., min_length=1)
 
@@ -11,6 +18,19 @@ class EmbedResp(BaseModel):
     # 디버깅용: 앞의 몇 개 값만 노출
     head: list[float]
 
+class EmbedFullReq(BaseModel):
+    texts: list[Annotated[str, Field(min_length=1)]] = Field(..., min_length=1, max_length=256)
+    dtype: Literal["float32", "float16"] = "float32"
+    # binary: application/octet-stream (헤더 + 행렬), base64: JSON 안에 같은 행렬 바이트를 base64로
+    format: Literal["binary", "base64"] = "binary"
+
+class EmbedFullResp(BaseModel):
+    shape: list[int]
+    dtype: str
+    byteorder: str = "little"
+    # 헤더 없이 행렬 본문만 (rows x dim, C order)
+    data: str
+
 class JudgeReq(BaseModel):
     en: str = Field(..., min_length=1)
     ko: str = Field(..., min_length=1)
@@ -19,6 +39,107 @@ class JudgeResp(BaseModel):
     similarity: float
     label: str
 
+class JudgeBatchReq(BaseModel):
+    # 항목별 오류를 개별로 돌려주기 위해 원본 dict로 받고 JudgeReq로 하나씩 검증
+    items: list[dict] = Field(..., min_length=1, max_length=1000)
+
+class JudgeBatchItemResp(BaseModel):
+    index: int
+    similarity: float | None = None
+    label: str | None = None
+    error: str | None = None
+
+class JudgeBatchResp(BaseModel):
+    results: list[JudgeBatchItemResp]
+
+class JudgeRefReq(BaseModel):
+    sentence_id: int
+    answer: str = Field(..., min_length=1)
+    # 답안을 비교할 참조 문장: en(english_text) / ko(korean_ref)
+    against: Literal["en", "ko"] = "en"
+
+class SearchReq(BaseModel):
+    query: str = Field(..., min_length=1)
+    k: int = Field(10, ge=1, le=100)
+    # 검색 대상: en(english_text) / ko(korean_ref)
+    against: Literal["en", "ko"] = "en"
+    mode: Literal["exact", "ivf", "int8", "binary"] | None = None
+    difficulty: str | None = None
+    category: str | None = None
+
+class SearchHit(BaseModel):
+    sentence_id: int
+    score: float
+
+class SearchResp(BaseModel):
+    # 실제로 사용한 검색 모드 (mode 생략 시 SEARCH_MODE, 인덱스가 없으면 exact)
+    mode: str
+    results: list[SearchHit]
+
+class SentenceItem(BaseModel):
+    # SENTENCE_CATALOG=csv 면 None (CSV 행 번호는 DB id와 다를 수 있음)
+    sentence_id: int | None = None
+    english_text: str
+    korean_ref: str
+    difficulty: str
+    category: str
+    subcategory: str
+    source: str
+
+class SentenceSampleResp(BaseModel):
+    # 조건(difficulty, category)에 맞는 전체 문장 수
+    available: int
+    sentences: list[SentenceItem]
+
+class CatalogStatsResp(BaseModel):
+    source: str
+    count: int
+    groups: int
+    memory_bytes: int
+    bytes_per_sentence: float
+    mb_per_million: float
+    load_seconds: float
+
+class BatchStatsResp(BaseModel):
+    batches: int
+    requests: int
+    texts: int
+    avg_batch_size: float
+    max_batch_size: int
+    avg_queue_wait_ms: float
+    max_queue_wait_ms: float
+    queue_depth: int
+    long_requests: int
+    shed: int
+
+class DiskCacheStatsResp(BaseModel):
+    path: str
+    bytes: int
+    hits: int
+    misses: int
+    writes: int
+    evictions: int
+    hit_rate: float
+
+class CacheStatsResp(BaseModel):
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
+    hit_rate: float
+    disk: DiskCacheStatsResp | None = None
+
+class CascadeStatsResp(BaseModel):
+    enabled: bool
+    small_model: str
+    large_model: str
+    pairs: int
+    decided_by_small: int
+    escalated: int
+    small_hit_rate: float
+
 class JudgeDetailedReq(BaseModel):
     en: str = Field(..., min_length=1)
     ko: str = Field(..., min_length=1)
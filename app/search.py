@@ -0,0 +1,309 @@
+"""
+참조 문장 임베딩(ref_store) 위의 top-k 유사 문장 검색
+
+- exact: 블록 단위 행렬곱으로 전체를 스캔 (정확, O(N·D))
+- ivf:   구형(spherical) k-means로 나눈 역색인에서 nprobe개 클러스터만 스캔 (근사)
+- int8 / binary: 행별 스케일 int8 코드(D+4 바이트/문장) 또는 부호 비트(D/8 바이트/문장)만 스캔해
+  k * SEARCH_RERANK 개 후보를 고른 뒤, 후보의 원본 벡터만 mmap 에서 읽어 정확한 점수로 재정렬
+
+IVF 인덱스는 scripts/build_search_index.py, 양자화 코드는 scripts/build_quantized_index.py 로 미리 만들어
+ref_store 디렉토리에 저장하고, 앱 기동 시 mmap으로 연다. 파일이 없거나 행 수가 ref_store 와 다르면
+(참조 임베딩을 다시 만든 뒤 인덱스를 안 만든 경우) 무시한다. 이때 기본 모드(SEARCH_MODE)는 exact 로 대체하고,
+요청에서 명시한 모드는 ValueError(API 에서는 400)로 알린다.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+import numpy as np
+
+from .ref_store import RefEmbeddingStore
+
+SEARCH_MODE = os.getenv("SEARCH_MODE", "exact")
+SEARCH_NPROBE = int(os.getenv("SEARCH_NPROBE", "16"))
+SEARCH_BLOCK_ROWS = 16384
+# 양자화 코드로 고를 후보 수 = k * SEARCH_RERANK
+SEARCH_RERANK = int(os.getenv("SEARCH_RERANK", "10"))
+QUANT_BLOCK_ROWS = 4096
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def _merge_topk(best_scores, best_rows, scores, rows, k):
+    scores = np.concatenate([best_scores, scores])
+    rows = np.concatenate([best_rows, rows])
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        scores, rows = scores[keep], rows[keep]
+    return scores, rows
+
+
+def _scan(vectors, q, rows, mask, k):
+    # rows(후보 행 번호)를 블록 단위로 스캔하며 top-k만 유지
+    best_scores = np.empty(0, dtype=np.float32)
+    best_rows = np.empty(0, dtype=np.int64)
+    for lo in range(0, len(rows), SEARCH_BLOCK_ROWS):
+        block = rows[lo:lo + SEARCH_BLOCK_ROWS]
+        if mask is not None:
+            block = block[mask[block]]
+            if len(block) == 0:
+                continue
+        if block[-1] - block[0] + 1 == len(block):
+            mat = vectors[block[0]:block[-1] + 1]  # 연속 구간은 슬라이스(복사 없음)
+        else:
+            mat = vectors[block]
+        scores = np.asarray(mat, dtype=np.float32) @ q
+        best_scores, best_rows = _merge_topk(best_scores, best_rows, scores, block, k)
+    order = np.argsort(-best_scores)
+    return best_scores[order], best_rows[order]
+
+
+def train_ivf(vectors: np.ndarray, nlist: int, n_iter: int = 10, sample_size: int = 0, seed: int = 0):
+    """구형 k-means로 중심점을 학습하고 전체 행을 클러스터에 배정해 역색인을 만든다"""
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample_size = min(n, sample_size or nlist * 64)
+    sample = np.asarray(vectors[np.sort(rng.choice(n, sample_size, replace=False))], dtype=np.float32)
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assign = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        empty = norms[:, 0] == 0
+        # 빈 클러스터는 임의의 샘플로 다시 시작
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        norms[empty] = 1.0
+        centroids = sums / norms
+
+    assign = np.empty(n, dtype=np.int32)
+    for lo in range(0, n, SEARCH_BLOCK_ROWS):
+        block = np.asarray(vectors[lo:lo + SEARCH_BLOCK_ROWS], dtype=np.float32)
+        assign[lo:lo + len(block)] = np.argmax(block @ centroids.T, axis=1)
+
+    # CSR 형태 역색인: list_rows[offsets[c]:offsets[c+1]] = 클러스터 c의 행 번호
+    list_rows = np.argsort(assign, kind="stable").astype(np.int64)
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assign, minlength=nlist), out=offsets[1:])
+    return centroids.astype(np.float32), offsets, list_rows
+
+
+class IVFIndex:
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, list_rows: np.ndarray):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.list_rows = list_rows
+
+    @classmethod
+    def load(cls, directory: Path, lang: str, rows: Optional[int] = None) -> Optional["IVFIndex"]:
+        # rows: ref_store 행 수. 다르면 이전 빌드의 인덱스이므로 쓰지 않는다
+        path = Path(directory) / f"ivf_{lang}.npz"
+        if not path.exists():
+            return None
+        data = np.load(path)
+        if rows is not None and len(data["list_rows"]) != rows:
+            logger.warning("ignoring stale %s: %d rows, ref store has %d", path.name, len(data["list_rows"]), rows)
+            return None
+        return cls(data["centroids"], data["offsets"], data["list_rows"])
+
+    def save(self, directory: Path, lang: str):
+        np.savez(Path(directory) / f"ivf_{lang}.npz",
+                 centroids=self.centroids, offsets=self.offsets, list_rows=self.list_rows)
+
+    def candidates(self, q: np.ndarray, nprobe: int) -> np.ndarray:
+        nprobe = min(nprobe, len(self.centroids))
+        probe = np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+        rows = np.concatenate([self.list_rows[self.offsets[c]:self.offsets[c + 1]] for c in probe])
+        rows.sort()  # 행 순서대로 읽어야 mmap 접근이 순차적
+        return rows
+
+
+def quantize_int8(vectors: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """행마다 max|x| 가 127이 되도록 스케일 → (코드 int8 (N, D), 스케일 float32 (N,))"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scale = np.abs(vectors).max(axis=1) / 127.0
+    scale[scale == 0] = 1.0
+    codes = np.rint(vectors / scale[:, None]).astype(np.int8)
+    return codes, scale.astype(np.float32)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    """부호 비트만 남겨 8개씩 묶음 → uint8 (N, ceil(D/8))"""
+    return np.packbits(np.asarray(vectors) > 0, axis=1)
+
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    _POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(x):
+        return _POPCOUNT[x]
+
+
+class QuantizedIndex:
+    """
+    양자화 코드 파일 (ref_store 디렉토리):
+      q8_{lang}.npy       int8 (N, D)       행별 스케일 코드
+      q8scale_{lang}.npy  float32 (N,)      스케일
+      bin_{lang}.npy      uint8 (N, D/8)    부호 비트
+    """
+
+    def __init__(self, int8: Optional[tuple[np.ndarray, np.ndarray]], binary: Optional[np.ndarray]):
+        self.int8 = int8
+        self.binary = binary
+
+    @staticmethod
+    def paths(directory: Path, lang: str) -> dict[str, Path]:
+        directory = Path(directory)
+        return {
+            "q8": directory / f"q8_{lang}.npy",
+            "q8scale": directory / f"q8scale_{lang}.npy",
+            "bin": directory / f"bin_{lang}.npy",
+        }
+
+    @classmethod
+    def load(cls, directory: Path, lang: str, rows: Optional[int] = None) -> Optional["QuantizedIndex"]:
+        # rows: ref_store 행 수. 다르면 이전 빌드의 코드이므로 쓰지 않는다
+        p = cls.paths(directory, lang)
+
+        def fresh(name: str, *arrays) -> bool:
+            if rows is None or all(len(a) == rows for a in arrays):
+                return True
+            logger.warning("ignoring stale %s: %d rows, ref store has %d", p[name].name, len(arrays[0]), rows)
+            return False
+
+        int8 = None
+        if p["q8"].exists() and p["q8scale"].exists():
+            int8 = (np.load(p["q8"], mmap_mode="r"), np.load(p["q8scale"], mmap_mode="r"))
+            int8 = int8 if fresh("q8", *int8) else None
+        binary = np.load(p["bin"], mmap_mode="r") if p["bin"].exists() else None
+        binary = binary if binary is None or fresh("bin", binary) else None
+        if int8 is None and binary is None:
+            return None
+        return cls(int8, binary)
+
+    @classmethod
+    def build(cls, vectors: np.ndarray, directory: Path, lang: str, block_rows: int = SEARCH_BLOCK_ROWS):
+        # 원본 행렬을 한 번에 올리지 않고 블록 단위로 변환해 mmap 파일에 기록
+        p = cls.paths(directory, lang)
+        n, dim = vectors.shape
+        q8 = np.lib.format.open_memmap(p["q8"], mode="w+", dtype=np.int8, shape=(n, dim))
+        q8scale = np.lib.format.open_memmap(p["q8scale"], mode="w+", dtype=np.float32, shape=(n,))
+        binary = np.lib.format.open_memmap(p["bin"], mode="w+", dtype=np.uint8, shape=(n, (dim + 7) // 8))
+        for lo in range(0, n, block_rows):
+            block = np.asarray(vectors[lo:lo + block_rows], dtype=np.float32)
+            q8[lo:lo + len(block)], q8scale[lo:lo + len(block)] = quantize_int8(block)
+            binary[lo:lo + len(block)] = quantize_binary(block)
+        for arr in (q8, q8scale, binary):
+            arr.flush()
+
+    def modes(self) -> list[str]:
+        return [m for m, codes in (("int8", self.int8), ("binary", self.binary)) if codes is not None]
+
+    def _query_codes(self, mode: str, q: np.ndarray):
+        # 질의는 검색마다 한 번만 양자화해 모든 블록에 재사용
+        if mode == "int8":
+            return quantize_int8(q[None, :])[0][0].astype(np.float32)
+        return quantize_binary(q[None, :])[0]
+
+    def _block_scores(self, mode: str, q_codes: np.ndarray, lo: int, hi: int) -> np.ndarray:
+        if mode == "int8":
+            codes, scale = self.int8
+            # int8 x int8 내적은 |합| <= D * 127^2 < 2^24 라 float32 BLAS 로 계산해도 정수 결과와 같다
+            dots = np.asarray(codes[lo:hi], dtype=np.float32) @ q_codes
+            return dots * scale[lo:hi]
+        # binary: 일치하는 부호 비트 수 (해밍 거리가 작을수록 높은 점수)
+        return -_popcount(np.bitwise_xor(self.binary[lo:hi], q_codes)).sum(axis=1, dtype=np.int32).astype(np.float32)
+
+    def candidates(self, mode: str, q: np.ndarray, n: int, mask: Optional[np.ndarray]) -> np.ndarray:
+        """코드 점수 상위 n개 행 번호 (행 순서 정렬)"""
+        size = len(self.int8[1]) if mode == "int8" else len(self.binary)
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        q_codes = self._query_codes(mode, q)
+        for lo in range(0, size, QUANT_BLOCK_ROWS):
+            hi = min(lo + QUANT_BLOCK_ROWS, size)
+            scores = self._block_scores(mode, q_codes, lo, hi)
+            rows = np.arange(lo, hi, dtype=np.int64)
+            if mask is not None:
+                keep = mask[lo:hi]
+                scores, rows = scores[keep], rows[keep]
+            best_scores, best_rows = _merge_topk(best_scores, best_rows, scores, rows, n)
+        best_rows.sort()  # 재정렬 단계에서 mmap 을 행 순서대로 읽도록
+        return best_rows
+
+
+def index_files(directory: Path) -> list[Path]:
+    """ref_store 에서 파생된 인덱스 파일 (참조 임베딩을 다시 만들면 함께 지워야 한다)"""
+    directory = Path(directory)
+    return [
+        path for lang in ("en", "ko")
+        for path in (directory / f"ivf_{lang}.npz", *QuantizedIndex.paths(directory, lang).values())
+    ]
+
+
+class SearchIndex:
+    def __init__(self, store: RefEmbeddingStore):
+        self.store = store
+        self.ivf = {lang: IVFIndex.load(store.directory, lang, len(store)) for lang in ("en", "ko")}
+        self.quantized = {lang: QuantizedIndex.load(store.directory, lang, len(store)) for lang in ("en", "ko")}
+        self._all_rows = np.arange(len(store), dtype=np.int64)
+
+    def _mask(self, difficulty: Optional[str], category: Optional[str]) -> Optional[np.ndarray]:
+        mask = None
+        for field, value in (("difficulty", difficulty), ("category", category)):
+            if value is None:
+                continue
+            code = self.store.code_of(field, value)
+            m = np.zeros(len(self.store), dtype=bool) if code is None else (self.store.codes[field] == code)
+            mask = m if mask is None else (mask & m)
+        return mask
+
+    def modes(self, lang: str) -> list[str]:
+        """lang 에서 지금 쓸 수 있는 검색 모드"""
+        ivf, quantized = self.ivf[lang], self.quantized[lang]
+        return ["exact"] + (["ivf"] if ivf is not None else []) + (quantized.modes() if quantized is not None else [])
+
+    def resolve_mode(self, mode: Optional[str], lang: str = "en") -> str:
+        """
+        실제로 쓸 모드. 명시한 모드의 인덱스가 없으면 ValueError,
+        생략해 SEARCH_MODE 를 쓸 때는 인덱스가 없으면 exact 로 대체한다
+        """
+        available = self.modes(lang)
+        if mode is None:
+            return SEARCH_MODE if SEARCH_MODE in available else "exact"
+        if mode not in available:
+            raise ValueError(f"search mode {mode!r} is not built for {lang} (available: {', '.join(available)})")
+        return mode
+
+    def search(self, q: np.ndarray, k: int, lang: str = "en", mode: Optional[str] = None,
+               difficulty: Optional[str] = None, category: Optional[str] = None,
+               nprobe: int = SEARCH_NPROBE, rerank: int = SEARCH_RERANK) -> tuple[np.ndarray, np.ndarray]:
+        """(sentence_ids, scores) 를 점수 내림차순으로 반환. 모드 결정은 resolve_mode 와 같다"""
+        mode = self.resolve_mode(mode, lang)
+        q = np.asarray(q, dtype=np.float32)
+        mask = self._mask(difficulty, category)
+        if mode == "ivf":
+            rows = self.ivf[lang].candidates(q, nprobe)
+        elif mode in ("int8", "binary"):
+            # 후보는 이미 mask 를 통과한 행만
+            rows = self.quantized[lang].candidates(mode, q, k * max(rerank, 1), mask)
+            mask = None
+        else:
+            rows = self._all_rows
+        scores, rows = _scan(self.store.vectors[lang], q, rows, mask, k)
+        return np.asarray(self.store.ids[rows]), scores
+
+
+_index: Optional[SearchIndex] = None
+
+def load_search_index(store: Optional[RefEmbeddingStore]) -> Optional[SearchIndex]:
+    global _index
+    _index = SearchIndex(store) if store is not None else None
+    return _index
+
+def get_search_index() -> Optional[SearchIndex]:
+    return _index
@@ -1,16 +1,160 @@
+import os
+import threading
+from typing import List, Optional
 import numpy as np
+from .metrics import JUDGE_LABELS, STAGE_LATENCY, gauge_lines, register_collector
+from .model import MODEL_NAME, embed_texts, over_budget, token_budget
 
 # 임계치는 초기값. 이후 운영 데이터로 조정
 THRESHOLD_CORRECT = 0.80
 THRESHOLD_PARTIAL = 0.65
 
+# 캐스케이드: 소형 모델로 먼저 채점하고, 임계치 근처(애매한 구간)만 대형 모델로 재채점
+CASCADE_ENABLED = os.getenv("CASCADE_ENABLED", "0") == "1"
+CASCADE_SMALL_MODEL = os.getenv(
+    "CASCADE_SMALL_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+)
+# 소형 모델은 점수 분포가 달라 임계치를 따로 보정한다 (scripts/calibrate_cascade.py)
+SMALL_THRESHOLD_CORRECT = float(os.getenv("CASCADE_SMALL_THRESHOLD_CORRECT", "0.80"))
+SMALL_THRESHOLD_PARTIAL = float(os.getenv("CASCADE_SMALL_THRESHOLD_PARTIAL", "0.65"))
+# 소형 모델 점수가 임계치 ± 밴드 안이면 대형 모델로 넘긴다
+CASCADE_BAND_CORRECT = float(os.getenv("CASCADE_BAND_CORRECT", "0.05"))
+CASCADE_BAND_PARTIAL = float(os.getenv("CASCADE_BAND_PARTIAL", "0.05"))
+
 def cosine_sim(a: np.ndarray, b: np.ndarray) -> float:
     # a, b는 L2 정규화된 벡터라고 가정(encode 시 normalize=True)
     return float(np.dot(a, b))
 
+def cosine_sim_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # (N, D) x (N, D) -> (N,): 같은 행끼리 내적
+    return np.einsum("ij,ij->i", a, b)
+
 def judge_similarity(sim: float) -> str:
     if sim >= THRESHOLD_CORRECT:
         return "맞음"
     if sim >= THRESHOLD_PARTIAL:
         return "부분적"
     return "아님"
+
+LABELS = np.array(["아님", "부분적", "맞음"], dtype=object)
+
+def judge_similarity_array(sims: np.ndarray, correct: float = THRESHOLD_CORRECT,
+                           partial: float = THRESHOLD_PARTIAL) -> np.ndarray:
+    # judge_similarity와 같은 기준을 배열 단위로 적용
+    idx = (sims >= partial).astype(np.int8) + (sims >= correct).astype(np.int8)
+    return LABELS[idx]
+
+
+class CascadeStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pairs = 0
+        self.escalated = 0
+
+    def record(self, pairs: int, escalated: int):
+        with self._lock:
+            self.pairs += pairs
+            self.escalated += escalated
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            pairs, escalated = self.pairs, self.escalated
+        return {
+            "enabled": CASCADE_ENABLED,
+            "small_model": CASCADE_SMALL_MODEL,
+            "large_model": MODEL_NAME,
+            "pairs": pairs,
+            "decided_by_small": pairs - escalated,
+            "escalated": escalated,
+            "small_hit_rate": round((pairs - escalated) / pairs, 4) if pairs else 0.0,
+        }
+
+
+_cascade_stats = CascadeStats()
+
+def cascade_stats() -> dict:
+    return _cascade_stats.snapshot()
+
+def _cascade_metrics() -> list[str]:
+    stats = _cascade_stats.snapshot()
+    return gauge_lines("tmi_cascade_pairs", "Pairs decided per cascade stage",
+                       {"small": stats["decided_by_small"], "large": stats["escalated"]}, "stage")
+
+register_collector(_cascade_metrics)
+
+def _pair_sims(en: List[str], ko: List[str], model_name: str) -> np.ndarray:
+    # [en0, ko0, en1, ko1, ...] 한 번에 인코딩 후 짝수/홀수 행으로 분리
+    vecs = embed_texts([t for pair in zip(en, ko) for t in pair], model_name)
+    with STAGE_LATENCY.time("similarity"):
+        return cosine_sim_rows(vecs[0::2], vecs[1::2])
+
+def _small_to_large_scale(sims: np.ndarray) -> np.ndarray:
+    # 소형 모델 임계치가 대형 모델 임계치에 오도록 구간별 선형 변환 (판정 결과는 동일하게 유지)
+    return np.interp(
+        sims,
+        [-1.0, SMALL_THRESHOLD_PARTIAL, SMALL_THRESHOLD_CORRECT, 1.0],
+        [-1.0, THRESHOLD_PARTIAL, THRESHOLD_CORRECT, 1.0],
+    ).astype(np.float32)
+
+def record_labels(labels):
+    values, counts = np.unique(np.asarray(labels, dtype=object), return_counts=True)
+    for label, count in zip(values.tolist(), counts.tolist()):
+        JUDGE_LABELS.inc(label, amount=count)
+
+def score_pairs(en: List[str], ko: List[str]) -> tuple[np.ndarray, np.ndarray]:
+    """(en, ko) 쌍들의 유사도와 판정을 반환. 점수는 항상 대형 모델 기준 척도"""
+    sims, labels = _score_pairs(en, ko)
+    record_labels(labels)
+    return sims, labels
+
+def budget_errors(en: List[str], ko: List[str]) -> List[Optional[str]]:
+    """
+    쌍마다 토큰 예산 초과 에러 메시지 (없으면 None). EMBED_OVERLENGTH=reject 일 때
+    초과 항목 하나가 일괄 요청 전체를 실패시키지 않도록 채점 전에 걸러내는 용도.
+    캐스케이드를 켜면 두 모델 예산을 모두 검사한다
+    """
+    errors: List[Optional[str]] = [None] * len(en)
+    for model_name in [MODEL_NAME] + ([CASCADE_SMALL_MODEL] if CASCADE_ENABLED else []):
+        for field, texts in (("en", en), ("ko", ko)):
+            for i, over in enumerate(over_budget(texts, model_name)):
+                if over and errors[i] is None:
+                    errors[i] = f"{field}: input exceeds token budget ({token_budget(model_name)} tokens)"
+    return errors
+
+def _score_pairs(en: List[str], ko: List[str]) -> tuple[np.ndarray, np.ndarray]:
+    if not CASCADE_ENABLED:
+        sims = _pair_sims(en, ko, MODEL_NAME)
+        return sims, judge_similarity_array(sims)
+
+    small = _pair_sims(en, ko, CASCADE_SMALL_MODEL)
+    ambiguous = np.flatnonzero(
+        (np.abs(small - SMALL_THRESHOLD_CORRECT) < CASCADE_BAND_CORRECT)
+        | (np.abs(small - SMALL_THRESHOLD_PARTIAL) < CASCADE_BAND_PARTIAL)
+    )
+    sims = _small_to_large_scale(small)
+    if len(ambiguous):
+        sims[ambiguous] = _pair_sims(
+            [en[i] for i in ambiguous], [ko[i] for i in ambiguous], MODEL_NAME,
+        )
+    _cascade_stats.record(len(en), len(ambiguous))
+    return sims, judge_similarity_array(sims)
+
+
+def word_alignment(en_words: List[str], en_vecs: np.ndarray,
+                   ko_words: List[str], ko_vecs: np.ndarray) -> list[dict]:
+    """영어 단어 x 한국어 단어 유사도 행렬을 한 번에 계산하고, 영어 단어별 최고 대응 단어를 반환"""
+    if len(en_words) == 0 or len(ko_words) == 0:
+        return []
+    sim = en_vecs @ ko_vecs.T
+    best = sim.argmax(axis=1)
+    best_sim = sim[np.arange(len(en_words)), best]
+    return [
+        {
+            "en_word": en_words[i],
+            "en_index": i,
+            "ko_word": ko_words[j],
+            "ko_index": j,
+            "similarity": round(float(s), 6),
+        }
+        for i, (j, s) in enumerate(zip(best.tolist(), best_sim.tolist()))
+    ]
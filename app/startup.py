@@ -0,0 +1,82 @@
+"""
+기동 단계 실행과 준비 상태(readiness) 관리
+
+lifespan 은 이 단계들을 백그라운드 스레드에서 돌리고 바로 반환하므로 /health(liveness)는 즉시 응답하고,
+/ready 는 모델 로딩과 워밍업이 끝난 뒤에만 200을 돌려준다. 오토스케일러는 /ready 를 보고 트래픽을 보낸다.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger("uvicorn.error")
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
+WARMUP_BATCH_SIZES = [int(x) for x in os.getenv("WARMUP_BATCH_SIZES", "1,2,8,32").split(",") if x]
+# 난이도 구간(STARTER ~ CHALLENGE)을 대표하는 영어 단어 수와 대응되는 한국어 길이
+WARMUP_WORD_COUNTS = [2, 6, 12, 20, 32]
+
+_WARMUP_EN = "the learner reads a short sentence about school friends and daily life".split()
+_WARMUP_KO = "학습자가 학교 친구들과 일상에 대한 짧은 문장을 읽는다".split()
+
+
+def warmup_texts(batch_size: int, words: int) -> list[str]:
+    en = " ".join(_WARMUP_EN[i % len(_WARMUP_EN)] for i in range(words))
+    ko = " ".join(_WARMUP_KO[i % len(_WARMUP_KO)] for i in range(max(1, words // 2)))
+    return [en if i % 2 == 0 else ko for i in range(batch_size)]
+
+
+class StartupState:
+    def __init__(self):
+        self.ready = False
+        self.phase = "starting"
+        self.error: Optional[str] = None
+        self.timings: dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    def run_phase(self, name: str, fn: Callable[[], object]):
+        self.phase = name
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        self.timings[name] = round(elapsed, 3)
+        logger.info("startup phase %-16s %.3fs", name, elapsed)
+
+    def run(self, phases: list[tuple[str, Callable[[], object]]]):
+        try:
+            for name, fn in phases:
+                self.run_phase(name, fn)
+        except Exception as e:
+            self.phase = "failed"
+            self.error = f"{type(e).__name__}: {e}"
+            logger.exception("startup failed")
+            return
+        self.timings["total"] = round(time.perf_counter() - self._started, 3)
+        self.phase = "ready"
+        self.ready = True
+        logger.info("ready in %.3fs %s", self.timings["total"], self.timings)
+
+    def fail(self, error: str):
+        # 기동 이후에 복구할 수 없는 오류(추론 레플리카 종료 등)가 나면 준비 상태를 내린다
+        self.ready = False
+        self.phase = "failed"
+        self.error = error
+        logger.error("not ready: %s", error)
+
+    def start_background(self, phases: list[tuple[str, Callable[[], object]]]) -> threading.Thread:
+        t = threading.Thread(target=self.run, args=(phases,), name="startup", daemon=True)
+        t.start()
+        return t
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self.ready and self.phase != "failed":
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            time.sleep(0.05)
+        return self.ready
+
+
+state = StartupState()
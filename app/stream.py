@@ -0,0 +1,137 @@
+"""
+NDJSON 스트리밍 일괄 채점 (/judge/stream)
+
+요청 본문을 줄 단위로 읽어 JUDGE_STREAM_CHUNK 쌍씩 score_pairs 에 넘기고, 청크가 끝나는 대로 결과 줄을 흘려보낸다.
+한 번에 메모리에 있는 것은 채점 중인 청크와 읽고 있는 다음 청크뿐이다.
+응답을 클라이언트가 읽어 가야 다음 입력을 읽으므로 (StreamingResponse 의 send 가 대기) 흐름 제어가 자연히 걸린다.
+"""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+from .model import InferenceOverloaded, InputTooLong
+from .schema import JudgeBatchItemResp, JudgeReq
+from .service import budget_errors, score_pairs
+
+JUDGE_STREAM_CHUNK = int(os.getenv("JUDGE_STREAM_CHUNK", "256"))
+# 줄 하나의 최대 크기. 넘으면 해당 줄은 에러로 처리하고 버린다
+JUDGE_STREAM_MAX_LINE_BYTES = int(os.getenv("JUDGE_STREAM_MAX_LINE_BYTES", "65536"))
+# 추론 대기열이 가득 찼을 때 청크 재시도 횟수 (대량 작업은 거절보다 기다리는 쪽이 낫다)
+_OVERLOAD_RETRIES = 5
+_OVERLOAD_BACKOFF_SEC = 1.0
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[Optional[bytes]]:
+    """본문을 줄 단위로. 너무 긴 줄은 None"""
+    buf = b""
+    skipping = False
+    async for data in body:
+        buf += data
+        while True:
+            nl = buf.find(b"\n")
+            if nl < 0:
+                break
+            line, buf = buf[:nl], buf[nl + 1:]
+            if skipping:
+                skipping = False
+                continue
+            yield line if len(line) <= JUDGE_STREAM_MAX_LINE_BYTES else None
+        if len(buf) > JUDGE_STREAM_MAX_LINE_BYTES and not skipping:
+            # 줄바꿈이 나올 때까지 나머지는 버린다
+            skipping = True
+            yield None
+        if skipping:
+            buf = b""
+    if buf and not skipping:
+        yield buf
+
+
+def _parse(line: Optional[bytes]) -> tuple[Optional[JudgeReq], Optional[str]]:
+    if line is None:
+        return None, f"line exceeds {JUDGE_STREAM_MAX_LINE_BYTES} bytes"
+    try:
+        return JudgeReq.model_validate_json(line), None
+    except ValidationError as e:
+        return None, "; ".join(
+            f"{'.'.join(str(x) for x in err['loc'])}: {err['msg']}" if err["loc"] else err["msg"]
+            for err in e.errors()
+        )
+
+
+def _score_chunk(start: int, items: List[tuple[Optional[JudgeReq], Optional[str]]]) -> bytes:
+    results = [JudgeBatchItemResp(index=start + i, error=err) for i, (_, err) in enumerate(items)]
+    valid = [i for i, (req, _) in enumerate(items) if req is not None]
+    # 토큰 예산을 넘는 줄은 그 줄만 에러로 (EMBED_OVERLENGTH=reject)
+    errors = budget_errors([items[i][0].en for i in valid], [items[i][0].ko for i in valid])
+    for i, err in zip(valid, errors):
+        results[i].error = err
+    valid = [i for i, err in zip(valid, errors) if err is None]
+    if valid:
+        try:
+            sims, labels = _score_with_retry([items[i][0].en for i in valid], [items[i][0].ko for i in valid])
+        except (InputTooLong, InferenceOverloaded) as e:
+            for i in valid:
+                results[i].error = str(e)
+        else:
+            for i, sim, label in zip(valid, sims.tolist(), labels.tolist()):
+                results[i].similarity = round(sim, 6)
+                results[i].label = label
+    return "".join(r.model_dump_json(exclude_none=True) + "\n" for r in results).encode("utf-8")
+
+
+def _score_with_retry(en: List[str], ko: List[str]):
+    for attempt in range(_OVERLOAD_RETRIES):
+        try:
+            return score_pairs(en, ko)
+        except InferenceOverloaded:
+            if attempt == _OVERLOAD_RETRIES - 1:
+                raise
+            time.sleep(_OVERLOAD_BACKOFF_SEC)
+
+
+async def judge_ndjson(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """입력 NDJSON({"en", "ko"} 줄) → 결과 NDJSON({"index", "similarity", "label"} 또는 {"index", "error"})"""
+    pending: Optional[asyncio.Future] = None
+    chunk: list = []
+    start = 0
+    index = 0
+    async for line in _lines(body):
+        if line is not None and not line.strip():
+            continue
+        chunk.append(_parse(line))
+        index += 1
+        if len(chunk) >= JUDGE_STREAM_CHUNK:
+            # 이전 청크 결과를 내보낸 뒤에 이 청크 채점을 시작 (동시에 최대 한 청크만 채점)
+            if pending is not None:
+                yield await pending
+            pending = asyncio.ensure_future(run_in_threadpool(_score_chunk, start, chunk))
+            chunk, start = [], index
+    if pending is not None:
+        yield await pending
+    if chunk:
+        yield await run_in_threadpool(_score_chunk, start, chunk)
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """
+    요청 본문을 읽으면서 응답을 쓰는 용도의 StreamingResponse.
+    기본 구현은 ASGI 2.4 미만에서 연결 종료 감지를 위해 receive() 를 따로 돌리는데,
+    그러면 아직 읽지 않은 본문 메시지를 가로채 버린다. 연결 종료는 본문 읽기/응답 쓰기에서 감지된다.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
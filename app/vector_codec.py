@@ -0,0 +1,37 @@
+"""
+임베딩 행렬의 바이너리 직렬화 (/embed/full)
+
+레이아웃 (모두 little-endian):
+    헤더 16바이트  magic "TMIE" | version u8 | dtype u8 (0=float32, 1=float16) | reserved u16 | rows u32 | dim u32
+    본문           rows x dim 행렬, 행 우선(C order)
+
+numpy 버퍼를 그대로 붙이므로 원소별 파이썬 변환이 없다.
+"""
+
+import struct
+import numpy as np
+
+MAGIC = b"TMIE"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHII")
+DTYPES = {"float32": (0, np.dtype("<f4")), "float16": (1, np.dtype("<f2"))}
+_DTYPE_BY_CODE = {code: (name, dt) for name, (code, dt) in DTYPES.items()}
+
+
+def to_bytes(vecs: np.ndarray, dtype: str = "float32") -> bytes:
+    """본문만 (헤더 없음)"""
+    return np.ascontiguousarray(vecs, dtype=DTYPES[dtype][1]).tobytes()
+
+
+def pack(vecs: np.ndarray, dtype: str = "float32") -> bytes:
+    code, _ = DTYPES[dtype]
+    rows, dim = vecs.shape
+    return HEADER.pack(MAGIC, VERSION, code, 0, rows, dim) + to_bytes(vecs, dtype)
+
+
+def unpack(buf: bytes) -> np.ndarray:
+    magic, version, code, _, rows, dim = HEADER.unpack_from(buf)
+    if magic != MAGIC or version != VERSION or code not in _DTYPE_BY_CODE:
+        raise ValueError("not a TMIE embedding buffer")
+    _, dt = _DTYPE_BY_CODE[code]
+    return np.frombuffer(buf, dtype=dt, count=rows * dim, offset=HEADER.size).reshape(rows, dim)
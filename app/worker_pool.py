@@ -0,0 +1,275 @@
+"""
+멀티 프로세스 추론 풀
+
+uvicorn 워커를 N개 띄우면 모델도 N벌 올라가고, 한 프로세스 안에서는 GIL과 torch 스레드 경합으로
+코어를 다 쓰지 못한다. 여기서는 부모 프로세스가 모델을 한 번 로딩해 가중치를 공유 메모리로 옮긴 뒤
+(torch share_memory) 레플리카 프로세스들에 넘긴다. 각 레플리카는 지정된 CPU 집합에 고정되고
+자체 intra-op 스레드 수로 encode 만 수행한다.
+
+토크나이즈 시간/입력 토큰 수 지표는 레플리카 안에서 재어 결과와 함께 돌려받아 부모의 /metrics 에 기록한다.
+
+레플리카가 죽으면(OOM, segfault) 그 레플리카가 가져간 작업은 돌아오지 않으므로, 결과 스레드가 주기적으로
+프로세스 생존을 확인해 대기 중인 작업을 모두 실패 처리하고 풀을 사용 불가로 표시한다 (on_failure 로 통지).
+"""
+
+import itertools
+import os
+import queue
+import threading
+import time
+from typing import Callable, List, Optional
+import numpy as np
+
+from .metrics import INPUT_TOKENS, STAGE_LATENCY
+
+# 레플리카 기동(모델 로딩 포함) / 작업 하나를 기다리는 최대 시간
+INFERENCE_START_TIMEOUT_S = float(os.getenv("INFERENCE_START_TIMEOUT_S", "600"))
+INFERENCE_TASK_TIMEOUT_S = float(os.getenv("INFERENCE_TASK_TIMEOUT_S", "60"))
+_POLL_S = 1.0
+
+
+class InferenceOverloaded(RuntimeError):
+    """추론 대기열이 가득 차 요청을 받을 수 없음"""
+
+
+class InferenceUnavailable(InferenceOverloaded):
+    """레플리카가 죽었거나 시간 안에 응답하지 않음 (같은 503 처리)"""
+
+
+_DEFAULT_ENCODE = {"convert_to_numpy": True, "normalize_embeddings": True}
+
+
+def _numpy(t) -> np.ndarray:
+    return t.detach().cpu().float().numpy() if hasattr(t, "detach") else np.asarray(t, dtype=np.float32)
+
+
+def _instrument_tokenize(model, stats: dict):
+    # 작업별 토크나이즈 시간과 입력 토큰 수를 모은다 (부모가 결과와 함께 받아 지표에 기록)
+    orig = getattr(model, "tokenize", None)
+    if orig is None:
+        return
+
+    def tokenize(texts):
+        start = time.perf_counter()
+        features = orig(texts)
+        stats["seconds"].append(time.perf_counter() - start)
+        mask = features.get("attention_mask")
+        if mask is not None:
+            stats["tokens"].extend(mask.sum(dim=1).tolist())
+        return features
+
+    model.tokenize = tokenize
+
+
+def _replica_main(model, model_loader, cpus, n_threads, tasks, results):
+    import torch
+
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    torch.set_num_threads(n_threads)
+    if model is None:
+        # 공유할 수 없는 백엔드(onnx 등)는 레플리카에서 직접 로딩
+        model = model_loader()
+    stats = {"seconds": [], "tokens": []}
+    _instrument_tokenize(model, stats)
+    results.put(("ready", None, None, None))
+    while True:
+        item = tasks.get()
+        if item is None:
+            break
+        task_id, texts, kwargs = item
+        stats["seconds"], stats["tokens"] = [], []
+        try:
+            with torch.inference_mode():
+                out = model.encode(texts, **(kwargs or _DEFAULT_ENCODE))
+            if kwargs and kwargs.get("output_value", "sentence_embedding") is None:
+                # 문장 + 토큰 벡터 (embed_with_words): 텐서는 넘기지 않고 numpy 로
+                out = [{k: _numpy(o[k]) for k in ("sentence_embedding", "token_embeddings")} for o in out]
+            results.put((task_id, out, None, stats))
+        except Exception as e:
+            results.put((task_id, None, f"{type(e).__name__}: {e}", stats))
+
+
+def split_cpus(replicas: int) -> List[List[int]]:
+    # 사용 가능한 CPU를 레플리카 수만큼 균등 분할
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if replicas > len(cpus):
+        return [cpus] * replicas
+    size = len(cpus) // replicas
+    return [cpus[i * size:(i + 1) * size] for i in range(replicas)]
+
+
+class _Task:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class InferencePool:
+    def __init__(self, model, model_loader, replicas: int, threads_per_replica: int = 0,
+                 share_weights: bool = True, max_pending: int = 0, queue_timeout_ms: float = 0,
+                 on_failure: Optional[Callable[[str], None]] = None):
+        import torch.multiprocessing as mp
+
+        ctx = mp.get_context("spawn")
+        self._tasks = ctx.Queue()
+        self._results = ctx.Queue()
+        self._pending: dict[int, _Task] = {}
+        self._pending_lock = threading.Lock()
+        self._ids = itertools.count()
+        # 풀에 들어간(아직 결과가 안 온) 작업 수 상한. 가득 차면 queue_timeout 만큼 기다린 뒤 InferenceOverloaded
+        self.max_pending = max_pending
+        self._slots = threading.BoundedSemaphore(max_pending) if max_pending > 0 else None
+        self._queue_timeout = queue_timeout_ms / 1000
+        self._on_failure = on_failure
+        self.error: Optional[str] = None
+        self._closed = False
+
+        shared = None
+        if share_weights:
+            # torch 백엔드만: 가중치를 공유 메모리로 옮겨 레플리카들이 복사 없이 같은 텐서를 참조
+            # (onnx 백엔드의 ORT 세션은 pickle 할 수 없으므로 레플리카에서 직접 로딩)
+            model.share_memory()
+            shared = model
+
+        self.cpu_sets = split_cpus(replicas)
+        self._procs = []
+        for cpus in self.cpu_sets:
+            n_threads = threads_per_replica or max(1, len(cpus))
+            p = ctx.Process(
+                target=_replica_main,
+                args=(shared, model_loader, cpus, n_threads, self._tasks, self._results),
+                daemon=True,
+            )
+            p.start()
+            self._procs.append(p)
+
+        self._wait_ready()
+        self._reader = threading.Thread(target=self._read_results, name="inference-pool", daemon=True)
+        self._reader.start()
+
+    @property
+    def replicas(self) -> int:
+        return len(self._procs)
+
+    def _dead(self) -> list[str]:
+        return [f"replica {i} (pid {p.pid}) exited with code {p.exitcode}"
+                for i, p in enumerate(self._procs) if not p.is_alive()]
+
+    def _wait_ready(self):
+        # 모든 레플리카가 준비될 때까지 대기. 도중에 죽거나 시간이 지나면 나머지를 정리하고 실패
+        deadline = time.monotonic() + INFERENCE_START_TIMEOUT_S
+        waiting = len(self._procs)
+        while waiting:
+            try:
+                self._results.get(timeout=_POLL_S)
+                waiting -= 1
+                continue
+            except queue.Empty:
+                pass
+            dead = self._dead()
+            if dead or time.monotonic() > deadline:
+                self._terminate()
+                raise RuntimeError("; ".join(dead) if dead else
+                                   f"inference replicas not ready after {INFERENCE_START_TIMEOUT_S:.0f}s")
+
+    def _read_results(self):
+        while True:
+            try:
+                task_id, vecs, error, stats = self._results.get(timeout=_POLL_S)
+            except queue.Empty:
+                if self._closed:
+                    break
+                dead = self._dead()
+                if dead:
+                    self._fail("; ".join(dead))
+                    break
+                continue
+            if task_id is None:
+                break
+            if stats:
+                STAGE_LATENCY.observe_many(stats["seconds"], "tokenize")
+                INPUT_TOKENS.observe_many(stats["tokens"])
+            with self._pending_lock:
+                task = self._pending.pop(task_id, None)
+            if task is None:
+                continue
+            task.result = vecs
+            task.error = RuntimeError(error) if error else None
+            task.done.set()
+
+    def _fail(self, error: str):
+        # 죽은 레플리카가 어떤 작업을 가져갔는지 알 수 없으므로 대기 중인 작업 전부 실패 처리
+        self.error = error
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for task in pending.values():
+            task.error = InferenceUnavailable(f"inference replica failed: {error}")
+            task.done.set()
+        if self._on_failure is not None:
+            self._on_failure(f"inference pool: {error}")
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        """kwargs 는 레플리카의 model.encode 로 그대로 (없으면 정규화된 numpy 문장 벡터)"""
+        if self.error is not None:
+            raise InferenceUnavailable(f"inference replica failed: {self.error}")
+        if self._slots is not None and not self._slots.acquire(timeout=self._queue_timeout):
+            raise InferenceOverloaded(f"inference pool queue full ({self.max_pending})")
+        try:
+            task = _Task()
+            task_id = next(self._ids)
+            with self._pending_lock:
+                self._pending[task_id] = task
+            self._tasks.put((task_id, texts, kwargs))
+            if not task.done.wait(INFERENCE_TASK_TIMEOUT_S):
+                with self._pending_lock:
+                    self._pending.pop(task_id, None)
+                raise InferenceUnavailable(f"inference timed out after {INFERENCE_TASK_TIMEOUT_S:.0f}s")
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+        if task.error is not None:
+            raise task.error
+        return task.result
+
+    def _terminate(self):
+        for p in self._procs:
+            if p.is_alive():
+                p.terminate()
+        for p in self._procs:
+            p.join(timeout=5)
+
+    def close(self):
+        self._closed = True
+        # 죽은 레플리카가 큐의 쓰기 lock 을 쥔 채 종료됐을 수 있으므로, 종료 시 큐 feeder 스레드를 기다리지 않는다
+        # (기다리면 인터프리터 종료가 멈춘다)
+        self._tasks.cancel_join_thread()
+        self._results.cancel_join_thread()
+        for _ in self._procs:
+            self._tasks.put(None)
+        for p in self._procs:
+            p.join(timeout=5)
+        self._terminate()
+        if self.error is None:
+            # 결과 스레드 깨우기 (실패한 풀은 결과 스레드가 이미 끝났다)
+            self._results.put((None, None, None, None))
+
+
+_pools: dict[str, InferencePool] = {}
+
+def start_pool(model_name: str, model, model_loader, replicas: int, threads_per_replica: int = 0,
+               **kwargs) -> InferencePool:
+    pool = InferencePool(model, model_loader, replicas, threads_per_replica, **kwargs)
+    _pools[model_name] = pool
+    return pool
+
+def get_pool(model_name: str) -> Optional[InferencePool]:
+    return _pools.get(model_name)
+
+def close_pools():
+    for pool in _pools.values():
+        pool.close()
+    _pools.clear()
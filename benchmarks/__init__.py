@@ -0,0 +1,8 @@
+"""
+임베딩 서비스 / 데이터 파이프라인 벤치마크
+
+실행:
+  python -m benchmarks.run                              # 전체 실행 → benchmarks/results/<시각>.json
+  python -m benchmarks.run embed load --quick           # 일부만, 짧게
+  python -m benchmarks.run compare baseline.json new.json --threshold 0.1
+"""
@@ -0,0 +1,32 @@
+"""
+embed_texts 모델 경로 마이크로벤치마크: 배치 크기 x 길이 구간(난이도)
+
+캐시/마이크로 배칭 대기를 빼고 순수 encode 비용을 보기 위해 app.model._encode 를 직접 호출한다.
+"""
+
+from .common import DIFFICULTIES, corpus_by_difficulty, summarize_ms, timeit
+
+BATCH_SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+QUICK_BATCH_SIZES = [1, 8, 32]
+
+
+def run(quick: bool = False) -> dict:
+    from app.model import MODEL_NAME, EMBED_BACKEND, _encode, get_model
+
+    get_model()
+    batch_sizes = QUICK_BATCH_SIZES if quick else BATCH_SIZES
+    repeats = 3 if quick else 10
+    corpus = corpus_by_difficulty(max(batch_sizes))
+
+    results = {}
+    for d in DIFFICULTIES:
+        texts = [en for en, _ in corpus[d]] + [ko for _, ko in corpus[d]]
+        for bs in batch_sizes:
+            batch = texts[:bs]
+            samples = timeit(lambda: _encode(batch), repeats)
+            stats = summarize_ms(samples)
+            stats["texts_per_sec"] = round(bs / (stats["p50_ms"] / 1000), 1)
+            results[f"embed/{d}/bs{bs}"] = stats
+            print(f"  embed {d:12s} bs={bs:<4d} p50 {stats['p50_ms']:8.2f}ms  {stats['texts_per_sec']:8.1f} texts/s")
+    results["embed/_config"] = {"model": MODEL_NAME, "backend": EMBED_BACKEND, "repeats": repeats}
+    return results
@@ -0,0 +1,99 @@
+"""
+/judge, /embed 인프로세스 부하 생성기
+
+HTTP 서버나 클라이언트 라이브러리 없이 ASGI 앱을 직접 호출한다. 동시성 단계별로
+closed-loop 워커 N개가 정해진 시간 동안 요청을 보내고 p50/p95/p99 와 초당 요청 수를 보고한다.
+"""
+
+import asyncio
+import json
+import random
+import time
+
+from .common import SEED, corpus_by_difficulty, summarize_ms
+
+CONCURRENCY = [1, 4, 16, 64]
+QUICK_CONCURRENCY = [1, 8]
+
+
+async def _call(app, method: str, path: str, body: dict) -> int:
+    payload = json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "", "server": ("bench", 80), "client": ("bench", 0),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+    }
+    sent = False
+    status = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def _sweep(app, path: str, make_body, concurrency: int, duration: float) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(seed: int):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            status = await _call(app, "POST", path, make_body(rng))
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(SEED + i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    stats = summarize_ms(latencies) if latencies else {}
+    stats["requests"] = len(latencies)
+    stats["errors"] = errors
+    stats["rps"] = round(len(latencies) / elapsed, 1)
+    return stats
+
+
+async def _run(quick: bool) -> dict:
+    from app import startup
+    from app.main import app
+
+    pairs = [p for ps in corpus_by_difficulty(200).values() for p in ps]
+    bodies = {
+        "/judge": lambda rng: dict(zip(("en", "ko"), rng.choice(pairs))),
+        "/embed": lambda rng: {"text": rng.choice(pairs)[rng.randint(0, 1)]},
+    }
+    levels = QUICK_CONCURRENCY if quick else CONCURRENCY
+    duration = 3.0 if quick else 15.0
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        await asyncio.to_thread(startup.state.wait)  # 모델 로딩/워밍업은 백그라운드에서 진행되므로 준비될 때까지 대기
+        for path, make_body in bodies.items():
+            await _sweep(app, path, make_body, 1, 1.0)  # 워밍업
+            for c in levels:
+                stats = await _sweep(app, path, make_body, c, duration)
+                results[f"load{path}/c{c}"] = stats
+                print(f"  load {path:7s} c={c:<3d} p50 {stats.get('p50_ms', 0):8.2f}ms "
+                      f"p99 {stats.get('p99_ms', 0):8.2f}ms  {stats['rps']:8.1f} req/s  err {stats['errors']}")
+    results["load/_config"] = {"duration_s": duration, "concurrency": levels}
+    return results
+
+
+def run(quick: bool = False) -> dict:
+    return asyncio.run(_run(quick))
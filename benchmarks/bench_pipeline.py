@@ -0,0 +1,143 @@
+"""
+scripts/cleanse_data.py, scripts/load_data.py 단계별 시간 측정
+
+합성 xlsx(구어체 2개 + 대화체 1개)를 임시 디렉토리에 만들고, 적재는 SQLite 임시 DB로 수행한다.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from .common import DIFFICULTIES, ROOT, SEED, synthetic_pair
+
+ROWS = 50_000
+QUICK_ROWS = 2_000
+REPEATS = 3
+
+
+def _import_script(name: str):
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", ROOT / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    # 프로세스 풀 작업 함수를 pickle 할 수 있도록 모듈을 등록
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _noisy_pair(rng: random.Random) -> tuple[str, str]:
+    # 필터 탈락 사유가 골고루 나오도록 일부 행을 망가뜨린다
+    en, ko = synthetic_pair(rng, rng.choice(DIFFICULTIES))
+    r = rng.random()
+    if r < 0.03:
+        return en, ""
+    if r < 0.06:
+        return en + " 123 456 !!! ###", ko
+    if r < 0.09:
+        return en, "english only text"
+    if r < 0.15:
+        return en.lower(), ko  # 대소문자만 다른 중복 후보
+    return en, ko
+
+
+def make_fixtures(data_dir: Path, rows: int):
+    import openpyxl
+
+    rng = random.Random(SEED)
+    for name in ("1_구어체(1).xlsx", "1_구어체(2).xlsx"):
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(["SID", "원문", "번역문"])
+        for i in range(rows):
+            en, ko = _noisy_pair(rng)
+            ws.append([i, ko, en])
+        wb.save(data_dir / name)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["대분류", "소분류", "상황", "Set Nr.", "발화자", "원문", "번역문"])
+    for i in range(rows):
+        en, ko = _noisy_pair(rng)
+        ws.append([rng.choice(["일상", "쇼핑", "여행"]), "소분류", "상황", i // 4, "A", ko, en])
+    wb.save(data_dir / "2_대화체.xlsx")
+
+
+def _timed(results: dict, key: str, fn, repeats: int = REPEATS):
+    # 단계마다 여러 번 실행해 중앙값을 기록 (모든 단계는 같은 입력에 대해 멱등)
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            out = fn()
+        samples.append(time.perf_counter() - start)
+    results[key] = {"seconds_s": round(sorted(samples)[len(samples) // 2], 4)}
+    print(f"  {key:40s} {results[key]['seconds_s']:8.3f}s")
+    return out
+
+
+def run(quick: bool = False) -> dict:
+    rows = QUICK_ROWS if quick else ROWS
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        start = time.perf_counter()
+        make_fixtures(tmp, rows)
+        fixtures_s = round(time.perf_counter() - start, 3)
+
+        cleanse = _import_script("cleanse_data")
+        cleanse.DATA_DIR = tmp
+        cleanse.OUTPUT_CSV = tmp / "cleansed_sentences.csv"
+        cleanse.REPORT_FILE = tmp / "cleanse_report.txt"
+        # xlsx → 컬럼형 캐시 변환은 한 번만 (이후 단계는 캐시에서 읽음)
+        cleanse.xlsx_cache.XLSX_CACHE_DIR = tmp / "xlsx_cache"
+        _timed(results, "pipeline/cleanse/xlsx_cache_build",
+               lambda: [cleanse.xlsx_cache.build_cache(p) for p in sorted(tmp.glob("*.xlsx"))], repeats=1)
+        # main() 이 파일마다 프로세스 풀에서 돌리는 단계 (파싱 → 필터 → 샤드 CSV)
+        shards = [tmp / "shard_spoken.csv", tmp / "shard_dialog.csv"]
+        _timed(results, "pipeline/cleanse/shard_spoken",
+               lambda: cleanse._cleanse_to_shard("spoken", tmp / "1_구어체(1).xlsx", "AIHUB_SPOKEN_1", shards[0]))
+        _timed(results, "pipeline/cleanse/shard_dialog",
+               lambda: cleanse._cleanse_to_shard("dialog", tmp / "2_대화체.xlsx", "AIHUB_DIALOG", shards[1]))
+        texts = [r[0] for shard in shards for r in cleanse._read_shard(shard)]
+        for mode in ("exact", "near"):
+            def _dedup(mode=mode):
+                d = cleanse.Deduplicator(mode)
+                for t in texts:
+                    d.add(t)
+                return d.finish()
+            _timed(results, f"pipeline/cleanse/dedup_{mode}", _dedup)
+        _timed(results, "pipeline/cleanse/main", lambda: (cleanse.report_lines.clear(), cleanse.main()))
+        results["pipeline/cleanse/main"]["rows_per_sec"] = round(
+            rows * 3 / results["pipeline/cleanse/main"]["seconds_s"], 1
+        )
+
+        os.environ["DATABASE_URL"] = f"sqlite:///{tmp / 'bench.db'}"
+        load = _import_script("load_data")
+        load.CSV_PATH = cleanse.OUTPUT_CSV
+        _timed(results, "pipeline/load/create_tables", load.create_tables, repeats=1)
+        total = _timed(results, "pipeline/load/load_csv", load.load_csv)
+        results["pipeline/load/load_csv"]["rows_per_sec"] = round(
+            total / results["pipeline/load/load_csv"]["seconds_s"], 1
+        )
+        # 이전 방식(행별 ORM 객체)과 비교용
+        load.LOAD_MODE = "orm"
+        total = _timed(results, "pipeline/load/load_csv_orm", load.load_csv)
+        results["pipeline/load/load_csv_orm"]["rows_per_sec"] = round(
+            total / results["pipeline/load/load_csv_orm"]["seconds_s"], 1
+        )
+        # 변경 없는 증분 동기화 (첫 회는 content_hash 채우기가 섞이므로 한 번 돌린 뒤 측정)
+        load.LOAD_MODE = "sync"
+        with contextlib.redirect_stdout(io.StringIO()):
+            load.load_csv()
+        _timed(results, "pipeline/load/sync_unchanged", load.load_csv)
+        load.LOAD_MODE = "auto"
+        _timed(results, "pipeline/load/print_stats", load.print_stats)
+        load.engine.dispose()
+
+    results["pipeline/_config"] = {"rows_per_file": rows, "repeats": REPEATS, "fixtures_s": fixtures_s}
+    return results
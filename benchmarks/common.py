@@ -0,0 +1,95 @@
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+CSV_PATH = ROOT / "scripts" / "cleansed_sentences.csv"
+DIFFICULTIES = ["STARTER", "BEGINNER", "INTERMEDIATE", "ADVANCED", "CHALLENGE"]
+# 난이도별 영어 단어 수 구간 (scripts/cleanse_data.py 의 classify_difficulty 와 동일)
+WORD_RANGES = {
+    "STARTER": (1, 3), "BEGINNER": (4, 8), "INTERMEDIATE": (9, 15),
+    "ADVANCED": (16, 25), "CHALLENGE": (26, 35),
+}
+SEED = 1234
+
+_EN_WORDS = ("the cat dog is was sleeping reading book school friend very good time "
+             "today yesterday we they like want to go home eat lunch with my family").split()
+_KO_WORDS = "고양이가 강아지는 오늘 어제 친구와 학교에 책을 읽고 있다 점심을 먹었다 집에 가고 싶다".split()
+
+
+def synthetic_pair(rng: random.Random, difficulty: str) -> tuple[str, str]:
+    lo, hi = WORD_RANGES[difficulty]
+    n = rng.randint(lo, hi)
+    en = " ".join(rng.choice(_EN_WORDS) for _ in range(n)).capitalize() + "."
+    ko = " ".join(rng.choice(_KO_WORDS) for _ in range(max(1, n // 2 + 1)))
+    return en, ko
+
+
+def corpus_by_difficulty(per_difficulty: int, seed: int = SEED) -> dict[str, list[tuple[str, str]]]:
+    """정제된 CSV에서 난이도별 (en, ko) 샘플. CSV가 없으면 같은 길이 구간의 합성 문장"""
+    rng = random.Random(seed)
+    pools: dict[str, list] = {d: [] for d in DIFFICULTIES}
+    if CSV_PATH.exists():
+        with open(CSV_PATH, "r", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                pools.setdefault(row["difficulty"], []).append((row["english_text"], row["korean_ref"]))
+    out = {}
+    for d in DIFFICULTIES:
+        pool = pools[d]
+        if len(pool) >= per_difficulty:
+            out[d] = rng.sample(pool, per_difficulty)
+        else:
+            out[d] = pool + [synthetic_pair(rng, d) for _ in range(per_difficulty - len(pool))]
+    return out
+
+
+def timeit(fn: Callable, repeats: int, warmup: int = 1) -> list[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize_ms(samples: list[float]) -> dict:
+    arr = np.asarray(samples) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(arr, 50)), 3),
+        "p95_ms": round(float(np.percentile(arr, 95)), 3),
+        "p99_ms": round(float(np.percentile(arr, 99)), 3),
+        "mean_ms": round(float(arr.mean()), 3),
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": SEED,
+        "env": {k: v for k, v in os.environ.items() if k.startswith(("EMBED_", "INFERENCE_", "CASCADE_", "OMP_"))},
+    }
+
+
+def write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -0,0 +1,108 @@
+"""
+벤치마크 실행 / 기준선 비교
+
+  python -m benchmarks.run [embed] [load] [pipeline] [--quick] [--out PATH] [--with-cache]
+  python -m benchmarks.run compare BASELINE.json CURRENT.json [--threshold 0.1]
+
+결과 JSON 의 지표 이름 규칙: *_ms / *_s 는 낮을수록, *_per_sec / rps 는 높을수록 좋다.
+compare 는 threshold(비율) 이상 나빠진 지표를 회귀로 표시하고 종료 코드 1을 반환한다.
+측정 잡음이 큰 아주 작은 값(NOISE_FLOOR 미만)은 비교하지 않는다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+SUITES = ["embed", "load", "pipeline"]
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def _direction(metric: str) -> int:
+    # -1: 낮을수록 좋음, +1: 높을수록 좋음, 0: 비교 안 함
+    if metric.endswith(("_ms", "_s")):
+        return -1
+    if metric.endswith("_per_sec") or metric == "rps":
+        return 1
+    return 0
+
+
+# 이보다 작은 기준값은 측정 잡음이 커서 비교하지 않는다
+NOISE_FLOOR = {"_ms": 1.0, "_s": 0.02}
+
+
+def _below_noise(metric: str, value: float) -> bool:
+    return any(metric.endswith(suffix) and value < floor for suffix, floor in NOISE_FLOOR.items())
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    regressions = []
+    base_results = baseline["results"]
+    for name, metrics in sorted(current["results"].items()):
+        base = base_results.get(name)
+        if base is None or name.endswith("/_config"):
+            continue
+        for metric, value in metrics.items():
+            d = _direction(metric)
+            old = base.get(metric)
+            if d == 0 or not isinstance(old, (int, float)) or not old or _below_noise(metric, old):
+                continue
+            change = (value - old) / old
+            worse = -change * d
+            mark = "REGRESSION" if worse > threshold else ("improved" if worse < -threshold else "")
+            print(f"  {name:35s} {metric:14s} {old:12.3f} → {value:12.3f} ({change * 100:+6.1f}%) {mark}")
+            if worse > threshold:
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        parser = argparse.ArgumentParser(prog="benchmarks.run compare")
+        parser.add_argument("baseline", type=Path)
+        parser.add_argument("current", type=Path)
+        parser.add_argument("--threshold", type=float, default=0.10)
+        args = parser.parse_args(sys.argv[2:])
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+        regressions = compare(baseline, current, args.threshold)
+        print(f"\n회귀 {len(regressions)}건 (기준 {args.threshold * 100:.0f}%)")
+        for r in regressions:
+            print(f"  - {r}")
+        sys.exit(1 if regressions else 0)
+
+    parser = argparse.ArgumentParser(prog="benchmarks.run")
+    parser.add_argument("suites", nargs="*", default=[], help=f"실행할 스위트 ({' / '.join(SUITES)}, 생략 시 전체)")
+    parser.add_argument("--quick", action="store_true", help="짧은 스모크 실행")
+    parser.add_argument("--out", type=Path, default=None)
+    parser.add_argument("--with-cache", action="store_true", help="임베딩 캐시를 켠 채로 측정")
+    args = parser.parse_args()
+    unknown = [s for s in args.suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite: {', '.join(unknown)} (choose from {', '.join(SUITES)})")
+    suites = args.suites or SUITES
+
+    # app.model 은 import 시점에 환경 변수를 읽으므로 import 전에 설정
+    if not args.with_cache:
+        os.environ.setdefault("EMBED_CACHE_ENABLED", "0")
+        os.environ.setdefault("EMBED_DISK_CACHE_ENABLED", "0")
+
+    from .common import environment, write_json
+    from . import bench_embed, bench_load, bench_pipeline
+
+    modules = {"embed": bench_embed, "load": bench_load, "pipeline": bench_pipeline}
+    env = environment()
+    results = {}
+    for suite in suites:
+        print(f"\n[{suite}]")
+        results.update(modules[suite].run(quick=args.quick))
+
+    out = args.out or RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    write_json(out, {"meta": {**env, "suites": suites, "quick": args.quick}, "results": results})
+    print(f"\n저장 완료: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+참조 문장 임베딩을 int8(행별 스케일) / binary(부호 비트) 코드로 양자화해 /search 의 int8, binary 모드를 만드는 스크립트
+
+float32 768차원 벡터는 문장당 3 KB 이지만 int8 코드는 772 B, binary 코드는 96 B 라 전체 스캔 비용과
+워커별 상주 메모리가 크게 준다. 검색 시에는 코드로 k * SEARCH_RERANK 개 후보만 고르고 원본 벡터(mmap)로 재정렬한다.
+
+사전 조건: python scripts/build_ref_embeddings.py 실행 완료
+
+실행:
+  python scripts/build_quantized_index.py                       # 코드 생성 + 재현율 리포트
+  python scripts/build_quantized_index.py --report-only --queries 500 --rerank 1,5,10,20
+
+출력: data/ref_embeddings/q8_{en,ko}.npy, q8scale_{en,ko}.npy, bin_{en,ko}.npy
+리포트: exact(float) 검색 대비 recall@k, top-1 일치율, 질의당 지연, 문장당 바이트
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.ref_store import REF_EMBED_DIR, RefEmbeddingStore  # noqa: E402
+from app.search import QuantizedIndex, SearchIndex  # noqa: E402
+
+
+def report(index: SearchIndex, queries: int, k: int, reranks: list[int], seed: int):
+    # 다른 언어 쪽 벡터를 질의로 사용 (한국어 답안으로 영어 문장을 찾는 /search 와 같은 상황)
+    store = index.store
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(store), min(queries, len(store)), replace=False)
+    dim = store.dim
+    float_bytes = dim * store.vectors["en"].dtype.itemsize
+    bytes_per = {"int8": dim + 4, "binary": (dim + 7) // 8}
+
+    for lang, other in (("en", "ko"), ("ko", "en")):
+        qs = [np.asarray(store.vectors[other][r], dtype=np.float32) for r in rows]
+        start = time.perf_counter()
+        truth = [index.search(q, k, lang=lang, mode="exact")[0] for q in qs]
+        exact_ms = (time.perf_counter() - start) / len(qs) * 1000
+
+        print(f"\n[{lang}] 질의 {len(qs):,}개 ({other} 벡터), k={k}")
+        print(f"  {'모드':8s} {'재정렬':>6s} {'recall@k':>9s} {'top-1':>7s} {'ms/질의':>8s} {'B/문장':>7s}")
+        print(f"  {'exact':8s} {'-':>6s} {1.0:>9.3f} {1.0:>7.3f} {exact_ms:>8.2f} {float_bytes:>7,}")
+        quantized = index.quantized[lang]
+        for mode in (quantized.modes() if quantized is not None else []):
+            for rerank in reranks:
+                start = time.perf_counter()
+                got = [index.search(q, k, lang=lang, mode=mode, rerank=rerank)[0] for q in qs]
+                ms = (time.perf_counter() - start) / len(qs) * 1000
+                recall = np.mean([len(np.intersect1d(g, t)) / max(len(t), 1) for g, t in zip(got, truth)])
+                top1 = np.mean([len(g) > 0 and g[0] == t[0] for g, t in zip(got, truth)])
+                print(f"  {mode:8s} {rerank:>6d} {recall:>9.3f} {top1:>7.3f} {ms:>8.2f} {bytes_per[mode]:>7,}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", type=Path, default=REF_EMBED_DIR)
+    parser.add_argument("--report-only", action="store_true", help="코드는 다시 만들지 않고 리포트만")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank", default="1,4,10,20", help="재정렬 후보 배수 목록")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not (args.dir / "meta.json").exists():
+        print(f"참조 임베딩 없음: {args.dir}")
+        print("먼저 python scripts/build_ref_embeddings.py 를 실행하세요.")
+        sys.exit(1)
+
+    store = RefEmbeddingStore(args.dir)
+    print(f"문장 수: {len(store):,}, 차원: {store.dim}, 원본 dtype: {store.meta['dtype']}")
+    if not args.report_only:
+        for lang in ("en", "ko"):
+            start = time.time()
+            QuantizedIndex.build(store.vectors[lang], args.dir, lang)
+            size = sum(p.stat().st_size for p in QuantizedIndex.paths(args.dir, lang).values())
+            print(f"  [{lang}] {time.time() - start:.1f}초, {size / (1024 * 1024):.1f} MB")
+        print(f"\n저장 완료: {args.dir}")
+
+    reranks = [int(x) for x in args.rerank.split(",") if x]
+    report(SearchIndex(store), args.queries, args.k, reranks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+참조 문장 임베딩 위에 /search 용 IVF(근사 최근접) 인덱스를 만드는 스크립트
+
+사전 조건: python scripts/build_ref_embeddings.py 실행 완료
+
+실행:
+  python scripts/build_search_index.py
+  python scripts/build_search_index.py --nlist 4096 --iter 15
+
+출력: data/ref_embeddings/ivf_en.npz, ivf_ko.npz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.ref_store import REF_EMBED_DIR, RefEmbeddingStore  # noqa: E402
+from app.search import IVFIndex, train_ivf  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", type=Path, default=REF_EMBED_DIR)
+    parser.add_argument("--nlist", type=int, default=0, help="클러스터 수 (기본: 4*sqrt(N))")
+    parser.add_argument("--iter", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=0, help="k-means 학습 샘플 수 (기본: nlist*64)")
+    args = parser.parse_args()
+
+    if not (args.dir / "meta.json").exists():
+        print(f"참조 임베딩 없음: {args.dir}")
+        print("먼저 python scripts/build_ref_embeddings.py 를 실행하세요.")
+        sys.exit(1)
+
+    store = RefEmbeddingStore(args.dir)
+    n = len(store)
+    nlist = args.nlist or max(1, min(n, int(4 * np.sqrt(n))))
+    print(f"문장 수: {n:,}, nlist: {nlist:,}")
+
+    for lang in ("en", "ko"):
+        start = time.time()
+        centroids, offsets, list_rows = train_ivf(
+            store.vectors[lang], nlist, n_iter=args.iter, sample_size=args.sample,
+        )
+        IVFIndex(centroids, offsets, list_rows).save(args.dir, lang)
+        sizes = np.diff(offsets)
+        print(f"  [{lang}] {time.time() - start:.1f}초, "
+              f"클러스터 크기 평균 {sizes.mean():.1f} / 최대 {sizes.max():,}")
+
+    print(f"\n저장 완료: {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+캐스케이드(소형 → 대형 모델) 임계치/밴드 보정 스크립트
+
+cleansed_sentences.csv 에서 정답 쌍(원문-번역)과 오답 쌍(번역을 섞은 쌍)을 샘플링해
+두 모델로 점수를 매긴 뒤,
+  1) 대형 모델 판정과 가장 잘 맞는 소형 모델 임계치(맞음/부분적)를 찾고
+  2) 밴드 폭별로 대형 모델 호출 비율과 최종 판정 일치율을 보고한다.
+
+실행: python scripts/calibrate_cascade.py [--pairs 2000]
+결과로 출력되는 CASCADE_* 환경 변수를 서버 실행 시 지정하면 된다.
+"""
+
+import argparse
+import csv
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.model import MODEL_NAME, get_model  # noqa: E402
+from app.service import (  # noqa: E402
+    CASCADE_SMALL_MODEL, THRESHOLD_CORRECT, THRESHOLD_PARTIAL,
+    cosine_sim_rows, judge_similarity_array,
+)
+
+CSV_PATH = Path(__file__).parent / "cleansed_sentences.csv"
+BANDS = [0.0, 0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15]
+
+
+def sample_pairs(n: int, seed: int) -> tuple[list[str], list[str]]:
+    with open(CSV_PATH, "r", encoding="utf-8") as f:
+        rows = [(r["english_text"], r["korean_ref"]) for r in csv.DictReader(f)]
+    rng = random.Random(seed)
+    pos = rng.sample(rows, min(n, len(rows)))
+    shuffled_ko = [ko for _, ko in rng.sample(rows, len(pos))]
+    en = [e for e, _ in pos] * 2
+    ko = [k for _, k in pos] + shuffled_ko
+    return en, ko
+
+
+def pair_sims(model_name: str, en: list[str], ko: list[str]) -> np.ndarray:
+    model = get_model(model_name)
+    vecs = model.encode([t for p in zip(en, ko) for t in p], batch_size=64,
+                        convert_to_numpy=True, normalize_embeddings=True)
+    return cosine_sim_rows(vecs[0::2], vecs[1::2])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--target-agreement", type=float, default=0.99)
+    args = parser.parse_args()
+
+    if not CSV_PATH.exists():
+        print(f"CSV 파일 없음: {CSV_PATH}")
+        print("먼저 python scripts/cleanse_data.py 를 실행하세요.")
+        sys.exit(1)
+
+    en, ko = sample_pairs(args.pairs, args.seed)
+    print(f"샘플: {len(en):,}쌍 (정답 {len(en)//2:,} + 오답 {len(en)//2:,})")
+    large = pair_sims(MODEL_NAME, en, ko)
+    small = pair_sims(CASCADE_SMALL_MODEL, en, ko)
+    truth = judge_similarity_array(large)
+
+    # 1) 소형 모델 임계치: 대형 모델 판정 일치율 최대 (partial < correct 인 조합만)
+    grid = np.round(np.arange(0.30, 0.99, 0.005), 3)
+    best = (0.0, THRESHOLD_CORRECT, THRESHOLD_PARTIAL)
+    for c in grid:
+        for p in grid[grid < c]:
+            agree = (judge_similarity_array(small, c, p) == truth).mean()
+            if agree > best[0]:
+                best = (agree, c, p)
+    agree0, sc, sp = best
+    print(f"\n소형 모델 임계치: 맞음 {sc:.3f} / 부분적 {sp:.3f} (단독 판정 일치율 {agree0*100:.2f}%)")
+
+    # 2) 밴드 폭별 대형 모델 호출 비율과 최종 일치율
+    print("\n밴드   대형호출   최종일치")
+    pred_small = judge_similarity_array(small, sc, sp)
+    chosen = None
+    for b in BANDS:
+        esc = (np.abs(small - sc) < b) | (np.abs(small - sp) < b)
+        final = np.where(esc, truth, pred_small)
+        agree = (final == truth).mean()
+        print(f"  {b:5.3f}  {esc.mean()*100:6.1f}%  {agree*100:7.2f}%")
+        if chosen is None and agree >= args.target_agreement:
+            chosen = b
+    chosen = BANDS[-1] if chosen is None else chosen
+
+    print("\n권장 설정:")
+    print("  CASCADE_ENABLED=1")
+    print(f"  CASCADE_SMALL_THRESHOLD_CORRECT={sc:.3f}")
+    print(f"  CASCADE_SMALL_THRESHOLD_PARTIAL={sp:.3f}")
+    print(f"  CASCADE_BAND_CORRECT={chosen}")
+    print(f"  CASCADE_BAND_PARTIAL={chosen}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+torch 백엔드 대비 ONNX(int8) 백엔드의 유사도 오차를 측정하는 스크립트
+
+cleansed_sentences.csv 에서 난이도별로 문장 쌍을 샘플링해 두 백엔드로 각각
+en/ko 유사도를 계산하고, 점수 차이와 판정(맞음/부분적/아님) 일치율을 보고한다.
+
+실행: python scripts/check_onnx_accuracy.py [--per-difficulty 200]
+"""
+
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.model import load_model  # noqa: E402
+from app.service import cosine_sim_rows, judge_similarity_array  # noqa: E402
+
+CSV_PATH = Path(__file__).parent / "cleansed_sentences.csv"
+DIFFICULTIES = ["STARTER", "BEGINNER", "INTERMEDIATE", "ADVANCED", "CHALLENGE"]
+
+
+def sample_pairs(per_difficulty: int, seed: int) -> list[dict]:
+    by_diff = {d: [] for d in DIFFICULTIES}
+    with open(CSV_PATH, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            by_diff.setdefault(row["difficulty"], []).append(row)
+    rng = random.Random(seed)
+    rows = []
+    for d in DIFFICULTIES:
+        pool = by_diff[d]
+        rows.extend(rng.sample(pool, min(per_difficulty, len(pool))))
+    return rows
+
+
+def score(backend: str, rows: list[dict]):
+    model = load_model(backend)
+    texts = [t for r in rows for t in (r["english_text"], r["korean_ref"])]
+    start = time.time()
+    vecs = model.encode(texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=True)
+    elapsed = time.time() - start
+    return vecs, cosine_sim_rows(vecs[0::2], vecs[1::2]), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-difficulty", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if not CSV_PATH.exists():
+        print(f"CSV 파일 없음: {CSV_PATH}")
+        print("먼저 python scripts/cleanse_data.py 를 실행하세요.")
+        sys.exit(1)
+
+    rows = sample_pairs(args.per_difficulty, args.seed)
+    print(f"샘플: {len(rows):,}쌍")
+
+    vecs_t, sims_t, sec_t = score("torch", rows)
+    vecs_o, sims_o, sec_o = score("onnx", rows)
+
+    drift = np.abs(sims_t - sims_o)
+    vec_cos = cosine_sim_rows(vecs_t, vecs_o)
+    agree = judge_similarity_array(sims_t) == judge_similarity_array(sims_o)
+
+    print(f"\n인코딩 시간: torch {sec_t:.2f}초 / onnx {sec_o:.2f}초 (x{sec_t / max(sec_o, 1e-9):.2f})")
+    print(f"벡터 코사인(torch↔onnx): 평균 {vec_cos.mean():.5f} / 최소 {vec_cos.min():.5f}")
+    print(f"유사도 오차: 평균 {drift.mean():.5f} / p95 {np.percentile(drift, 95):.5f} / 최대 {drift.max():.5f}")
+    print(f"판정 일치율: {agree.mean() * 100:.2f}%")
+
+    print("\n난이도별:")
+    diffs = np.array([r["difficulty"] for r in rows])
+    for d in DIFFICULTIES:
+        m = diffs == d
+        if not m.any():
+            continue
+        print(f"  {d:15s}: 오차 평균 {drift[m].mean():.5f} / 최대 {drift[m].max():.5f}, "
+              f"판정 일치 {agree[m].mean() * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,19 @@ AI Hub 한영 병렬 말뭉치 정제 스크립트 (v2)
 """
 
 import csv
+import os
 import re
 import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-try:
-    import openpyxl
-except ImportError:
-    print("openpyxl이 필요합니다: pip install openpyxl")
-    sys.exit(1)
+import numpy as np
+
+# xlsx 원본 대신 컬럼형 캐시로 읽는 공용 리더 (scripts/xlsx_cache.py)
+sys.path.insert(0, str(Path(__file__).parent))
+import xlsx_cache  # noqa: E402
+from near_dedup import Deduplicator  # noqa: E402
 
 DATA_DIR = Path(__file__).parent.parent / "docs" / "한국어-영어 번역(병렬) 말뭉치"
 OUTPUT_CSV = Path(__file__).parent / "cleansed_sentences.csv"
@@ -121,94 +125,82 @@ def filter_sentence(en_text: str, ko_text: str) -> tuple[bool, str]:
     return True, "ok"
 
 
-def process_spoken_file(filepath: Path, source_label: str) -> list[dict]:
-    """구어체 파일 처리 (컬럼: SID, 원문, 번역문)"""
-    log(f"\n처리 중: {filepath.name}")
-    wb = openpyxl.load_workbook(filepath, read_only=True)
-    ws = wb[wb.sheetnames[0]]
+# CSV 컬럼 순서 (load_data.py 의 CSV_COLUMNS 와 같음)
+FIELDNAMES = ["english_text", "korean_ref", "difficulty", "category", "subcategory", "source"]
 
-    results = []
-    stats = {"total": 0, "passed": 0, "reasons": {}}
 
-    for row in ws.iter_rows(min_row=2, values_only=True):
-        stats["total"] += 1
-        ko_text = str(row[1]).strip() if row[1] else ""
-        en_text = str(row[2]).strip() if row[2] else ""
+def _cell(value) -> str:
+    return str(value).strip() if value else ""
 
-        passed, reason = filter_sentence(en_text, ko_text)
-        if passed:
-            stats["passed"] += 1
-            results.append({
-                "english_text": en_text,
-                "korean_ref": ko_text,
-                "difficulty": classify_difficulty(en_text),
-                "category": "DAILY",
-                "subcategory": "",
-                "source": source_label,
-            })
-        else:
-            stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
 
-    wb.close()
+def iter_spoken_rows(filepath: Path, source_label: str):
+    """구어체 파일 행 (컬럼: SID, 원문, 번역문) → (영어, 한국어, 대분류, 소분류, 출처)"""
+    wb = xlsx_cache.load_workbook(filepath)
+    try:
+        for row in wb[wb.sheetnames[0]].iter_rows(min_row=2, values_only=True):
+            yield _cell(row[2]), _cell(row[1]), "DAILY", "", source_label
+    finally:
+        wb.close()
 
-    log(f"  전체: {stats['total']:,}행 → 통과: {stats['passed']:,}행 ({stats['passed']/max(stats['total'],1)*100:.1f}%)")
-    log(f"  탈락 사유:")
-    for reason, count in sorted(stats["reasons"].items(), key=lambda x: -x[1]):
-        log(f"    {reason}: {count:,}")
 
-    return results
+def iter_dialog_rows(filepath: Path):
+    """대화체 파일 행 (컬럼: 대분류, 소분류, 상황, Set Nr., 발화자, 원문, 번역문)"""
+    wb = xlsx_cache.load_workbook(filepath)
+    try:
+        for row in wb[wb.sheetnames[0]].iter_rows(min_row=2, values_only=True):
+            yield _cell(row[6]), _cell(row[5]), _cell(row[0]), _cell(row[1]), "AIHUB_DIALOG"
+    finally:
+        wb.close()
 
 
-def process_dialog_file(filepath: Path) -> list[dict]:
-    """대화체 파일 처리 (컬럼: 대분류, 소분류, 상황, Set Nr., 발화자, 원문, 번역문)"""
-    log(f"\n처리 중: {filepath.name}")
-    wb = openpyxl.load_workbook(filepath, read_only=True)
-    ws = wb[wb.sheetnames[0]]
+def new_stats() -> dict:
+    return {"total": 0, "passed": 0, "reasons": {}}
 
-    results = []
-    stats = {"total": 0, "passed": 0, "reasons": {}}
 
-    for row in ws.iter_rows(min_row=2, values_only=True):
+def cleanse_rows(rows, stats: dict):
+    """필터를 통과한 행만 FIELDNAMES 순서의 리스트로 흘려보내며 stats 를 갱신"""
+    for en_text, ko_text, category, subcategory, source in rows:
         stats["total"] += 1
-        major_cat = str(row[0]).strip() if row[0] else ""
-        minor_cat = str(row[1]).strip() if row[1] else ""
-        ko_text = str(row[5]).strip() if row[5] else ""
-        en_text = str(row[6]).strip() if row[6] else ""
-
         passed, reason = filter_sentence(en_text, ko_text)
         if passed:
             stats["passed"] += 1
-            results.append({
-                "english_text": en_text,
-                "korean_ref": ko_text,
-                "difficulty": classify_difficulty(en_text),
-                "category": major_cat,
-                "subcategory": minor_cat,
-                "source": "AIHUB_DIALOG",
-            })
+            yield [en_text, ko_text, classify_difficulty(en_text), category, subcategory, source]
         else:
             stats["reasons"][reason] = stats["reasons"].get(reason, 0) + 1
 
-    wb.close()
 
+def log_file_stats(stats: dict):
     log(f"  전체: {stats['total']:,}행 → 통과: {stats['passed']:,}행 ({stats['passed']/max(stats['total'],1)*100:.1f}%)")
     log(f"  탈락 사유:")
     for reason, count in sorted(stats["reasons"].items(), key=lambda x: -x[1]):
         log(f"    {reason}: {count:,}")
 
-    return results
 
+# ──────────────────────────────────────────────
+# 병렬 스트리밍 파이프라인
+# 파일마다 프로세스 하나가 파싱 → 필터 → 난이도 분류를 제너레이터로 흘려 임시 샤드 CSV 에 쓰고,
+# 메인 프로세스는 샤드를 원래 파일 순서대로 이어 읽으며 중복 제거 + 통계 + 최종 CSV 쓰기를 한 번에 한다.
+# 말뭉치 전체를 메모리에 올리지 않는다 (중복 판정용 해시/MinHash 서명 배열만 유지).
+# ──────────────────────────────────────────────
+CLEANSE_WORKERS = int(os.getenv("CLEANSE_WORKERS", "0"))  # 0이면 min(파일 수, CPU 수)
+# exact: 영어 문장 완전 일치(대소문자 무시)만 제거 (기본, 기존 출력과 동일)
+# near: MinHash/LSH 유사 중복까지 제거 (scripts/near_dedup.py). 출력 행이 줄어 load_data 동기화 대상도 바뀐다
+DEDUP_MODE = os.getenv("DEDUP_MODE", "exact")
+# 1이면 중복 제거 후 남은 쌍을 임베딩 유사도로 한 번 더 거른다 (scripts/quality_filter.py, 모델 필요)
+QUALITY_FILTER = os.getenv("QUALITY_FILTER", "0") == "1"
+
+
+def _cleanse_to_shard(kind: str, filepath: Path, label: str, shard_path: Path) -> dict:
+    rows = iter_spoken_rows(filepath, label) if kind == "spoken" else iter_dialog_rows(filepath)
+    stats = new_stats()
+    with open(shard_path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(cleanse_rows(rows, stats))
+    return stats
 
-def deduplicate(sentences: list[dict]) -> list[dict]:
-    """영어 문장 기준 중복 제거 (대소문자 무시)"""
-    seen = set()
-    unique = []
-    for s in sentences:
-        key = s["english_text"].lower().strip()
-        if key not in seen:
-            seen.add(key)
-            unique.append(s)
-    return unique
+
+def _read_shard(shard_path: Path):
+    with open(shard_path, "r", newline="", encoding="utf-8") as f:
+        yield from csv.reader(f)
 
 
 def main():
@@ -220,67 +212,126 @@ def main():
     log(f"특수문자 비율 상한: {SPECIAL_CHAR_RATIO*100:.0f}%")
     log(f"난이도: STARTER(1-3) / BEGINNER(4-8) / INTERMEDIATE(9-15) / ADVANCED(16-25) / CHALLENGE(26-35)")
 
-    all_sentences = []
-
-    # 구어체 처리
-    for filename, label in [
-        ("1_구어체(1).xlsx", "AIHUB_SPOKEN_1"),
-        ("1_구어체(2).xlsx", "AIHUB_SPOKEN_2"),
-    ]:
-        filepath = DATA_DIR / filename
-        if filepath.exists():
-            all_sentences.extend(process_spoken_file(filepath, label))
+    sources = [
+        ("spoken", "1_구어체(1).xlsx", "AIHUB_SPOKEN_1"),
+        ("spoken", "1_구어체(2).xlsx", "AIHUB_SPOKEN_2"),
+        ("dialog", "2_대화체.xlsx", "AIHUB_DIALOG"),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = [
+            (kind, DATA_DIR / filename, label, Path(tmp) / f"shard_{i}.csv")
+            for i, (kind, filename, label) in enumerate(sources)
+            if (DATA_DIR / filename).exists()
+        ]
+        workers = CLEANSE_WORKERS or min(len(jobs), os.cpu_count() or 1)
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                file_stats = list(pool.map(_cleanse_to_shard, *zip(*jobs)))
         else:
-            log(f"\n파일 없음: {filename}")
-
-    # 대화체 처리
-    dialog_path = DATA_DIR / "2_대화체.xlsx"
-    if dialog_path.exists():
-        all_sentences.extend(process_dialog_file(dialog_path))
-    else:
-        log(f"\n파일 없음: 2_대화체.xlsx")
+            file_stats = [_cleanse_to_shard(*job) for job in jobs]
+        by_file = {job[1].name: (job[3], st) for job, st in zip(jobs, file_stats)}
+
+        # 파일별 결과는 원래 순서대로 기록 (리포트 내용은 순차 처리와 동일)
+        for _, filename, _ in sources:
+            if filename in by_file:
+                log(f"\n처리 중: {filename}")
+                log_file_stats(by_file[filename][1])
+            else:
+                log(f"\n파일 없음: {filename}")
+        shards = [shard for shard, _ in by_file.values()]
+        before_dedup = sum(st["passed"] for _, st in by_file.values())
+
+        # 1패스: 영어 문장만 읽어 남길 행 결정 (유사 중복 서명은 프로세스 풀에서 계산)
+        dedup = Deduplicator(DEDUP_MODE, workers=CLEANSE_WORKERS)
+        for shard in shards:
+            for r in _read_shard(shard):
+                dedup.add(r[0])
+        keep, dedup_stats = dedup.finish()
+        deduped = int(keep.sum())
+
+        # 선택: 번역 품질 필터 (남은 쌍만 인코딩, 체크포인트로 재개 가능)
+        quality = None
+        if QUALITY_FILTER:
+            import quality_filter
+
+            # 남은 쌍을 샤드에서 다시 읽어 QUALITY_CHUNK_PAIRS 쌍씩 채점 (전체 목록을 만들지 않음)
+            pairs = (
+                (r[0], r[1])
+                for r, kept in zip((r for shard in shards for r in _read_shard(shard)), keep) if kept
+            )
+            scores = quality_filter.score_pair_stream(pairs)
+            low = scores < quality_filter.QUALITY_MIN_SIMILARITY
+            keep[np.flatnonzero(keep)[low]] = False
+            quality = {
+                "threshold": quality_filter.QUALITY_MIN_SIMILARITY,
+                "reason": quality_filter.REJECT_REASON,
+                "rejected": int(low.sum()),
+                "percentiles": np.percentile(scores, [5, 25, 50, 75, 95]) if len(scores) else [],
+            }
+
+        # 2패스: 통계 + CSV 쓰기
+        diff_stats = {}
+        cat_stats = {}
+        source_stats = {}
+        written = 0
+        with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDNAMES)
+            rows = (r for shard in shards for r in _read_shard(shard))
+            for row, kept in zip(rows, keep):
+                if not kept:
+                    continue
+                writer.writerow(row)
+                written += 1
+                _, _, difficulty, category, _, source = row
+                diff_stats[difficulty] = diff_stats.get(difficulty, 0) + 1
+                cat_stats[category] = cat_stats.get(category, 0) + 1
+                source_stats[source] = source_stats.get(source, 0) + 1
 
     log(f"\n{'='*60}")
-    log(f"중복 제거 전: {len(all_sentences):,}문장")
-    all_sentences = deduplicate(all_sentences)
-    log(f"중복 제거 후: {len(all_sentences):,}문장")
-
-    # 난이도별 통계
-    diff_stats = {}
-    cat_stats = {}
-    source_stats = {}
-    for s in all_sentences:
-        diff_stats[s["difficulty"]] = diff_stats.get(s["difficulty"], 0) + 1
-        cat_stats[s["category"]] = cat_stats.get(s["category"], 0) + 1
-        source_stats[s["source"]] = source_stats.get(s["source"], 0) + 1
+    log(f"중복 제거 전: {before_dedup:,}문장")
+    log(f"중복 제거 후: {deduped:,}문장")
+    if DEDUP_MODE == "near":
+        log(f"  완전 중복: {dedup_stats['exact_dups']:,}문장")
+        log(f"  유사 중복: {dedup_stats['near_dups']:,}문장 (MinHash 추정 유사도 {dedup.threshold:.2f} 이상)")
+        sizes = dedup_stats["cluster_sizes"]
+        log(f"\n중복 클러스터 크기 분포 ({sum(sizes.values()):,}개 클러스터):")
+        for size, count in sorted(sizes.items()):
+            if size <= 10:
+                log(f"  {size:>4d}문장: {count:>8,}개")
+        large = sum(c for s, c in sizes.items() if s > 10)
+        if large:
+            log(f"  {'11+':>4s}문장: {large:>8,}개 (최대 {max(sizes):,}문장)")
+
+    if quality is not None:
+        log(f"\n번역 품질 필터 (영-한 임베딩 유사도 {quality['threshold']:.2f} 이상 통과):")
+        log(f"  전체: {deduped:,}쌍 → 통과: {written:,}쌍 ({written/max(deduped,1)*100:.1f}%)")
+        log(f"  탈락 사유:")
+        log(f"    {quality['reason']}: {quality['rejected']:,}")
+        if len(quality["percentiles"]):
+            p = quality["percentiles"]
+            log(f"  유사도 분위수: p5 {p[0]:.3f} / p25 {p[1]:.3f} / p50 {p[2]:.3f} / p75 {p[3]:.3f} / p95 {p[4]:.3f}")
 
     log(f"\n난이도별 분포:")
     for d in ["STARTER", "BEGINNER", "INTERMEDIATE", "ADVANCED", "CHALLENGE"]:
         count = diff_stats.get(d, 0)
-        pct = count / max(len(all_sentences), 1) * 100
+        pct = count / max(written, 1) * 100
         log(f"  {d:15s}: {count:>8,}  ({pct:5.1f}%)")
 
     log(f"\n카테고리별 분포:")
     for cat, count in sorted(cat_stats.items(), key=lambda x: -x[1]):
-        pct = count / max(len(all_sentences), 1) * 100
+        pct = count / max(written, 1) * 100
         log(f"  {cat:15s}: {count:>8,}  ({pct:5.1f}%)")
 
     log(f"\n출처별 분포:")
     for src, count in sorted(source_stats.items(), key=lambda x: -x[1]):
-        pct = count / max(len(all_sentences), 1) * 100
+        pct = count / max(written, 1) * 100
         log(f"  {src:20s}: {count:>8,}  ({pct:5.1f}%)")
 
-    # CSV 출력
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=[
-            "english_text", "korean_ref", "difficulty", "category", "subcategory", "source"
-        ])
-        writer.writeheader()
-        writer.writerows(all_sentences)
-
     log(f"\n{'='*60}")
     log(f"CSV 저장 완료: {OUTPUT_CSV}")
-    log(f"총 {len(all_sentences):,}문장")
+    log(f"총 {written:,}문장")
 
     # 리포트 저장
     REPORT_FILE.write_text("\n".join(report_lines), encoding="utf-8")
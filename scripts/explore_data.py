@@ -9,11 +9,9 @@ AI Hub 한영 병렬 말뭉치 xlsx 데이터 탐색 스크립트
 import sys
 from pathlib import Path
 
-try:
-    import openpyxl
-except ImportError:
-    print("openpyxl이 필요합니다: pip install openpyxl")
-    sys.exit(1)
+# xlsx 원본 대신 컬럼형 캐시로 읽는 공용 리더 (scripts/xlsx_cache.py)
+sys.path.insert(0, str(Path(__file__).parent))
+import xlsx_cache  # noqa: E402
 
 DATA_DIR = Path(__file__).parent.parent / "docs" / "한국어-영어 번역(병렬) 말뭉치"
 OUTPUT_FILE = Path(__file__).parent / "explore_result.txt"
@@ -37,7 +35,7 @@ def explore_xlsx(filepath: Path, sample_rows: int = 3):
     log(f"크기: {filepath.stat().st_size / (1024*1024):.1f} MB")
     log(f"{'='*80}")
 
-    wb = openpyxl.load_workbook(filepath, read_only=True)
+    wb = xlsx_cache.load_workbook(filepath)
 
     for sheet_name in wb.sheetnames:
         ws = wb[sheet_name]
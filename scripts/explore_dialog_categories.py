@@ -9,11 +9,9 @@ import sys
 from pathlib import Path
 from collections import Counter
 
-try:
-    import openpyxl
-except ImportError:
-    print("openpyxl이 필요합니다: pip install openpyxl")
-    sys.exit(1)
+# xlsx 원본 대신 컬럼형 캐시로 읽는 공용 리더 (scripts/xlsx_cache.py)
+sys.path.insert(0, str(Path(__file__).parent))
+import xlsx_cache  # noqa: E402
 
 DATA_DIR = Path(__file__).parent.parent / "docs" / "한국어-영어 번역(병렬) 말뭉치"
 OUTPUT = Path(__file__).parent / "dialog_categories.txt"
@@ -27,7 +25,7 @@ def log(msg=""):
 
 def main():
     filepath = DATA_DIR / "2_대화체.xlsx"
-    wb = openpyxl.load_workbook(filepath, read_only=True)
+    wb = xlsx_cache.load_workbook(filepath)
     ws = wb[wb.sheetnames[0]]
 
     # 계층별 수집
@@ -0,0 +1,49 @@
+"""
+임베딩 모델을 ONNX로 변환하고 동적 int8 양자화를 적용하는 스크립트
+
+실행:
+  python scripts/export_onnx.py                       # avx2 (대부분의 x86 CPU)
+  python scripts/export_onnx.py --config avx512_vnni  # VNNI 지원 CPU
+  EMBED_BACKEND=onnx uvicorn app.main:app             # 변환된 모델로 서버 실행
+
+필요: pip install "optimum[onnxruntime]"
+출력: data/onnx/<모델명>/ (ONNX_MODEL_DIR 로 변경 가능)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.model import MODEL_NAME, onnx_file_name, onnx_model_dir  # noqa: E402
+
+try:
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+except ImportError:
+    print("sentence-transformers>=3.2 가 필요합니다: pip install -U sentence-transformers")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--config", choices=["arm64", "avx2", "avx512", "avx512_vnni"], default="avx2")
+    parser.add_argument("--model", default=MODEL_NAME, help="변환할 모델 (캐스케이드 소형 모델 등)")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+    args.out = args.out or onnx_model_dir(args.model)
+
+    print(f"ONNX 변환: {args.model}")
+    # backend="onnx" 로 로딩하면 ONNX 파일이 없을 때 자동으로 export 된다
+    model = SentenceTransformer(args.model, backend="onnx")
+    model.save(str(args.out))
+
+    print(f"동적 int8 양자화: {args.config}")
+    export_dynamic_quantized_onnx_model(model, args.config, str(args.out))
+
+    print(f"\n저장 완료: {args.out / onnx_file_name(args.config)}")
+    if args.config != "avx2":
+        print(f"서버 실행 시 ONNX_QUANT_CONFIG={args.config} 를 지정하세요.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,17 +11,32 @@ DB 조회는 Spring Boot에서 수행하므로, 이 스크립트는 적재 전
 
 실행:
   python scripts/load_data.py
+
+적재 방식 (LOAD_MODE):
+  auto        PostgreSQL이면 copy, 그 외(SQLite 등)는 executemany (기본값)
+  copy        CSV 파일을 그대로 COPY sentences (...) FROM STDIN 으로 흘려보냄 (행별 파이썬 객체 없음)
+  executemany CSV 행 튜플을 배치 단위 executemany 로 삽입
+  orm         행마다 Sentence 객체를 만들어 bulk_save_objects (이전 방식)
+  sync        증분 동기화: 내용 해시로 비교해 새 행만 추가, 바뀐 행은 수정, 사라진 행은 삭제 (한 트랜잭션)
+copy / executemany 는 적재 전에 인덱스를 지우고 적재 후 다시 만들며, 삭제~재생성이 한 트랜잭션이다.
+sync 는 바뀌지 않은 문장의 id 를 유지하고, 쓰기량이 말뭉치 크기가 아니라 변경량에 비례한다.
+
+난이도 x 카테고리 x 출처별 문장 수는 CSV 를 읽는 같은 패스에서 세어 sentence_stats 테이블에
+데이터와 같은 트랜잭션으로 저장한다. print_stats() 와 대시보드는 이 테이블만 읽는다.
 """
 
 import csv
 import enum
+import hashlib
+import itertools
 import os
 import sys
 import time
+from collections import Counter
 from pathlib import Path
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, Enum, Index, func
+    create_engine, Column, Integer, String, Text, Enum, Index, bindparam, inspect
 )
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -61,30 +76,303 @@ class Sentence(Base):
     category = Column(String(50), nullable=False, default="DAILY")
     subcategory = Column(String(100), nullable=False, default="")
     source = Column(String(30), nullable=False)
+    # 증분 동기화용 내용 해시 (row_hash). COPY/ORM 적재 직후에는 비어 있고 첫 sync 때 채운다
+    content_hash = Column(String(32), nullable=True)
 
     __table_args__ = (
         Index("ix_sentences_diff_cat", "difficulty", "category"),
     )
 
 
+class SentenceStat(Base):
+    """난이도 x 카테고리 x 출처별 문장 수 (적재 시 sentences 와 함께 갱신)"""
+    __tablename__ = "sentence_stats"
+
+    difficulty = Column(
+        Enum(Difficulty, name="difficulty_level", create_type=False),
+        primary_key=True,
+    )
+    category = Column(String(50), primary_key=True)
+    source = Column(String(30), primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
 # ──────────────────────────────────────────────
 # 적재 로직
 # ──────────────────────────────────────────────
 CSV_PATH = Path(__file__).parent / "cleansed_sentences.csv"
 BATCH_SIZE = 5000
+LOAD_MODE = os.getenv("LOAD_MODE", "auto")
+# cleanse_data.py 가 쓰는 CSV 컬럼 순서와 같아야 한다
+CSV_COLUMNS = ("english_text", "korean_ref", "difficulty", "category", "subcategory", "source")
+COPY_CHUNK_BYTES = 1 << 20
+# 통계 키로 쓰는 CSV 컬럼 위치 (difficulty, category, source)
+_STAT_FIELDS = (2, 3, 5)
 
 
 def create_tables():
     Base.metadata.create_all(engine)
+    # 이전 버전에서 만든 테이블에는 content_hash 컬럼이 없다
+    if "content_hash" not in {c["name"] for c in inspect(engine).get_columns("sentences")}:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ALTER TABLE sentences ADD COLUMN content_hash VARCHAR(32)")
+        print("content_hash 컬럼 추가")
     print("테이블 생성 완료")
 
 
+def row_hash(fields):
+    # CSV_COLUMNS 순서의 값들을 0x1F 로 이어 붙인 md5 (PostgreSQL md5(concat_ws(chr(31), ...)) 와 같은 값)
+    return hashlib.md5("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+
+def row_key(english_text):
+    # 같은 문장으로 보는 기준: cleanse_data.py 의 완전 중복 판정(near_dedup.exact_key)과 동일 (영어 문장, 대소문자 무시)
+    return english_text.lower().strip()
+
+
+def _report_progress(total, start):
+    elapsed = time.time() - start
+    rate = total / elapsed if elapsed > 0 else 0
+    print(f"  {total:>8,}건 적재 ({rate:,.0f}건/초)")
+
+
+def _stat_key(row):
+    return tuple(row[i] for i in _STAT_FIELDS)
+
+
+class _CopyProgress:
+    """
+    COPY FROM STDIN 에 넘기는 파일 어댑터.
+    원문 줄을 그대로 넘기면서, 같은 줄을 csv 파서로 읽어 행 수(진행률)와 통계를 센다.
+    """
+
+    def __init__(self, f, start, stats):
+        self._pending = []
+        self._reader = csv.reader(self._capture(f))
+        self._start = start
+        self._stats = stats
+        self.rows = 0
+        _check_header(next(self._reader))
+        self._pending.clear()
+
+    def _capture(self, f):
+        for line in f:
+            self._pending.append(line)
+            yield line
+
+    def read(self, size=-1):
+        out = []
+        n = 0
+        for row in self._reader:
+            self.rows += 1
+            self._stats[_stat_key(row)] += 1
+            if self.rows % BATCH_SIZE == 0:
+                _report_progress(self.rows, self._start)
+            data = "".join(self._pending).encode("utf-8")
+            self._pending.clear()
+            out.append(data)
+            n += len(data)
+            if 0 < size <= n:
+                break
+        return b"".join(out)
+
+
+def _check_header(header):
+    if tuple(header) != CSV_COLUMNS:
+        print(f"CSV 헤더가 예상과 다름: {header} (예상: {list(CSV_COLUMNS)})")
+        sys.exit(1)
+
+
+def _copy_rows(conn, start, stats):
+    # 헤더는 어댑터가 검증하고, 나머지 줄은 원문 그대로 COPY 로 흘려보낸다
+    cols = ", ".join(CSV_COLUMNS)
+    with open(CSV_PATH, "r", encoding="utf-8", newline="") as f:
+        adapter = _CopyProgress(f, start, stats)
+        cur = conn.connection.cursor()
+        # FORCE_NOT_NULL: 따옴표 없는 빈 값(subcategory 등)을 NULL 이 아닌 빈 문자열로
+        cur.copy_expert(
+            f"COPY sentences ({cols}) FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ({cols}))",
+            adapter, size=COPY_CHUNK_BYTES,
+        )
+        return cur.rowcount if cur.rowcount >= 0 else adapter.rows
+
+
+def _executemany_rows(conn, start, stats):
+    cols = ", ".join(CSV_COLUMNS + ("content_hash",))
+    mark = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+    sql = f"INSERT INTO sentences ({cols}) VALUES ({', '.join([mark] * (len(CSV_COLUMNS) + 1))})"
+    cur = conn.connection.cursor()
+    total = 0
+    with open(CSV_PATH, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        _check_header(next(reader))
+        while True:
+            batch = [(*row, row_hash(row)) for row in itertools.islice(reader, BATCH_SIZE)]
+            if not batch:
+                break
+            stats.update(_stat_key(row) for row in batch)
+            cur.executemany(sql, batch)
+            total += len(batch)
+            if len(batch) == BATCH_SIZE:
+                _report_progress(total, start)
+    return total
+
+
+def _load_bulk(mode):
+    table = Sentence.__table__
+    start = time.time()
+    # 삭제 → 인덱스 제거 → 적재 → 인덱스 재생성 을 한 트랜잭션으로 (중간 상태가 외부에 보이지 않음)
+    with engine.begin() as conn:
+        if mode == "copy":
+            conn.exec_driver_sql("TRUNCATE sentences")
+            print("기존 데이터 삭제 (TRUNCATE)")
+        else:
+            deleted = conn.execute(table.delete()).rowcount
+            if deleted > 0:
+                print(f"기존 데이터 {deleted:,}건 삭제")
+        for index in table.indexes:
+            index.drop(conn, checkfirst=True)
+
+        stats = Counter()
+        rows_fn = _copy_rows if mode == "copy" else _executemany_rows
+        total = rows_fn(conn, start, stats)
+        loaded = time.time()
+
+        for index in table.indexes:
+            index.create(conn)
+        print(f"  인덱스 재생성 ({time.time() - loaded:.1f}초)")
+        _write_stats(conn, stats)
+
+    elapsed = time.time() - start
+    print(f"\n적재 완료: {total:,}건 ({elapsed:.1f}초, {mode})")
+    return total
+
+
 def load_csv():
     if not CSV_PATH.exists():
         print(f"CSV 파일 없음: {CSV_PATH}")
         print("먼저 python scripts/cleanse_data.py 를 실행하세요.")
         sys.exit(1)
 
+    mode = LOAD_MODE
+    if mode == "auto":
+        mode = "copy" if engine.dialect.name == "postgresql" else "executemany"
+    if mode == "copy" and engine.dialect.name != "postgresql":
+        print("LOAD_MODE=copy 는 PostgreSQL 에서만 사용할 수 있습니다.")
+        sys.exit(1)
+    if mode in ("copy", "executemany"):
+        return _load_bulk(mode)
+    if mode == "sync":
+        return _sync()
+    return _load_orm()
+
+
+def _write_stats(conn, stats):
+    # 적재와 같은 트랜잭션에서 통계 테이블을 통째로 교체
+    table = SentenceStat.__table__
+    conn.execute(table.delete())
+    if stats:
+        conn.execute(table.insert(), [
+            {"difficulty": d, "category": c, "source": s, "count": n} for (d, c, s), n in stats.items()
+        ])
+
+
+def _backfill_hashes(conn):
+    # 해시가 비어 있는 행(COPY/ORM 적재분)을 채운다. 최초 1회만 전체 행을 건드린다
+    table = Sentence.__table__
+    if engine.dialect.name == "postgresql":
+        cols = ", ".join(f"{c}::text" for c in CSV_COLUMNS)
+        n = conn.exec_driver_sql(
+            f"UPDATE sentences SET content_hash = md5(concat_ws(chr(31), {cols})) WHERE content_hash IS NULL"
+        ).rowcount
+    else:
+        rows = conn.execute(
+            table.select().with_only_columns(table.c.id, *[table.c[c] for c in CSV_COLUMNS])
+            .where(table.c.content_hash.is_(None))
+        ).all()
+        params = [{"_id": r[0], "content_hash": row_hash([_text(v) for v in r[1:]])} for r in rows]
+        for lo in range(0, len(params), BATCH_SIZE):
+            conn.execute(
+                table.update().where(table.c.id == bindparam("_id")),
+                params[lo:lo + BATCH_SIZE],
+            )
+        n = len(params)
+    if n:
+        print(f"  content_hash 채움: {n:,}건")
+
+
+def _text(v):
+    return v.value if isinstance(v, Difficulty) else str(v)
+
+
+def _sync():
+    table = Sentence.__table__
+    start = time.time()
+    with engine.begin() as conn:
+        _backfill_hashes(conn)
+        # DB 쪽은 (해시 → id) 만 읽는다
+        existing, duplicates = {}, []
+        for i, h in conn.execute(
+            table.select().with_only_columns(table.c.id, table.c.content_hash).order_by(table.c.id)
+        ):
+            if h in existing:
+                duplicates.append(i)
+            else:
+                existing[h] = i
+        seen = set()
+        added = []
+        total = 0
+        stats = Counter()
+        with open(CSV_PATH, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            _check_header(next(reader))
+            for row in reader:
+                total += 1
+                stats[_stat_key(row)] += 1
+                h = row_hash(row)
+                if h in existing:
+                    seen.add(h)
+                else:
+                    added.append((h, row))
+                if total % (BATCH_SIZE * 20) == 0:
+                    _report_progress(total, start)
+
+        # 사라진 행 중 같은 문장(row_key)이 새로 들어온 것은 수정, 나머지는 삭제
+        # 같은 문장의 행이 여럿이면(중복 적재분) 가장 작은 id 만 수정해 남긴다
+        vanished_ids = sorted([i for h, i in existing.items() if h not in seen] + duplicates)
+        vanished = {}
+        for lo in range(0, len(vanished_ids), BATCH_SIZE):
+            chunk = vanished_ids[lo:lo + BATCH_SIZE]
+            for i, en in conn.execute(
+                table.select().with_only_columns(table.c.id, table.c.english_text)
+                .where(table.c.id.in_(chunk)).order_by(table.c.id)
+            ):
+                vanished.setdefault(row_key(en), []).append(i)
+        updates, inserts = [], []
+        for h, row in added:
+            values = dict(zip(CSV_COLUMNS, row), content_hash=h)
+            ids = vanished.get(row_key(row[0]))
+            if not ids:
+                inserts.append(values)
+            else:
+                updates.append(dict(values, _id=ids.pop(0)))
+        deletes = [i for ids in vanished.values() for i in ids]
+
+        for lo in range(0, len(deletes), BATCH_SIZE):
+            conn.execute(table.delete().where(table.c.id.in_(deletes[lo:lo + BATCH_SIZE])))
+        for lo in range(0, len(updates), BATCH_SIZE):
+            conn.execute(table.update().where(table.c.id == bindparam("_id")), updates[lo:lo + BATCH_SIZE])
+        for lo in range(0, len(inserts), BATCH_SIZE):
+            conn.execute(table.insert(), inserts[lo:lo + BATCH_SIZE])
+        _write_stats(conn, stats)
+
+    elapsed = time.time() - start
+    print(f"\n동기화 완료: 총 {total:,}건 (유지 {len(seen):,} / 추가 {len(inserts):,} / "
+          f"변경 {len(updates):,} / 삭제 {len(deletes):,}, {elapsed:.1f}초)")
+    return total
+
+
+def _load_orm():
     session = Session()
 
     deleted = session.query(Sentence).delete()
@@ -95,10 +383,12 @@ def load_csv():
     start = time.time()
     total = 0
     batch = []
+    stats = Counter()
 
     with open(CSV_PATH, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
+            stats[(row["difficulty"], row["category"], row["source"])] += 1
             batch.append(Sentence(
                 english_text=row["english_text"],
                 korean_ref=row["korean_ref"],
@@ -118,8 +408,9 @@ def load_csv():
 
     if batch:
         session.bulk_save_objects(batch)
-        session.commit()
         total += len(batch)
+    _write_stats(session.connection(), stats)
+    session.commit()
 
     elapsed = time.time() - start
     session.close()
@@ -128,28 +419,34 @@ def load_csv():
 
 
 def print_stats():
+    # 적재 시 저장한 sentence_stats 만 읽는다 (sentences 전체 스캔 없음)
     session = Session()
-    total = session.query(Sentence).count()
+    rows = session.query(SentenceStat.difficulty, SentenceStat.category, SentenceStat.source, SentenceStat.count).all()
+    session.close()
+
+    by_diff, by_cat, by_src = Counter(), Counter(), Counter()
+    for diff, cat, src, count in rows:
+        by_diff[diff] += count
+        by_cat[cat] += count
+        by_src[src] += count
+    total = sum(by_diff.values())
     print(f"\n총 문장 수: {total:,}")
 
     print("\n난이도별:")
     for diff in Difficulty:
-        count = session.query(Sentence).filter(Sentence.difficulty == diff).count()
+        count = by_diff[diff]
         pct = count / max(total, 1) * 100
         print(f"  {diff.value:15s}: {count:>8,}  ({pct:5.1f}%)")
 
     print("\n카테고리별:")
-    cats = (
-        session.query(Sentence.category, func.count())
-        .group_by(Sentence.category)
-        .order_by(func.count().desc())
-        .all()
-    )
-    for cat, count in cats:
+    for cat, count in by_cat.most_common():
         pct = count / max(total, 1) * 100
         print(f"  {cat:15s}: {count:>8,}  ({pct:5.1f}%)")
 
-    session.close()
+    print("\n출처별:")
+    for src, count in by_src.most_common():
+        pct = count / max(total, 1) * 100
+        print(f"  {src:15s}: {count:>8,}  ({pct:5.1f}%)")
 
 
 def main():
@@ -0,0 +1,216 @@
+"""
+MinHash/LSH 기반 유사 중복(near-duplicate) 탐지 (cleanse_data.py 의 중복 제거 단계)
+
+- 완전 중복: 영어 문장(대소문자 무시, 앞뒤 공백 제거)의 64비트 해시가 같은 행
+- 유사 중복: 정규화(소문자, 축약형 풀기, 문장부호 제거, 공백 정리)한 문장의 문자 5-gram 집합에 대해
+  MinHash(64개 해시) → LSH(8밴드 x 8행)로 후보를 찾고, 서명 일치율(추정 Jaccard)이 임계치 이상이면 같은 클러스터
+- 클러스터마다 가장 먼저 나온 행만 남긴다 (first-seen-wins, 완전 중복 제거와 같은 규칙)
+
+행마다 파이썬 객체를 쌓지 않고 서명/해시만 numpy 배열(서명은 임시 파일 mmap)로 보관하므로
+수백만 행에서도 메모리가 행당 수십 바이트 수준으로 유지된다. 서명 계산은 프로세스 풀에서 청크 단위로 병렬 처리한다.
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 8
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE = 5
+CHUNK_ROWS = 20000
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+
+_rng = np.random.default_rng(20240607)
+_PERM_A = _rng.integers(1, 2**63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, NUM_PERM, dtype=np.uint64)
+_ROLL = np.uint64(1000003)
+_MIX = np.uint64(0x100000001B3)
+
+_CONTRACTIONS = [
+    (re.compile(r"n['’]t\b"), " not"),
+    (re.compile(r"['’]re\b"), " are"),
+    (re.compile(r"['’]m\b"), " am"),
+    (re.compile(r"['’]ll\b"), " will"),
+    (re.compile(r"['’]ve\b"), " have"),
+    (re.compile(r"['’]d\b"), " would"),
+]
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+def exact_key(text: str) -> str:
+    # 완전 중복 기준: 영어 문장, 대소문자 무시 + 앞뒤 공백 제거
+    return text.lower().strip()
+
+
+def exact_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(exact_key(text).encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def normalize(text: str) -> str:
+    text = text.lower()
+    for pattern, repl in _CONTRACTIONS:
+        text = pattern.sub(repl, text)
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def signatures(texts: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (MinHash 서명 (n, NUM_PERM) uint32, 밴드 키 (n, BANDS) uint64).
+    모든 텍스트를 구분자로 이어 붙여 문자 5-gram 롤링 해시를 한 번에 계산한다.
+    """
+    norm = [normalize(t).ljust(SHINGLE) for t in texts]
+    joined = "\x00".join(norm)
+    codes = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    n_win = len(codes) - SHINGLE + 1
+    h = np.zeros(n_win, dtype=np.uint64)
+    for k in range(SHINGLE):
+        h = h * _ROLL + codes[k:k + n_win]
+
+    # 구분자를 걸치는 창은 버리고, 각 창이 몇 번째 텍스트인지 계산
+    is_sep = codes == 0
+    seps = np.concatenate([[0], np.cumsum(is_sep)])
+    valid = (seps[SHINGLE:SHINGLE + n_win] - seps[:n_win]) == 0
+    h = h[valid]
+    text_of = seps[:n_win][valid]
+    starts = np.flatnonzero(np.concatenate([[True], text_of[1:] != text_of[:-1]]))
+
+    sig = np.empty((len(texts), NUM_PERM), dtype=np.uint32)
+    for p in range(NUM_PERM):
+        v = ((h * _PERM_A[p] + _PERM_B[p]) >> np.uint64(32)).astype(np.uint32)
+        sig[:, p] = np.minimum.reduceat(v, starts)
+
+    bands = np.zeros((len(texts), BANDS), dtype=np.uint64)
+    for b in range(BANDS):
+        for r in range(ROWS_PER_BAND):
+            bands[:, b] = (bands[:, b] ^ sig[:, b * ROWS_PER_BAND + r].astype(np.uint64)) * _MIX
+    return sig, bands
+
+
+def _union_min(labels: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    # 간선 (a, b) 로 연결된 행들에 가장 작은 행 번호를 전파 (수렴할 때까지)
+    while True:
+        m = np.minimum(labels[a], labels[b])
+        before = labels.copy()
+        np.minimum.at(labels, a, m)
+        np.minimum.at(labels, b, m)
+        labels = labels[labels]  # 경로 압축
+        if np.array_equal(labels, before):
+            return labels
+
+
+class Deduplicator:
+    """
+    add() 로 영어 문장을 순서대로 넣고 finish() 로 남길 행의 마스크를 받는다.
+    mode: "exact"(완전 중복만) / "near"(완전 + 유사 중복)
+    """
+
+    def __init__(self, mode: str = "near", workers: int = 0, threshold: float = NEAR_DUP_THRESHOLD):
+        self.mode = mode
+        self.threshold = threshold
+        self.n = 0
+        self._exact = array("Q")
+        self._buf = []
+        self._pool = None
+        self._workers = 1
+        self._futures = []
+        self._band_chunks = []
+        self._tmp = None
+        self._sig_file = None
+        if mode == "near":
+            self._workers = workers or (os.cpu_count() or 1)
+            if self._workers > 1:
+                self._pool = ProcessPoolExecutor(max_workers=self._workers)
+            self._tmp = tempfile.TemporaryDirectory()
+            self._sig_path = Path(self._tmp.name) / "signatures.u32"
+            self._sig_file = open(self._sig_path, "wb")
+
+    def add(self, text: str):
+        self.n += 1
+        self._exact.append(exact_hash(text))
+        if self.mode == "near":
+            self._buf.append(text)
+            if len(self._buf) >= CHUNK_ROWS:
+                self._submit()
+
+    def _submit(self):
+        if not self._buf:
+            return
+        if self._pool is not None:
+            self._futures.append(self._pool.submit(signatures, self._buf))
+            # 결과는 제출 순서대로 기록, 미완료 작업 수를 제한해 메모리 상한 유지
+            while len(self._futures) > 2 * self._workers:
+                self._write(*self._futures.pop(0).result())
+        else:
+            self._write(*signatures(self._buf))
+        self._buf = []
+
+    def _write(self, sig: np.ndarray, bands: np.ndarray):
+        self._sig_file.write(sig.tobytes())
+        self._band_chunks.append(bands)
+
+    def finish(self) -> tuple[np.ndarray, dict]:
+        """(남길 행 마스크, 통계) — 통계: exact_dups, near_dups, cluster_sizes({크기: 클러스터 수})"""
+        exact = np.frombuffer(self._exact, dtype=np.uint64)
+        _, first = np.unique(exact, return_index=True)
+        keep_exact = np.zeros(self.n, dtype=bool)
+        keep_exact[first] = True
+        stats = {"exact_dups": int(self.n - keep_exact.sum()), "near_dups": 0, "cluster_sizes": {}}
+        if self.mode != "near" or self.n == 0:
+            return keep_exact, stats
+
+        self._submit()
+        for f in self._futures:
+            self._write(*f.result())
+        self._futures = []
+        if self._pool is not None:
+            self._pool.shutdown()
+        self._sig_file.close()
+        sig = np.memmap(self._sig_path, dtype=np.uint32, mode="r", shape=(self.n, NUM_PERM))
+        bands = np.concatenate(self._band_chunks)
+        self._band_chunks = []
+
+        # 완전 중복은 원본과 같은 클러스터로 묶는다
+        labels = np.arange(self.n, dtype=np.int64)
+        _, inverse = np.unique(exact, return_inverse=True)
+        src, dst = np.arange(self.n), first[inverse]
+        dup = src != dst
+        edges_a, edges_b = [src[dup]], [dst[dup]]
+
+        # 밴드별로 같은 키를 가진 행들을 묶어 그룹의 첫 행과 비교
+        for b in range(BANDS):
+            order = np.argsort(bands[:, b], kind="stable")
+            keys = bands[order, b]
+            head = np.concatenate([[True], keys[1:] != keys[:-1]])
+            rep = order[np.flatnonzero(head)][np.cumsum(head) - 1]
+            cand = ~head
+            a, r = order[cand], rep[cand]
+            if len(a):
+                sim = np.empty(len(a), dtype=np.float32)
+                for lo in range(0, len(a), CHUNK_ROWS):
+                    hi = lo + CHUNK_ROWS
+                    sim[lo:hi] = (sig[a[lo:hi]] == sig[r[lo:hi]]).mean(axis=1)
+                ok = sim >= self.threshold
+                edges_a.append(a[ok])
+                edges_b.append(r[ok])
+        del sig
+        self._tmp.cleanup()
+
+        a = np.concatenate(edges_a)
+        b = np.concatenate(edges_b)
+        if len(a):
+            labels = _union_min(labels, a, b)
+        keep = labels == np.arange(self.n)
+        sizes = np.bincount(labels, minlength=self.n)
+        sizes, counts = np.unique(sizes[sizes > 1], return_counts=True)
+        stats["near_dups"] = int(keep_exact.sum() - keep.sum())
+        stats["cluster_sizes"] = {int(s): int(c) for s, c in zip(sizes, counts)}
+        return keep, stats
@@ -0,0 +1,149 @@
+"""
+임베딩 기반 번역 품질 필터 (cleanse_data.py 의 선택 단계, QUALITY_FILTER=1)
+
+filter_sentence() 의 길이/특수문자/언어 혼용 휴리스틱을 통과했더라도 영어-한국어 쌍이 서로 맞지 않으면
+/judge 가 잘못된 정답으로 채점하게 된다. 앱과 같은 모델(app/model.py)로 두 문장을 인코딩해
+코사인 유사도가 QUALITY_MIN_SIMILARITY 미만인 쌍을 low_similarity 사유로 탈락시킨다.
+
+- 문장 길이(영어 + 한국어 글자 수) 순으로 정렬해 QUALITY_BATCH_SIZE 쌍씩 묶는다 (배치 내 패딩 최소화)
+- INFERENCE_REPLICAS > 0 이면 앱과 같은 추론 프로세스 풀에 배치를 동시에 넣는다
+- cleanse_data.py 는 score_pair_stream 으로 QUALITY_CHUNK_PAIRS 쌍씩 넘기므로 전체 쌍 목록을 메모리에 올리지 않는다
+- 배치마다 점수를 체크포인트(QUALITY_CHECKPOINT_DIR/<입력 지문>/)에 기록하므로 중단 후 다시 실행하면
+  끝난 배치는 건너뛴다. 점수는 입력이 같으면 그대로 재사용되므로 임계치만 바꿔 다시 돌릴 때도 추론하지 않는다.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from app.model import EMBED_BACKEND, MODEL_NAME, disk_cache_model_key, get_model, start_inference_pool  # noqa: E402
+from app.worker_pool import get_pool  # noqa: E402
+
+QUALITY_MIN_SIMILARITY = float(os.getenv("QUALITY_MIN_SIMILARITY", "0.5"))
+QUALITY_BATCH_SIZE = int(os.getenv("QUALITY_BATCH_SIZE", "512"))
+# score_pair_stream 이 한 번에 score_pairs 로 넘기는 쌍 수 (길이 정렬/체크포인트 단위)
+QUALITY_CHUNK_PAIRS = int(os.getenv("QUALITY_CHUNK_PAIRS", "100000"))
+QUALITY_CHECKPOINT_DIR = Path(os.getenv(
+    "QUALITY_CHECKPOINT_DIR", Path(__file__).parent.parent / "data" / "quality_checkpoint",
+))
+REJECT_REASON = "low_similarity"
+
+
+def fingerprint(pairs: list[tuple[str, str]], batch_size: int = QUALITY_BATCH_SIZE) -> str:
+    # 모델 키(모델 + 백엔드/양자화 설정 + 토큰 예산, 디스크 캐시와 같은 기준) + 배치 크기 + 입력 쌍 목록이
+    # 같을 때만 체크포인트를 이어 쓴다
+    h = hashlib.sha1(f"{disk_cache_model_key(MODEL_NAME)}\x1e{batch_size}".encode("utf-8"))
+    for en, ko in pairs:
+        h.update(f"\x1e{en}\x1f{ko}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def _open_array(path: Path, shape, dtype, fill):
+    if path.exists():
+        arr = np.load(path, mmap_mode="r+")
+        if arr.shape == shape and arr.dtype == dtype:
+            return arr
+    arr = np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+    arr[:] = fill
+    arr.flush()
+    return arr
+
+
+def _encoder():
+    start_inference_pool()
+    pool = get_pool(MODEL_NAME)
+    if pool is not None:
+        return pool.encode, pool.replicas
+    model = get_model()
+    return (lambda texts: model.encode(
+        texts, batch_size=len(texts), convert_to_numpy=True, normalize_embeddings=True,
+    )), 1
+
+
+def score_pairs(pairs: list[tuple[str, str]], batch_size: int = QUALITY_BATCH_SIZE,
+                checkpoint_dir: Path = QUALITY_CHECKPOINT_DIR) -> np.ndarray:
+    """(영어, 한국어) 쌍마다 코사인 유사도 (float32, 입력 순서)"""
+    n = len(pairs)
+    if n == 0:
+        return np.empty(0, dtype=np.float32)
+    order = np.argsort(np.fromiter((len(en) + len(ko) for en, ko in pairs), dtype=np.int64, count=n), kind="stable")
+    batches = [order[lo:lo + batch_size] for lo in range(0, n, batch_size)]
+
+    directory = checkpoint_dir / fingerprint(pairs, batch_size)[:16]
+    directory.mkdir(parents=True, exist_ok=True)
+    scores = _open_array(directory / "scores.npy", (n,), np.float32, np.nan)
+    done = _open_array(directory / "done.npy", (len(batches),), np.bool_, False)
+    todo = [b for b in range(len(batches)) if not done[b]]
+    if len(todo) < len(batches):
+        print(f"  [quality] 체크포인트에서 재개: {len(batches) - len(todo):,}/{len(batches):,} 배치 완료")
+    if not todo:
+        return np.array(scores)
+
+    encode, workers = _encoder()
+
+    def run(b: int):
+        idx = batches[b]
+        vecs = encode([pairs[i][0] for i in idx] + [pairs[i][1] for i in idx])
+        return b, np.einsum("ij,ij->i", vecs[:len(idx)], vecs[len(idx):])
+
+    start = time.time()
+    scored = 0
+    pending = iter(todo)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        # 레플리카마다 배치 2개까지만 미리 넣어, 중단돼도 잃는 작업이 적도록
+        inflight = {ex.submit(run, b) for b in _take(pending, 2 * workers)}
+        while inflight:
+            finished, inflight = wait(inflight, return_when=FIRST_COMPLETED)
+            # 실패한 배치는 마지막에: 같이 끝난 다른 배치의 점수를 먼저 기록해 둔다
+            for f in sorted(finished, key=lambda f: f.exception() is not None):
+                b, sims = f.result()
+                # 점수를 먼저 디스크에 내린 뒤 완료 표시
+                scores[batches[b]] = sims
+                scores.flush()
+                done[b] = True
+                done.flush()
+                scored += len(batches[b])
+            inflight |= {ex.submit(run, b) for b in _take(pending, len(finished))}
+            rate = scored / max(time.time() - start, 1e-9)
+            print(f"  [quality] {int(done.sum()):>6,}/{len(batches):,} 배치 ({rate:,.0f}쌍/초)")
+
+    (directory / "meta.json").write_text(json.dumps({
+        "model_name": MODEL_NAME, "backend": EMBED_BACKEND, "model_key": disk_cache_model_key(MODEL_NAME), "pairs": n,
+        "batch_size": batch_size, "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    return np.array(scores)
+
+
+def score_pair_stream(pairs: Iterable[tuple[str, str]], chunk_pairs: int = QUALITY_CHUNK_PAIRS,
+                      **kwargs) -> np.ndarray:
+    """
+    score_pairs 를 chunk_pairs 쌍씩 나눠 호출 (입력을 한 번만 훑고 한 청크만 메모리에 둔다).
+    체크포인트도 청크마다 따로라 중단 후 재실행하면 끝난 청크는 추론 없이 넘어간다
+    """
+    out, chunk = [], []
+    for pair in pairs:
+        chunk.append(pair)
+        if len(chunk) >= chunk_pairs:
+            out.append(score_pairs(chunk, **kwargs))
+            chunk = []
+    if chunk:
+        out.append(score_pairs(chunk, **kwargs))
+    return np.concatenate(out) if out else np.empty(0, dtype=np.float32)
+
+
+def _take(it, k: int) -> list:
+    out = []
+    for _ in range(k):
+        b = next(it, None)
+        if b is None:
+            break
+        out.append(b)
+    return out
@@ -0,0 +1,238 @@
+"""
+AI Hub xlsx 원본의 컬럼형 캐시 (cleanse_data.py / explore_data.py / explore_dialog_categories.py 공용 리더)
+
+openpyxl 로 수백 MB xlsx 를 읽는 데 수 분이 걸리므로, 처음 한 번만 시트를 컬럼별 바이너리로 변환해 두고
+이후에는 mmap 으로 읽는다. 캐시는 원본 파일 내용의 SHA-1 로 구분하므로 파일이 바뀌면 자동으로 다시 만든다.
+
+캐시 레이아웃 (XLSX_CACHE_DIR/<파일명>.<sha1 앞 16자>/):
+  meta.json               시트 이름, max_row/max_column, 행 수, 열 수
+  s{시트}_c{열}.bin       셀 값(str)을 UTF-8 로 이어 붙인 바이트
+  s{시트}_c{열}.boff.npy  셀별 바이트 오프셋 (int64, 행 수 + 1)
+  s{시트}_c{열}.coff.npy  셀별 글자 오프셋 (int64, 행 수 + 1) — 블록 단위로 한 번에 디코딩한 뒤 슬라이스
+  s{시트}_c{열}.kind.npy  셀 타입 (int8: 0=None, 1=str, 2=int, 3=float, 4=bool, 5=기타(str로 저장))
+
+load_workbook() 은 openpyxl read-only 워크북과 같은 형태(sheetnames, ws.max_row, ws.iter_rows(values_only=True))를
+돌려주므로 스크립트 쪽 코드는 거의 바뀌지 않는다.
+
+미리 변환: python scripts/xlsx_cache.py [xlsx 파일 ...]   (인자가 없으면 기본 데이터 디렉토리의 xlsx 전체)
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+
+import numpy as np
+
+DATA_DIR = Path(__file__).parent.parent / "docs" / "한국어-영어 번역(병렬) 말뭉치"
+XLSX_CACHE_DIR = Path(os.getenv("XLSX_CACHE_DIR", Path(__file__).parent.parent / "data" / "xlsx_cache"))
+XLSX_CACHE = os.getenv("XLSX_CACHE", "1") == "1"
+# 이 행 수만큼씩 디코딩해서 돌려준다 (메모리 상한)
+BLOCK_ROWS = 65536
+
+_NONE, _STR, _INT, _FLOAT, _BOOL, _OTHER = range(6)
+_INDEX_FILE = "index.json"
+
+
+def file_sha1(filepath: Path) -> str:
+    # (크기, 수정 시각)이 같으면 이전에 계산한 해시를 재사용
+    filepath = Path(filepath)
+    st = filepath.stat()
+    index_path = XLSX_CACHE_DIR / _INDEX_FILE
+    index = json.loads(index_path.read_text(encoding="utf-8")) if index_path.exists() else {}
+    entry = index.get(str(filepath.resolve()))
+    if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["sha1"]
+
+    h = hashlib.sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    index[str(filepath.resolve())] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha1": h.hexdigest()}
+    XLSX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = index_path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=False, indent=1), encoding="utf-8")
+    os.replace(tmp, index_path)
+    return h.hexdigest()
+
+
+def cache_dir_for(filepath: Path) -> Path:
+    return XLSX_CACHE_DIR / f"{Path(filepath).name}.{file_sha1(filepath)[:16]}"
+
+
+def _kind(value) -> int:
+    if value is None:
+        return _NONE
+    if isinstance(value, bool):
+        return _BOOL
+    if isinstance(value, str):
+        return _STR
+    if isinstance(value, int):
+        return _INT
+    if isinstance(value, float):
+        return _FLOAT
+    return _OTHER
+
+
+class _ColumnWriter:
+    def __init__(self, directory: Path, prefix: str, n_before: int):
+        self.prefix = directory / prefix
+        self._f = open(f"{self.prefix}.bin", "wb")
+        # 이 열이 처음 나타나기 전의 행들은 빈 셀
+        self.boff = array("q", [0] * (n_before + 1))
+        self.coff = array("q", [0] * (n_before + 1))
+        self.kind = array("b", [_NONE] * n_before)
+        self._bytes = 0
+        self._chars = 0
+
+    def append(self, value):
+        k = _kind(value)
+        if k != _NONE:
+            s = str(value)
+            b = s.encode("utf-8")
+            self._f.write(b)
+            self._bytes += len(b)
+            self._chars += len(s)
+        self.boff.append(self._bytes)
+        self.coff.append(self._chars)
+        self.kind.append(k)
+
+    def close(self):
+        self._f.close()
+        np.save(f"{self.prefix}.boff.npy", np.frombuffer(self.boff, dtype=np.int64))
+        np.save(f"{self.prefix}.coff.npy", np.frombuffer(self.coff, dtype=np.int64))
+        np.save(f"{self.prefix}.kind.npy", np.frombuffer(self.kind, dtype=np.int8))
+
+
+def build_cache(filepath: Path) -> Path:
+    """xlsx 한 개를 컬럼형 캐시로 변환 (이미 있으면 그대로)"""
+    try:
+        import openpyxl
+    except ImportError:
+        print("openpyxl이 필요합니다: pip install openpyxl")
+        sys.exit(1)
+
+    target = cache_dir_for(filepath)
+    if (target / "meta.json").exists():
+        return target
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    wb = openpyxl.load_workbook(filepath, read_only=True)
+    sheets = []
+    for si, name in enumerate(wb.sheetnames):
+        ws = wb[name]
+        cols: list[_ColumnWriter] = []
+        n = 0
+        for row in ws.iter_rows(values_only=True):
+            while len(cols) < len(row):
+                cols.append(_ColumnWriter(tmp, f"s{si}_c{len(cols)}", n))
+            for j, col in enumerate(cols):
+                col.append(row[j] if j < len(row) else None)
+            n += 1
+        for col in cols:
+            col.close()
+        sheets.append({
+            "name": name, "max_row": ws.max_row, "max_column": ws.max_column,
+            "rows": n, "cols": len(cols),
+        })
+    wb.close()
+
+    (tmp / "meta.json").write_text(json.dumps({
+        "source": Path(filepath).name, "sha1": file_sha1(filepath), "sheets": sheets,
+    }, ensure_ascii=False, indent=2), encoding="utf-8")
+    try:
+        os.replace(tmp, target)
+    except OSError:
+        # 다른 프로세스가 먼저 만들었으면 그쪽을 사용
+        shutil.rmtree(tmp, ignore_errors=True)
+    # 같은 파일의 이전 버전 캐시는 지운다
+    for old in XLSX_CACHE_DIR.glob(f"{glob.escape(Path(filepath).name)}.*"):
+        if old.is_dir() and old != target and not old.name.endswith(".tmp"):
+            shutil.rmtree(old, ignore_errors=True)
+    return target
+
+
+class _Column:
+    def __init__(self, prefix: Path):
+        self.data = np.memmap(f"{prefix}.bin", dtype=np.uint8, mode="r") if Path(f"{prefix}.bin").stat().st_size else None
+        self.boff = np.load(f"{prefix}.boff.npy", mmap_mode="r")
+        self.coff = np.load(f"{prefix}.coff.npy", mmap_mode="r")
+        self.kind = np.load(f"{prefix}.kind.npy", mmap_mode="r")
+
+    def block(self, lo: int, hi: int) -> list:
+        """lo~hi 행(0부터, hi 미포함)의 값을 원래 타입으로"""
+        b0, b1 = int(self.boff[lo]), int(self.boff[hi])
+        text = bytes(self.data[b0:b1]).decode("utf-8") if b1 > b0 else ""
+        coff = (self.coff[lo:hi + 1] - self.coff[lo]).tolist()
+        kinds = self.kind[lo:hi].tolist()
+        out = []
+        for i, k in enumerate(kinds):
+            if k == _NONE:
+                out.append(None)
+                continue
+            s = text[coff[i]:coff[i + 1]]
+            if k == _INT:
+                out.append(int(s))
+            elif k == _FLOAT:
+                out.append(float(s))
+            elif k == _BOOL:
+                out.append(s == "True")
+            else:
+                out.append(s)
+        return out
+
+
+class CachedSheet:
+    def __init__(self, directory: Path, index: int, meta: dict):
+        self.title = meta["name"]
+        self.max_row = meta["max_row"]
+        self.max_column = meta["max_column"]
+        self.rows = meta["rows"]
+        self._columns = [_Column(directory / f"s{index}_c{j}") for j in range(meta["cols"])]
+
+    def iter_rows(self, min_row: int = 1, max_row=None, values_only: bool = True):
+        # openpyxl 과 같은 1부터 시작하는 행 번호. 값(values_only)만 지원
+        lo = max(min_row, 1) - 1
+        hi = self.rows if max_row is None else min(max_row, self.rows)
+        for start in range(lo, hi, BLOCK_ROWS):
+            end = min(start + BLOCK_ROWS, hi)
+            yield from zip(*(col.block(start, end) for col in self._columns))
+
+
+class CachedWorkbook:
+    def __init__(self, directory: Path):
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        self.sheetnames = [s["name"] for s in meta["sheets"]]
+        self._sheets = {s["name"]: CachedSheet(directory, i, s) for i, s in enumerate(meta["sheets"])}
+
+    def __getitem__(self, name: str) -> CachedSheet:
+        return self._sheets[name]
+
+    def close(self):
+        pass
+
+
+def load_workbook(filepath: Path):
+    """캐시가 있으면 캐시에서, 없으면 변환한 뒤 읽는다. XLSX_CACHE=0 이면 openpyxl 그대로"""
+    if not XLSX_CACHE:
+        import openpyxl
+        return openpyxl.load_workbook(filepath, read_only=True)
+    return CachedWorkbook(build_cache(filepath))
+
+
+def main():
+    files = [Path(p) for p in sys.argv[1:]] or sorted(DATA_DIR.glob("*.xlsx"))
+    for filepath in files:
+        target = build_cache(filepath)
+        size = sum(p.stat().st_size for p in target.iterdir())
+        print(f"{filepath.name}: {filepath.stat().st_size / (1024*1024):.1f} MB → {target} ({size / (1024*1024):.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
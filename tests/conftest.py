@@ -0,0 +1,144 @@
+"""
+테스트 공용 스텁: 실제 모델 대신 결정적인 스텁 인코더/토크나이저를 쓴다 (모델 다운로드, torch 불필요)
+
+- 벡터: 텍스트의 SHA-1 로 시드를 정한 정규분포 벡터 (L2 정규화, DIM 차원). 같은 텍스트면 항상 같은 벡터
+- 토큰: 공백으로 나눈 단어 하나가 토큰 하나, 앞뒤에 특수 토큰 2개 (offset (0, 0))
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# app.model 은 import 시점에 환경 변수를 읽으므로 import 전에 설정 (디스크 캐시는 쓰는 테스트에서만 직접 생성)
+os.environ.setdefault("EMBED_DISK_CACHE_ENABLED", "0")
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+DIM = 16
+_WORD = re.compile(r"\S+")
+
+
+def stub_vector(text: str) -> np.ndarray:
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    v = np.random.default_rng(seed).standard_normal(DIM).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+def stub_encode(texts) -> np.ndarray:
+    if not texts:
+        return np.zeros((0, DIM), dtype=np.float32)
+    return np.stack([stub_vector(t) for t in texts])
+
+
+def write_ref_store(directory: Path, rows: list[tuple], dtype: str = "float16",
+                    model_name: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2") -> Path:
+    """
+    rows: (sentence_id, english_text, korean_ref, difficulty, category) — id 오름차순.
+    scripts/build_ref_embeddings.py 와 같은 파일 구성으로 스텁 벡터를 기록
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    np.save(directory / "ids.npy", np.array([r[0] for r in rows], dtype=np.int64))
+    vocab = {}
+    for field, col in (("difficulty", 3), ("category", 4)):
+        vocab[field] = sorted({r[col] for r in rows})
+        index = {v: i for i, v in enumerate(vocab[field])}
+        np.save(directory / f"{field}.npy", np.array([index[r[col]] for r in rows], dtype=np.int16))
+    for lang, col in (("en", 1), ("ko", 2)):
+        np.save(directory / f"{lang}.npy", stub_encode([r[col] for r in rows]).astype(dtype))
+    meta = {"model_name": model_name, "dtype": dtype, "count": len(rows), "dim": DIM, **vocab}
+    (directory / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+    return directory
+
+
+def write_xlsx(path: Path, rows: list[tuple], sheet: str = "Sheet1") -> Path:
+    """첫 시트에 rows 를 그대로 쓴 xlsx (openpyxl 필요)"""
+    openpyxl = pytest.importorskip("openpyxl")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = sheet
+    for row in rows:
+        ws.append(list(row))
+    wb.save(path)
+    return Path(path)
+
+
+class _Encoding(dict):
+    def __init__(self, data: dict, word_ids: list):
+        super().__init__(data)
+        self._word_ids = word_ids
+
+    def word_ids(self, i: int) -> list:
+        return self._word_ids[i]
+
+
+class StubTokenizer:
+    def num_special_tokens_to_add(self) -> int:
+        return 2
+
+    def spans(self, text: str) -> list[tuple[int, int]]:
+        return [(m.start(), m.end()) for m in _WORD.finditer(text)]
+
+    def __call__(self, texts, truncation=False, max_length=None, return_offsets_mapping=False, **kwargs):
+        ids, offsets, word_ids = [], [], []
+        for text in texts:
+            spans = self.spans(text)
+            if truncation and max_length:
+                spans = spans[:max(max_length - 2, 0)]
+            offsets.append([(0, 0)] + spans + [(0, 0)])
+            word_ids.append([None] + list(range(len(spans))) + [None])
+            ids.append(list(range(len(spans) + 2)))
+        data = {"input_ids": ids}
+        if return_offsets_mapping:
+            data["offset_mapping"] = offsets
+        return _Encoding(data, word_ids)
+
+
+class StubModel:
+    """SentenceTransformer 대역: encode 호출마다 입력을 calls 에 남긴다"""
+
+    def __init__(self, max_seq_length: int = 128):
+        self.max_seq_length = max_seq_length
+        self.tokenizer = StubTokenizer()
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts, output_value="sentence_embedding", **kwargs):
+        self.calls.append(list(texts))
+        vecs = stub_encode(texts)
+        if output_value is None:
+            # 토큰 벡터: 단어 벡터 + 특수 토큰 (embed_with_words 용)
+            return [{
+                "sentence_embedding": vecs[i],
+                "token_embeddings": np.stack([np.zeros(DIM, dtype=np.float32)]
+                                             + [stub_vector(w) for w in text.split()]
+                                             + [np.zeros(DIM, dtype=np.float32)]),
+            } for i, text in enumerate(texts)]
+        return vecs
+
+
+@pytest.fixture
+def stub_model(monkeypatch):
+    """app.model.get_model 이 돌려줄 스텁 모델 (로딩된 모델 자리에 끼워 넣는다)"""
+    from app import model
+
+    stub = StubModel()
+    monkeypatch.setitem(model._loaded, model.MODEL_NAME, stub)
+    return stub
+
+
+@pytest.fixture
+def client(stub_model, monkeypatch):
+    """스텁 모델로 준비 완료 상태인 앱 (lifespan 의 기동 단계는 돌리지 않는다)"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.startup import state
+
+    monkeypatch.setattr(state, "ready", True)
+    monkeypatch.setattr(state, "phase", "ready")
+    return TestClient(app)
@@ -0,0 +1,112 @@
+"""
+MicroBatcher 의 긴 입력 후순위 처리(aging), 섞인 요청 분할, 부하 시 거절, 요청 시간 초과 테스트
+
+실행: python -m pytest -q tests
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.model import InferenceOverloaded, MicroBatcher
+from conftest import stub_encode
+from test_micro_batcher import GatedEncoder, submit_async, wait_queue_depth
+
+LONG = 100
+
+
+def make(enc, **kwargs) -> MicroBatcher:
+    options = dict(max_batch_size=1, max_wait_ms=0, long_tokens=10, long_delay_ms=300)
+    options.update(kwargs)
+    return MicroBatcher(enc, **options)
+
+
+def block(batcher, enc):
+    # 첫 배치로 스레드를 붙잡아 두고 그동안 대기열 순서를 만든다
+    t = submit_async(batcher, ["blocker"])
+    assert enc.started.wait(2)
+    return t
+
+
+def test_long_request_yields_to_later_short_ones():
+    enc = GatedEncoder()
+    batcher = make(enc)
+    threads = [block(batcher, enc)]
+    threads.append(submit_async(batcher, ["long"], [LONG]))
+    wait_queue_depth(batcher, 1)
+    threads.append(submit_async(batcher, ["short"], [3]))
+    wait_queue_depth(batcher, 2)
+    enc.gate.set()
+    for t, _ in threads:
+        t.join(5)
+    assert enc.calls == [["blocker"], ["short"], ["long"]]
+
+
+def test_long_request_is_not_starved():
+    enc = GatedEncoder()
+    batcher = make(enc)
+    threads = [block(batcher, enc)]
+    threads.append(submit_async(batcher, ["long"], [LONG]))
+    wait_queue_depth(batcher, 1)
+    # long_delay 가 지나면 이후에 온 짧은 요청보다 앞선다
+    time.sleep(0.35)
+    threads.append(submit_async(batcher, ["short"], [3]))
+    wait_queue_depth(batcher, 2)
+    enc.gate.set()
+    for t, _ in threads:
+        t.join(5)
+    assert enc.calls == [["blocker"], ["long"], ["short"]]
+
+
+def test_mixed_request_is_split_and_reassembled():
+    enc = GatedEncoder()
+    batcher = make(enc)
+    threads = [block(batcher, enc)]
+    mixed = submit_async(batcher, ["s1", "L1", "s2", "L2"], [2, LONG, 3, LONG])
+    wait_queue_depth(batcher, 2)
+    threads.append(submit_async(batcher, ["later"], [2]))
+    wait_queue_depth(batcher, 3)
+    enc.gate.set()
+    for t, _ in [*threads, mixed]:
+        t.join(5)
+    # 짧은 부분은 보통 순서, 긴 부분만 뒤로
+    assert enc.calls == [["blocker"], ["s1", "s2"], ["later"], ["L1", "L2"]]
+    assert np.allclose(mixed[1]["result"], stub_encode(["s1", "L1", "s2", "L2"]))
+    stats = batcher.stats()
+    # 나눠 넣은 요청도 1건
+    assert stats["requests"] == 3 and stats["long_requests"] == 1 and stats["batches"] == 4
+
+
+def test_all_long_request_is_shed_when_queue_is_deep():
+    enc = GatedEncoder()
+    batcher = make(enc, shed_queue_depth=1)
+    threads = [block(batcher, enc), submit_async(batcher, ["queued"], [2])]
+    wait_queue_depth(batcher, 1)
+    with pytest.raises(InferenceOverloaded, match="shed"):
+        batcher.submit(["long"], [LONG])
+    # 짧은 텍스트가 섞인 요청은 거절하지 않는다
+    threads.append(submit_async(batcher, ["short", "long"], [2, LONG]))
+    wait_queue_depth(batcher, 3)
+    enc.gate.set()
+    for t, box in threads:
+        t.join(5)
+        assert "result" in box
+    assert batcher.stats()["shed"] == 1
+
+
+def test_timed_out_request_is_dropped_from_the_queue():
+    enc = GatedEncoder()
+    batcher = make(enc, request_timeout_ms=100)
+    threads = [block(batcher, enc)]
+    start = time.perf_counter()
+    with pytest.raises(InferenceOverloaded, match="timed out"):
+        batcher.submit(["gave up", "gave up long"], [2, LONG])
+    assert time.perf_counter() - start < 1.0
+    threads.append(submit_async(batcher, ["next"], [2]))
+    wait_queue_depth(batcher, 3)
+    enc.gate.set()
+    for t, _ in threads:
+        t.join(5)
+    # 포기한 요청의 두 부분 모두 encode 하지 않는다
+    assert enc.calls == [["blocker"], ["next"]]
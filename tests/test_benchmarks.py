@@ -0,0 +1,73 @@
+"""
+benchmarks/ 기준선 비교와 공용 도구 테스트 (실제 측정은 하지 않는다)
+
+실행: python -m pytest -q tests
+"""
+
+import json
+import random
+import sys
+
+import pytest
+
+from benchmarks import common, run
+
+
+def results(**metrics) -> dict:
+    return {"meta": {}, "results": metrics}
+
+
+def test_compare_flags_regressions_by_metric_direction():
+    baseline = results(embed={"p95_ms": 10.0, "texts_per_sec": 100.0, "batch": 8},
+                       load={"rps": 50.0, "total_s": 2.0})
+    current = results(embed={"p95_ms": 12.0, "texts_per_sec": 85.0, "batch": 64},
+                      load={"rps": 56.0, "total_s": 1.5})
+    # 지연 20% 증가, 처리량 15% 감소는 회귀. rps 증가/시간 감소는 개선, 방향 없는 지표는 무시
+    assert run.compare(baseline, current, 0.10) == ["embed p95_ms", "embed texts_per_sec"]
+    assert run.compare(baseline, current, 0.25) == []
+
+
+def test_compare_skips_noise_config_and_new_entries():
+    baseline = results(tiny={"p50_ms": 0.2, "warm_s": 0.01}, a={"p50_ms": 5.0}, **{"a/_config": {"x_ms": 5.0}})
+    current = results(tiny={"p50_ms": 0.9, "warm_s": 0.05}, a={"p50_ms": 5.1},
+                      **{"a/_config": {"x_ms": 50.0}}, new={"p50_ms": 99.0})
+    assert run.compare(baseline, current, 0.10) == []
+
+
+def test_compare_command_exit_code(tmp_path, monkeypatch):
+    base, cur = tmp_path / "base.json", tmp_path / "cur.json"
+    base.write_text(json.dumps(results(embed={"p95_ms": 10.0})), encoding="utf-8")
+    cur.write_text(json.dumps(results(embed={"p95_ms": 20.0})), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["benchmarks.run", "compare", str(base), str(cur)])
+    with pytest.raises(SystemExit) as exc:
+        run.main()
+    assert exc.value.code == 1
+    monkeypatch.setattr(sys, "argv", ["benchmarks.run", "compare", str(base), str(base)])
+    with pytest.raises(SystemExit) as exc:
+        run.main()
+    assert exc.value.code == 0
+
+
+def test_unknown_suite_is_a_usage_error(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["benchmarks.run", "embed", "bogus"])
+    with pytest.raises(SystemExit) as exc:
+        run.main()
+    assert exc.value.code == 2
+    assert "unknown suite: bogus" in capsys.readouterr().err
+
+
+def test_synthetic_corpus_is_reproducible(monkeypatch, tmp_path):
+    monkeypatch.setattr(common, "CSV_PATH", tmp_path / "missing.csv")
+    a = common.corpus_by_difficulty(20)
+    assert a == common.corpus_by_difficulty(20)
+    for difficulty, pairs in a.items():
+        lo, hi = common.WORD_RANGES[difficulty]
+        assert len(pairs) == 20
+        assert all(lo <= len(en.split()) <= hi for en, _ in pairs)
+    assert common.synthetic_pair(random.Random(1), "STARTER") == common.synthetic_pair(random.Random(1), "STARTER")
+
+
+def test_summarize_ms():
+    summary = common.summarize_ms([0.001] * 99 + [0.101])
+    assert summary["p50_ms"] == 1.0 and summary["mean_ms"] == 2.0
+    assert summary["p99_ms"] > summary["p95_ms"]
@@ -0,0 +1,87 @@
+"""
+app/service.py 캐스케이드 채점 테스트 (소형/대형 모델 모두 스텁)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+import pytest
+
+from app import model, service
+from app.service import THRESHOLD_CORRECT, THRESHOLD_PARTIAL, judge_similarity_array
+from conftest import DIM, StubModel, stub_vector
+
+SMALL_CORRECT, SMALL_PARTIAL = 0.6, 0.4
+
+
+class FixedSimModel(StubModel):
+    """en 문장과 짝 ko 문장의 코사인 유사도가 sims[en] 이 되도록 벡터를 만드는 소형 모델 대역"""
+
+    def __init__(self, sims: dict[str, float], pairs: dict[str, str]):
+        super().__init__()
+        e1, e2 = np.eye(DIM, dtype=np.float32)[:2]
+        self.vectors = {}
+        for en, ko in pairs.items():
+            s = sims[en]
+            self.vectors[en] = e1
+            self.vectors[ko] = s * e1 + np.sqrt(1 - s * s) * e2
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.stack([self.vectors[t] for t in texts]).astype(np.float32)
+
+
+@pytest.fixture
+def cascade(stub_model, monkeypatch):
+    monkeypatch.setattr(service, "CASCADE_ENABLED", True)
+    monkeypatch.setattr(service, "SMALL_THRESHOLD_CORRECT", SMALL_CORRECT)
+    monkeypatch.setattr(service, "SMALL_THRESHOLD_PARTIAL", SMALL_PARTIAL)
+    monkeypatch.setattr(service, "CASCADE_BAND_CORRECT", 0.05)
+    monkeypatch.setattr(service, "CASCADE_BAND_PARTIAL", 0.05)
+    monkeypatch.setattr(model, "EMBED_CACHE_ENABLED", False)
+    pairs = {"clear yes": "확실히 맞음", "near correct": "맞음 경계", "near partial": "부분 경계", "clear no": "확실히 아님"}
+    sims = {"clear yes": 0.95, "near correct": 0.62, "near partial": 0.38, "clear no": 0.05}
+    small = FixedSimModel(sims, pairs)
+    monkeypatch.setitem(model._loaded, service.CASCADE_SMALL_MODEL, small)
+    monkeypatch.setattr(service, "_cascade_stats", service.CascadeStats())
+    return small, stub_model, pairs
+
+
+def test_only_ambiguous_pairs_reach_the_large_model(cascade):
+    small, large, pairs = cascade
+    en, ko = list(pairs), list(pairs.values())
+    sims, labels = service.score_pairs(en, ko)
+
+    assert large.calls == [["near correct", "맞음 경계", "near partial", "부분 경계"]]
+    # 애매한 쌍은 대형 모델 점수 그대로
+    for i in (1, 2):
+        assert sims[i] == pytest.approx(float(np.dot(stub_vector(en[i]), stub_vector(ko[i]))), abs=1e-6)
+    assert labels.tolist() == judge_similarity_array(sims).tolist()
+    stats = service.cascade_stats()
+    assert (stats["pairs"], stats["escalated"], stats["decided_by_small"]) == (4, 2, 2)
+
+
+def test_small_scores_are_rescaled_to_large_thresholds(cascade):
+    sims = np.array([-1.0, SMALL_PARTIAL, SMALL_CORRECT, 1.0], dtype=np.float32)
+    scaled = service._small_to_large_scale(sims)
+    assert np.allclose(scaled, [-1.0, THRESHOLD_PARTIAL, THRESHOLD_CORRECT, 1.0])
+    # 소형 모델 기준 판정이 척도 변환 후에도 같다
+    small = np.array([0.95, 0.05, 0.5])
+    assert judge_similarity_array(service._small_to_large_scale(small)).tolist() == \
+        judge_similarity_array(small, SMALL_CORRECT, SMALL_PARTIAL).tolist()
+
+
+def test_clear_pairs_never_touch_the_large_model(cascade):
+    small, large, _ = cascade
+    sims, labels = service.score_pairs(["clear yes", "clear no"], ["확실히 맞음", "확실히 아님"])
+    assert large.calls == []
+    assert labels.tolist() == ["맞음", "아님"]
+
+
+def test_budget_checks_both_models(cascade, monkeypatch):
+    small, _, _ = cascade
+    monkeypatch.setattr(model, "EMBED_OVERLENGTH", "reject")
+    small.max_seq_length = 4
+    errors = service.budget_errors(["one two three four five", "short"], ["짧다", "짧다"])
+    assert errors[0] == "en: input exceeds token budget (4 tokens)"
+    assert errors[1] is None
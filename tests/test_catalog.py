@@ -0,0 +1,136 @@
+"""
+app/catalog.py 메모리 상주 문장 카탈로그와 /sentences/sample 테스트
+
+실행: python -m pytest -q tests
+"""
+
+import csv
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from app import catalog as catalog_module
+from app.catalog import SentenceCatalog
+
+# (id, en, ko, difficulty, category, subcategory, source) — 그룹 크기가 서로 다르게
+ROWS = [
+    (10, "I like apples.", "나는 사과를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    (11, "Where is the station?", "역이 어디예요?", "BEGINNER", "TRAVEL", "", "manual"),
+    (12, "It is raining.", "비가 온다.", "STARTER", "DAILY", "weather", "tatoeba"),
+    (13, "I like pears.", "나는 배를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    (14, "Good morning.", "좋은 아침.", "STARTER", "DAILY", "", "aihub"),
+    (15, "Is this seat taken?", "이 자리 있어요?", "BEGINNER", "TRAVEL", "", "aihub"),
+    (16, "I like grapes.", "나는 포도를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    (17, "See you tomorrow.", "내일 봐.", "STARTER", "DAILY", "", "aihub"),
+    (18, "The economy is slowing down.", "경제가 둔화되고 있다.", "ADVANCED", "DAILY", "", "aihub"),
+]
+
+
+@pytest.fixture
+def cat() -> SentenceCatalog:
+    return SentenceCatalog(iter(ROWS), "db")
+
+
+def picked(cat, rows) -> list[int]:
+    return [cat.row(i)["sentence_id"] for i in rows.tolist()]
+
+
+def test_row_round_trip(cat):
+    for i, r in enumerate(ROWS):
+        assert cat.row(i) == dict(zip(
+            ("sentence_id", "english_text", "korean_ref", "difficulty", "category", "subcategory", "source"), r
+        ))
+
+
+def test_counts(cat):
+    assert len(cat) == 9 and len(cat.groups) == 4
+    assert cat.count() == 9
+    assert cat.count(difficulty="BEGINNER") == 5
+    assert cat.count(category="DAILY") == 4
+    assert cat.count(difficulty="STARTER", category="DAILY") == 3
+    assert cat.count(difficulty="CHALLENGE") == 0
+
+
+def test_sample_returns_distinct_matching_rows(cat):
+    rows, total = cat.sample(3, difficulty="BEGINNER", seed=1)
+    ids = picked(cat, rows)
+    assert total == 5 and len(ids) == len(set(ids)) == 3
+    assert all(ROWS[i - 10][3] == "BEGINNER" for i in ids)
+
+    rows, total = cat.sample(2, category="TRAVEL", seed=1)
+    assert total == 2 and sorted(picked(cat, rows)) == [11, 15]
+
+
+def test_sample_more_than_available_returns_all(cat):
+    rows, total = cat.sample(100, category="DAILY", seed=3)
+    assert total == 4 and sorted(picked(cat, rows)) == [12, 14, 17, 18]
+
+
+def test_unknown_filter_returns_empty(cat):
+    for kwargs in ({"difficulty": "EXPERT"}, {"category": "SPORTS"}, {"difficulty": "ADVANCED", "category": "FOOD"}):
+        rows, total = cat.sample(5, **kwargs)
+        assert len(rows) == 0 and total == 0
+
+
+def test_seed_is_reproducible(cat):
+    a, _ = cat.sample(4, seed=42)
+    b, _ = cat.sample(4, seed=42)
+    assert np.array_equal(a, b)
+    others = {tuple(cat.sample(4, seed=s)[0].tolist()) for s in range(20)}
+    assert len(others) > 1
+
+
+@pytest.mark.parametrize("n, kwargs", [(1, {}), (2, {"category": "DAILY"}), (3, {"difficulty": "BEGINNER"})])
+def test_sample_is_roughly_uniform(cat, n, kwargs):
+    # 그룹 크기가 달라도 조건에 맞는 행마다 뽑힐 확률이 n / 전체 건수
+    trials = 3000
+    counts = Counter()
+    for seed in range(trials):
+        rows, total = cat.sample(n, seed=seed, **kwargs)
+        counts.update(picked(cat, rows))
+    expected = trials * n / total
+    assert len(counts) == total
+    assert all(abs(c - expected) < 0.15 * expected for c in counts.values())
+
+
+def test_csv_catalog_has_no_sentence_ids(tmp_path, monkeypatch):
+    path = tmp_path / "cleansed_sentences.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["english_text", "korean_ref", "difficulty", "category", "subcategory", "source"])
+        writer.writerows(r[1:] for r in ROWS)
+    monkeypatch.setattr(catalog_module, "SENTENCE_CATALOG_CSV", path)
+    monkeypatch.setattr(catalog_module, "_catalog", None)
+    cat = catalog_module.load_catalog("csv")
+    assert cat is catalog_module.get_catalog() and len(cat) == 9
+    row = cat.row(0)
+    assert row["sentence_id"] is None and row["english_text"] == "I like apples."
+
+
+def test_missing_or_broken_source_disables_catalog(tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_module, "_catalog", SentenceCatalog(iter(ROWS), "db"))
+    monkeypatch.setattr(catalog_module, "SENTENCE_CATALOG_CSV", tmp_path / "missing.csv")
+    assert catalog_module.load_catalog("csv") is None and catalog_module.get_catalog() is None
+
+    broken = tmp_path / "broken.csv"
+    broken.write_text("english_text,korean_ref\nhello,안녕\n", encoding="utf-8")
+    monkeypatch.setattr(catalog_module, "SENTENCE_CATALOG_CSV", broken)
+    assert catalog_module.load_catalog("csv") is None and catalog_module.get_catalog() is None
+    assert catalog_module.load_catalog("off") is None
+
+
+def test_sample_endpoint(client, monkeypatch):
+    monkeypatch.setattr(catalog_module, "_catalog", SentenceCatalog(iter(ROWS), "db"))
+    r = client.get("/sentences/sample", params={"n": 2, "difficulty": "STARTER", "seed": 7})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["available"] == 3 and len(body["sentences"]) == 2
+    assert all(s["difficulty"] == "STARTER" for s in body["sentences"])
+    assert client.get("/sentences/sample", params={"n": 0}).status_code == 422
+    assert client.get("/stats/catalog").json()["count"] == 9
+
+
+def test_sample_endpoint_without_catalog(client, monkeypatch):
+    monkeypatch.setattr(catalog_module, "_catalog", None)
+    assert client.get("/sentences/sample").status_code == 503
@@ -0,0 +1,95 @@
+"""
+scripts/cleanse_data.py 병렬 스트리밍 정제 파이프라인 테스트 (작은 xlsx 말뭉치)
+
+실행: python -m pytest -q tests
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import cleanse_data  # noqa: E402
+import xlsx_cache  # noqa: E402
+from conftest import write_xlsx  # noqa: E402
+
+SPOKEN_HEADER = ("SID", "원문", "번역문")
+DIALOG_HEADER = ("대분류", "소분류", "상황", "Set Nr.", "발화자", "원문", "번역문")
+
+SPOKEN_1 = [
+    (1, "나는 사과를 좋아한다.", "I like apples."),
+    (2, "역이 어디예요?", "Where is the station?"),
+    (3, "123 456", "12 34 56 78"),                     # 특수문자/숫자 비율 초과
+    (4, "안녕", None),                                  # 빈 영어
+]
+SPOKEN_2 = [
+    (1, "나는 사과가 좋아요.", "i like apples."),       # 1번 파일과 대소문자만 다른 중복
+    (2, "오늘 비가 온다.", "It is raining today."),
+]
+DIALOG = [
+    ("쇼핑", "옷", "매장", 1, "A", "이거 얼마예요?", "How much is this?"),
+    ("여행", "교통", "역", 2, "B", "다음 기차는 언제 출발하나요?",
+     "When does the next train to the city center leave the station?"),
+]
+
+
+@pytest.fixture
+def corpus(tmp_path, monkeypatch):
+    data = tmp_path / "data"
+    data.mkdir()
+    write_xlsx(data / "1_구어체(1).xlsx", [SPOKEN_HEADER, *SPOKEN_1])
+    write_xlsx(data / "1_구어체(2).xlsx", [SPOKEN_HEADER, *SPOKEN_2])
+    write_xlsx(data / "2_대화체.xlsx", [DIALOG_HEADER, *DIALOG])
+    monkeypatch.setattr(cleanse_data, "DATA_DIR", data)
+    monkeypatch.setattr(cleanse_data, "OUTPUT_CSV", tmp_path / "cleansed_sentences.csv")
+    monkeypatch.setattr(cleanse_data, "REPORT_FILE", tmp_path / "cleanse_report.txt")
+    monkeypatch.setattr(cleanse_data, "report_lines", [])
+    monkeypatch.setattr(xlsx_cache, "XLSX_CACHE_DIR", tmp_path / "xlsx_cache")
+    return data
+
+
+def run(monkeypatch, workers: int) -> tuple[list[list[str]], str]:
+    monkeypatch.setattr(cleanse_data, "CLEANSE_WORKERS", workers)
+    monkeypatch.setattr(cleanse_data, "report_lines", [])
+    cleanse_data.main()
+    with open(cleanse_data.OUTPUT_CSV, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    return rows, cleanse_data.REPORT_FILE.read_text(encoding="utf-8")
+
+
+def test_output_rows_in_file_order(corpus, monkeypatch):
+    rows, report = run(monkeypatch, 1)
+    assert rows[0] == cleanse_data.FIELDNAMES
+    assert rows[1:] == [
+        ["I like apples.", "나는 사과를 좋아한다.", "STARTER", "DAILY", "", "AIHUB_SPOKEN_1"],
+        ["Where is the station?", "역이 어디예요?", "BEGINNER", "DAILY", "", "AIHUB_SPOKEN_1"],
+        ["It is raining today.", "오늘 비가 온다.", "BEGINNER", "DAILY", "", "AIHUB_SPOKEN_2"],
+        ["How much is this?", "이거 얼마예요?", "BEGINNER", "쇼핑", "옷", "AIHUB_DIALOG"],
+        ["When does the next train to the city center leave the station?", "다음 기차는 언제 출발하나요?",
+         "INTERMEDIATE", "여행", "교통", "AIHUB_DIALOG"],
+    ]
+    assert "중복 제거 전: 6문장" in report and "중복 제거 후: 5문장" in report
+    assert "en_special_chars: 1" in report and "empty: 1" in report
+
+
+def test_parallel_run_matches_sequential(corpus, monkeypatch):
+    sequential = run(monkeypatch, 1)
+    assert run(monkeypatch, 3) == sequential
+
+
+def test_missing_file_is_reported(corpus, monkeypatch):
+    (corpus / "1_구어체(2).xlsx").unlink()
+    rows, report = run(monkeypatch, 2)
+    assert "파일 없음: 1_구어체(2).xlsx" in report
+    # 1번 파일의 "i like apples." 중복 상대가 없으므로 2번 파일 행만 빠진다
+    assert [r[0] for r in rows[1:]] == ["I like apples.", "Where is the station?", "How much is this?",
+                                        "When does the next train to the city center leave the station?"]
+
+
+def test_cleanse_to_shard_writes_passed_rows_and_stats(corpus, tmp_path):
+    shard = tmp_path / "shard.csv"
+    stats = cleanse_data._cleanse_to_shard("spoken", corpus / "1_구어체(1).xlsx", "AIHUB_SPOKEN_1", shard)
+    assert stats == {"total": 4, "passed": 2, "reasons": {"en_special_chars": 1, "empty": 1}}
+    assert [r[0] for r in cleanse_data._read_shard(shard)] == ["I like apples.", "Where is the station?"]
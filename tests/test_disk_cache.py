@@ -0,0 +1,118 @@
+"""
+app/disk_cache.py SQLite 영속 임베딩 캐시 테스트
+
+실행: python -m pytest -q tests
+"""
+
+import sqlite3
+import threading
+
+import numpy as np
+import pytest
+
+from app import disk_cache, model
+from app.disk_cache import DiskEmbeddingCache, text_key
+from conftest import stub_encode, stub_vector
+
+KEY = "stub-model|torch|max_tokens=128"
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskEmbeddingCache(tmp_path / "cache" / "embed.sqlite3", max_bytes=1 << 30)
+
+
+def test_round_trip_is_normalized_float16(cache):
+    texts = ["a", "b", "c"]
+    cache.put_many(texts, stub_encode(texts), KEY)
+    got = cache.get_many(["c", "missing", "a"], KEY)
+    assert got[1] is None
+    for text, v in (("c", got[0]), ("a", got[2])):
+        assert v.dtype == np.float32
+        assert np.linalg.norm(v) == pytest.approx(1.0, abs=1e-6)
+        assert np.allclose(v, stub_vector(text), atol=2e-3)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (2, 1, 3)
+
+
+def test_entries_are_scoped_by_model_key(cache):
+    cache.put_many(["a"], stub_encode(["a"]), KEY)
+    assert cache.get_many(["a"], "stub-model|onnx:avx2|max_tokens=128") == [None]
+
+
+def test_survives_restart(tmp_path):
+    path = tmp_path / "embed.sqlite3"
+    DiskEmbeddingCache(path, 1 << 30).put_many(["a"], stub_encode(["a"]), KEY)
+    # 새 프로세스/워커가 같은 파일을 열면 바로 적중
+    assert DiskEmbeddingCache(path, 1 << 30).get_many(["a"], KEY)[0] is not None
+
+
+def test_many_keys_are_looked_up_in_chunks(cache, monkeypatch):
+    monkeypatch.setattr(disk_cache, "_SQL_LOOKUP_CHUNK", 7)
+    texts = [f"t{i}" for i in range(50)]
+    cache.put_many(texts[::2], stub_encode(texts[::2]), KEY)
+    got = cache.get_many(texts, KEY)
+    assert [v is not None for v in got] == [i % 2 == 0 for i in range(50)]
+
+
+def test_threads_use_their_own_connections(cache):
+    texts = [f"t{i}" for i in range(20)]
+    errors = []
+
+    def worker(i):
+        try:
+            cache.put_many(texts[i::4], stub_encode(texts[i::4]), KEY)
+            assert all(v is not None for v in cache.get_many(texts[i::4], KEY))
+        except Exception as e:  # sqlite3.ProgrammingError: 다른 스레드의 연결 사용
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(5)
+    assert errors == []
+    assert all(v is not None for v in cache.get_many(texts, KEY))
+
+
+def test_stale_access_time_is_refreshed(cache, monkeypatch):
+    cache.put_many(["old", "new"], stub_encode(["old", "new"]), KEY)
+    conn = sqlite3.connect(cache.path)
+    with conn:
+        conn.execute("UPDATE embeddings SET accessed_at = 0 WHERE key = ?", (text_key("old"),))
+    cache.get_many(["old"], KEY)
+    (accessed_at,) = conn.execute("SELECT accessed_at FROM embeddings WHERE key = ?", (text_key("old"),)).fetchone()
+    assert accessed_at > 0
+
+
+def test_eviction_drops_least_recently_accessed(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "_EVICT_CHECK_EVERY", 1)
+    cache = DiskEmbeddingCache(tmp_path / "embed.sqlite3", max_bytes=1 << 30)
+    texts = [f"sentence number {i}" for i in range(2000)]
+    cache.put_many(texts, stub_encode(texts), KEY)
+    conn = sqlite3.connect(cache.path)
+    with conn:
+        # 앞쪽 절반이 오래 조회되지 않은 항목
+        conn.executemany("UPDATE embeddings SET accessed_at = 1 WHERE key = ?",
+                         [(text_key(t),) for t in texts[:1000]])
+    # 상한의 90% 까지 줄이면 오래된 항목 일부만 지워진다
+    cache.max_bytes = int(cache.size_bytes() * 0.8)
+    cache.put_many(["trigger"], stub_encode(["trigger"]), KEY)
+
+    assert cache.stats()["evictions"] > 0
+    got = cache.get_many(texts, KEY)
+    assert all(v is not None for v in got[1000:])
+    assert any(v is None for v in got[:1000])
+
+
+def test_embed_texts_reads_through_disk_cache(stub_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(model, "EMBED_CACHE_ENABLED", False)
+    monkeypatch.setattr(model, "EMBED_DISK_CACHE_ENABLED", True)
+    monkeypatch.setattr(model, "_disk_cache", DiskEmbeddingCache(tmp_path / "embed.sqlite3", 1 << 30))
+
+    first = model.embed_texts(["disk a", "disk b"])
+    calls = len(stub_model.calls)
+    second = model.embed_texts(["disk  a", "disk b", "disk c"])
+    # 두 번째는 정규화 키가 같은 두 문장은 디스크에서, 새 문장만 모델로
+    assert stub_model.calls[calls:] == [["disk c"]]
+    assert np.allclose(second[:2], first, atol=2e-3)
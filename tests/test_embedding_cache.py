@@ -0,0 +1,166 @@
+"""
+app/model.py EmbeddingCache (LRU + single-flight) 테스트 (스텁 인코더)
+
+실행: python -m pytest -q tests
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.model import EmbeddingCache
+from conftest import DIM, stub_encode, stub_vector
+
+MODEL = "stub-model"
+
+
+class CountingCompute:
+    def __init__(self, gate: threading.Event = None):
+        self.calls: list[list[str]] = []
+        self.gate = gate
+        self.started = threading.Event()
+
+    def __call__(self, texts, model_name):
+        self.calls.append(list(texts))
+        self.started.set()
+        if self.gate is not None:
+            assert self.gate.wait(5)
+        return stub_encode(texts)
+
+
+def big_cache(**kwargs) -> EmbeddingCache:
+    return EmbeddingCache(kwargs.get("max_entries", 1000), kwargs.get("max_bytes", 1 << 30))
+
+
+def test_hits_skip_compute_and_keep_order():
+    cache, compute = big_cache(), CountingCompute()
+    cache.embed(["a", "b"], MODEL, compute)
+    out = cache.embed(["b", "c", "a"], MODEL, compute)
+    assert compute.calls == [["a", "b"], ["c"]]
+    assert np.allclose(out, stub_encode(["b", "c", "a"]))
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+
+
+def test_duplicates_in_one_request_are_encoded_once():
+    cache, compute = big_cache(), CountingCompute()
+    out = cache.embed(["a", "a", "b", "a"], MODEL, compute)
+    assert compute.calls == [["a", "b"]]
+    assert out.shape == (4, DIM) and np.allclose(out[3], stub_vector("a"))
+
+
+def test_keys_are_normalized_and_scoped_by_model():
+    cache, compute = big_cache(), CountingCompute()
+    cache.embed(["hello  world "], MODEL, compute)
+    cache.embed(["hello world"], MODEL, compute)
+    cache.embed(["hello world"], "other-model", compute)
+    assert compute.calls == [["hello world"], ["hello world"]]
+
+
+def test_cached_vectors_are_read_only():
+    cache = big_cache()
+    out = cache.embed(["a"], MODEL, CountingCompute())
+    stored = next(iter(cache._data.values()))
+    assert not stored.flags.writeable
+    # 호출자가 받은 배열을 고쳐도 캐시에는 영향이 없다
+    out[0] += 1
+    assert np.allclose(cache.embed(["a"], MODEL, CountingCompute()), stub_vector("a"))
+
+
+def test_lru_evicts_least_recently_used():
+    cache, compute = big_cache(max_entries=2), CountingCompute()
+    cache.embed(["a"], MODEL, compute)
+    cache.embed(["b"], MODEL, compute)
+    cache.embed(["a"], MODEL, compute)  # a 를 최근으로
+    cache.embed(["c"], MODEL, compute)  # b 가 밀려난다
+    cache.embed(["a"], MODEL, compute)
+    cache.embed(["b"], MODEL, compute)
+    assert compute.calls == [["a"], ["b"], ["c"], ["b"]]
+    assert cache.stats()["evictions"] == 2
+
+
+def test_byte_limit_bounds_memory():
+    entry = EmbeddingCache._entry_bytes((MODEL, "t0"), np.zeros(DIM, dtype=np.float32))
+    cache = EmbeddingCache(max_entries=1000, max_bytes=entry * 3)
+    cache.embed([f"t{i}" for i in range(10)], MODEL, CountingCompute())
+    stats = cache.stats()
+    assert stats["entries"] == 3 and stats["bytes"] <= entry * 3
+
+
+def test_concurrent_misses_for_the_same_text_compute_once():
+    gate = threading.Event()
+    cache, compute = big_cache(), CountingCompute(gate)
+    results = [None] * 8
+
+    def worker(i):
+        results[i] = cache.embed(["same text", f"own {i}"], MODEL, compute)
+
+    first = threading.Thread(target=worker, args=(0,))
+    first.start()
+    assert compute.started.wait(2)
+    rest = [threading.Thread(target=worker, args=(i,)) for i in range(1, 8)]
+    for t in rest:
+        t.start()
+    # 나머지 요청은 자기 텍스트만 계산하고 "same text" 는 첫 요청의 결과를 기다린다
+    deadline = time.monotonic() + 2
+    while len(compute.calls) < 8:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    gate.set()
+    for t in [first, *rest]:
+        t.join(5)
+
+    assert sum(c.count("same text") for c in compute.calls) == 1
+    assert all(np.allclose(r[0], stub_vector("same text")) for r in results)
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_compute_error_reaches_waiters_and_is_not_cached():
+    gate = threading.Event()
+    calls = []
+
+    def failing(texts, model_name):
+        calls.append(list(texts))
+        assert gate.wait(5)
+        raise RuntimeError("encode failed")
+
+    cache = big_cache()
+    errors = []
+
+    def worker():
+        try:
+            cache.embed(["x"], MODEL, failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    threads[0].start()
+    deadline = time.monotonic() + 2
+    while not calls:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    for t in threads[1:]:
+        t.start()
+    while cache.stats()["coalesced"] < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    gate.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1 and len(errors) == 3
+    # 실패한 키는 진행 중 목록에서 빠져 다음 요청이 다시 계산한다
+    assert cache._inflight == {}
+    compute = CountingCompute()
+    cache.embed(["x"], MODEL, compute)
+    assert compute.calls == [["x"]]
+
+
+def test_stats_hit_rate_counts_coalesced_lookups():
+    cache = big_cache()
+    assert cache.stats()["hit_rate"] == 0.0
+    cache.embed(["a", "a"], MODEL, CountingCompute())
+    cache.embed(["a"], MODEL, CountingCompute())
+    assert cache.stats()["hit_rate"] == pytest.approx(0.5)
@@ -0,0 +1,55 @@
+"""
+/judge/batch 일괄 채점과 판정 벡터화 테스트 (스텁 모델)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+
+from app.service import (
+    THRESHOLD_CORRECT, THRESHOLD_PARTIAL, cosine_sim, judge_similarity, judge_similarity_array,
+)
+from conftest import stub_vector
+
+
+def test_label_array_matches_scalar_rule():
+    sims = np.array([-1.0, 0.0, THRESHOLD_PARTIAL - 1e-6, THRESHOLD_PARTIAL,
+                     THRESHOLD_CORRECT - 1e-6, THRESHOLD_CORRECT, 1.0])
+    assert judge_similarity_array(sims).tolist() == [judge_similarity(float(s)) for s in sims]
+
+
+def test_batch_scores_each_pair_like_judge(client):
+    items = [{"en": "I like apples.", "ko": "나는 사과를 좋아한다."},
+             {"en": "Where is the station?", "ko": "역이 어디예요?"},
+             {"en": "It is raining.", "ko": "비가 온다."}]
+    resp = client.post("/judge/batch", json={"items": items})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2]
+    for item, r in zip(items, results):
+        single = client.post("/judge", json=item).json()
+        sim = cosine_sim(stub_vector(item["en"]), stub_vector(item["ko"]))
+        assert r["similarity"] == single["similarity"] == round(sim, 6)
+        assert r["label"] == single["label"] == judge_similarity(sim)
+
+
+def test_invalid_item_is_reported_without_failing_the_batch(client):
+    items = [{"en": "I like apples.", "ko": "나는 사과를 좋아한다."},
+             {"en": "", "ko": "빈 영어 문장"},
+             {"ko": "영어 없음"}]
+    resp = client.post("/judge/batch", json={"items": items})
+    assert resp.status_code == 200
+    ok, empty, missing = resp.json()["results"]
+    assert ok["label"] is not None and ok["error"] is None
+    assert empty["similarity"] is None and "en" in empty["error"]
+    assert missing["similarity"] is None and "en" in missing["error"]
+
+
+def test_batch_encodes_all_pairs_together(client, stub_model, monkeypatch):
+    from app import model
+
+    monkeypatch.setattr(model, "EMBED_CACHE_ENABLED", False)
+    items = [{"en": f"sentence {i}", "ko": f"문장 {i}"} for i in range(4)]
+    client.post("/judge/batch", json={"items": items})
+    # 두 언어 문장 8개가 한 번의 encode 로
+    assert sorted(stub_model.calls[-1]) == sorted(t for it in items for t in (it["en"], it["ko"]))
@@ -0,0 +1,65 @@
+"""
+/judge/detailed 단어 단위 유사도 테스트 (스텁 모델: 토큰 하나 = 공백 단위 단어 하나)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+
+from app import model
+from app.model import embed_with_words
+from app.service import judge_similarity, word_alignment
+from conftest import stub_encode, stub_vector
+
+
+def test_sentence_and_word_vectors_from_one_forward_pass(stub_model):
+    sent, words = embed_with_words(["I  like apples", "사과 좋아"])
+    assert stub_model.calls == [["I  like apples", "사과 좋아"]]
+    assert np.allclose(sent, stub_encode(["I  like apples", "사과 좋아"]), atol=1e-6)
+    (en_words, en_vecs), (ko_words, ko_vecs) = words
+    assert en_words == ["I", "like", "apples"] and ko_words == ["사과", "좋아"]
+    assert np.allclose(en_vecs, stub_encode(en_words), atol=1e-6)
+    assert np.allclose(np.linalg.norm(ko_vecs, axis=1), 1.0)
+
+
+def test_word_alignment_picks_best_match():
+    en_words, ko_words = ["cat", "sleeps"], ["고양이", "잔다", "cat"]
+    en_vecs, ko_vecs = stub_encode(en_words), stub_encode(ko_words)
+    aligned = word_alignment(en_words, en_vecs, ko_words, ko_vecs)
+    assert [a["en_word"] for a in aligned] == en_words
+    # 같은 단어(같은 벡터)가 있으면 그것이 최고 대응
+    assert aligned[0]["ko_word"] == "cat" and aligned[0]["similarity"] == 1.0
+    sims = en_vecs[1] @ ko_vecs.T
+    assert aligned[1]["ko_index"] == int(sims.argmax())
+    assert word_alignment([], en_vecs[:0], ko_words, ko_vecs) == []
+
+
+def test_endpoint(client):
+    resp = client.post("/judge/detailed", json={"en": "the cat sleeps", "ko": "고양이가 잔다"})
+    assert resp.status_code == 200
+    body = resp.json()
+    sim = float(np.dot(stub_vector("the cat sleeps"), stub_vector("고양이가 잔다")))
+    assert body["overall_similarity"] == round(sim, 6)
+    assert body["overall_label"] == judge_similarity(sim)
+    assert [w["en_word"] for w in body["word_similarities"]] == ["the", "cat", "sleeps"]
+    assert {w["ko_word"] for w in body["word_similarities"]} <= {"고양이가", "잔다"}
+
+
+def test_token_budget_applies_to_words(stub_model, monkeypatch):
+    monkeypatch.setattr(model, "EMBED_MAX_TOKENS", 4)
+    _, ((en_words, _), _) = embed_with_words(["one two three four", "하나"])
+    # 특수 토큰 2개를 빼면 단어 2개까지
+    assert en_words == ["one", "two"]
+
+
+def test_uses_inference_pool_when_present(stub_model, monkeypatch):
+    calls = []
+
+    class FakePool:
+        def encode(self, texts, **kwargs):
+            calls.append(kwargs)
+            return stub_model.encode(texts, **kwargs)
+
+    monkeypatch.setattr(model, "get_pool", lambda name: FakePool())
+    embed_with_words(["a b", "c"])
+    assert calls == [{"output_value": None}]
@@ -0,0 +1,137 @@
+"""
+scripts/load_data.py 일괄 적재(LOAD_MODE=copy/executemany/orm) 테스트 (SQLite)
+
+COPY 는 PostgreSQL 전용이므로 COPY 에 넘기는 파일 어댑터(_CopyProgress)만 따로 검사한다.
+
+실행: python -m pytest -q tests
+"""
+
+import csv
+import io
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import load_data  # noqa: E402
+from sqlalchemy import create_engine, inspect, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+ROWS = [
+    ("I like apples.", "나는 사과를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    ("Where is the station?", "역이 어디예요?", "BEGINNER", "TRAVEL", "", "manual"),
+    ('She said, "hi"\nand left.', "그녀는 \"안녕\"이라 말하고 떠났다.", "STARTER", "DAILY", "", "tatoeba"),
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sentences.sqlite3'}")
+    monkeypatch.setattr(load_data, "engine", engine)
+    monkeypatch.setattr(load_data, "Session", sessionmaker(bind=engine))
+    monkeypatch.setattr(load_data, "CSV_PATH", tmp_path / "cleansed_sentences.csv")
+    load_data.create_tables()
+    return engine
+
+
+def write_csv(path, rows, header=load_data.CSV_COLUMNS):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def load(mode, rows, monkeypatch):
+    write_csv(load_data.CSV_PATH, rows)
+    monkeypatch.setattr(load_data, "LOAD_MODE", mode)
+    return load_data.load_csv()
+
+
+def stored(engine) -> list[tuple]:
+    table = load_data.Sentence.__table__
+    with engine.connect() as conn:
+        return [
+            (r.english_text, r.korean_ref, load_data._text(r.difficulty), r.category, r.subcategory, r.source)
+            for r in conn.execute(select(table).order_by(table.c.id))
+        ]
+
+
+@pytest.mark.parametrize("mode", ["auto", "executemany", "orm"])
+def test_load_stores_every_row(db, monkeypatch, mode):
+    assert load(mode, ROWS, monkeypatch) == 3
+    assert stored(db) == ROWS
+
+
+@pytest.mark.parametrize("mode", ["executemany", "orm"])
+def test_reload_replaces_previous_rows(db, monkeypatch, mode):
+    load(mode, ROWS, monkeypatch)
+    assert load(mode, ROWS[1:], monkeypatch) == 2
+    assert stored(db) == ROWS[1:]
+
+
+def test_executemany_writes_content_hash(db, monkeypatch):
+    load("executemany", ROWS, monkeypatch)
+    table = load_data.Sentence.__table__
+    with db.connect() as conn:
+        hashes = [h for (h,) in conn.execute(select(table.c.content_hash).order_by(table.c.id))]
+    # sync 가 같은 행을 새 행으로 보지 않도록 적재 시점의 해시가 sync 의 것과 같아야 한다
+    assert hashes == [load_data.row_hash(r) for r in ROWS]
+
+
+def test_executemany_batches(db, monkeypatch):
+    monkeypatch.setattr(load_data, "BATCH_SIZE", 2)
+    rows = [(f"sentence {i}", f"문장 {i}", "BEGINNER", "DAILY", "", "manual") for i in range(5)]
+    assert load("executemany", rows, monkeypatch) == 5
+    assert stored(db) == rows
+
+
+def test_indexes_are_recreated(db, monkeypatch):
+    load("executemany", ROWS, monkeypatch)
+    assert "ix_sentences_diff_cat" in {ix["name"] for ix in inspect(db).get_indexes("sentences")}
+
+
+def test_copy_mode_requires_postgresql(db, monkeypatch):
+    with pytest.raises(SystemExit):
+        load("copy", ROWS, monkeypatch)
+
+
+def test_wrong_header_aborts_without_changes(db, monkeypatch):
+    load("executemany", ROWS, monkeypatch)
+    write_csv(load_data.CSV_PATH, ROWS, header=("en", "ko", "difficulty", "category", "subcategory", "source"))
+    with pytest.raises(SystemExit):
+        load_data.load_csv()
+    # 삭제까지 같은 트랜잭션이므로 기존 데이터가 남는다
+    assert stored(db) == ROWS
+
+
+def _csv_text(rows) -> str:
+    buf = io.StringIO(newline="")
+    writer = csv.writer(buf)
+    writer.writerow(load_data.CSV_COLUMNS)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("size", [-1, 1, 16])
+def test_copy_adapter_passes_raw_lines_through(size):
+    text = _csv_text(ROWS)
+    stats = Counter()
+    adapter = load_data._CopyProgress(io.StringIO(text, newline=""), 0, stats)
+    chunks = []
+    while data := adapter.read(size):
+        chunks.append(data)
+    # 헤더를 뺀 원문 그대로 (따옴표 안 줄바꿈 포함)
+    assert b"".join(chunks).decode("utf-8") == text.split("\r\n", 1)[1]
+    assert adapter.rows == 3
+    assert stats == Counter({("BEGINNER", "FOOD", "manual"): 1, ("BEGINNER", "TRAVEL", "manual"): 1,
+                             ("STARTER", "DAILY", "tatoeba"): 1})
+
+
+def test_copy_adapter_checks_header():
+    text = "a,b\n" + _csv_text(ROWS).split("\r\n", 1)[1]
+    with pytest.raises(SystemExit):
+        load_data._CopyProgress(io.StringIO(text, newline=""), 0, Counter())
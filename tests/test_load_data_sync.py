@@ -0,0 +1,148 @@
+"""
+scripts/load_data.py 증분 동기화(LOAD_MODE=sync) 테스트 (SQLite)
+
+실행: python -m pytest -q tests
+"""
+
+import csv
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 모듈 import 시 엔진을 만들므로 PostgreSQL 드라이버 없이도 import 되도록 SQLite 로 (테스트마다 교체)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import load_data  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+
+ROWS = [
+    ("I like apples.", "나는 사과를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    ("Where is the station?", "역이 어디예요?", "BEGINNER", "TRAVEL", "", "manual"),
+    ("It is raining today.", "오늘 비가 온다.", "STARTER", "DAILY", "weather", "tatoeba"),
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sentences.sqlite3'}")
+    monkeypatch.setattr(load_data, "engine", engine)
+    monkeypatch.setattr(load_data, "CSV_PATH", tmp_path / "cleansed_sentences.csv")
+    load_data.create_tables()
+    return engine
+
+
+def sync(rows):
+    with open(load_data.CSV_PATH, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(load_data.CSV_COLUMNS)
+        writer.writerows(rows)
+    return load_data._sync()
+
+
+def sentences(engine) -> dict[str, tuple]:
+    """english_text → (id, korean_ref)"""
+    table = load_data.Sentence.__table__
+    with engine.connect() as conn:
+        return {en: (i, ko) for i, en, ko in conn.execute(
+            select(table.c.id, table.c.english_text, table.c.korean_ref)
+        )}
+
+
+def stats(engine) -> int:
+    table = load_data.SentenceStat.__table__
+    with engine.connect() as conn:
+        return sum(n for (n,) in conn.execute(select(table.c.count)))
+
+
+def test_insert_into_empty_table(db):
+    assert sync(ROWS) == 3
+    got = sentences(db)
+    assert {en: ko for en, (_, ko) in got.items()} == {r[0]: r[1] for r in ROWS}
+    assert stats(db) == 3
+
+
+def test_unchanged_rows_keep_ids(db):
+    sync(ROWS)
+    before = sentences(db)
+    sync(list(reversed(ROWS)))
+    assert sentences(db) == before
+
+
+def test_changed_translation_updates_in_place(db):
+    sync(ROWS)
+    before = sentences(db)
+    changed = [ROWS[0], ("Where is the station?", "기차역이 어디에 있나요?", *ROWS[1][2:]), ROWS[2]]
+    sync(changed)
+    after = sentences(db)
+    # 같은 문장(row_key)이므로 id 는 그대로, 내용만 바뀐다
+    assert after["Where is the station?"] == (before["Where is the station?"][0], "기차역이 어디에 있나요?")
+    assert after["I like apples."] == before["I like apples."]
+    assert len(after) == 3
+
+
+def test_case_only_change_counts_as_same_sentence(db):
+    sync(ROWS)
+    before = sentences(db)
+    sync([("i like apples.", *ROWS[0][1:]), *ROWS[1:]])
+    after = sentences(db)
+    assert after["i like apples."][0] == before["I like apples."][0]
+    assert "I like apples." not in after
+
+
+def test_removed_rows_are_deleted(db):
+    sync(ROWS)
+    before = sentences(db)
+    sync(ROWS[1:])
+    after = sentences(db)
+    assert "I like apples." not in after
+    assert after == {en: v for en, v in before.items() if en != "I like apples."}
+    assert stats(db) == 2
+
+
+def test_new_rows_get_new_ids(db):
+    sync(ROWS[:2])
+    before = sentences(db)
+    sync(ROWS)
+    after = sentences(db)
+    assert {en: after[en] for en in before} == before
+    assert after["It is raining today."][0] not in {i for i, _ in before.values()}
+
+
+def test_duplicate_hashes_are_cleaned_up(db):
+    # 이전 방식(executemany 두 번 등)으로 같은 행이 두 번 들어간 상태
+    table = load_data.Sentence.__table__
+    with db.begin() as conn:
+        conn.execute(table.insert(), [dict(zip(load_data.CSV_COLUMNS, r)) for r in ROWS + ROWS[:1]])
+    sync(ROWS)
+    got = sentences(db)
+    with db.connect() as conn:
+        assert len(conn.execute(select(table.c.id)).all()) == 3
+    # 먼저 들어간 행(작은 id)이 남는다
+    assert got["I like apples."][0] == 1
+
+
+def test_duplicate_of_changed_row_is_not_left_behind(db):
+    table = load_data.Sentence.__table__
+    with db.begin() as conn:
+        conn.execute(table.insert(), [dict(zip(load_data.CSV_COLUMNS, r)) for r in ROWS + ROWS[:1]])
+    sync([("I like apples.", "저는 사과가 좋아요.", *ROWS[0][2:]), *ROWS[1:]])
+    with db.connect() as conn:
+        rows = conn.execute(
+            select(table.c.id, table.c.korean_ref).where(table.c.english_text == "I like apples.")
+        ).all()
+    # 중복 두 행 중 작은 id 하나만 새 내용으로 남는다
+    assert rows == [(1, "저는 사과가 좋아요.")]
+
+
+def test_backfills_missing_hashes_without_changing_ids(db):
+    # COPY/ORM 적재분은 content_hash 가 비어 있다
+    table = load_data.Sentence.__table__
+    with db.begin() as conn:
+        conn.execute(table.insert(), [dict(zip(load_data.CSV_COLUMNS, r)) for r in ROWS])
+    before = sentences(db)
+    sync(ROWS)
+    assert sentences(db) == before
+    with db.connect() as conn:
+        assert all(h for (h,) in conn.execute(select(table.c.content_hash)))
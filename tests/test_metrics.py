@@ -0,0 +1,72 @@
+"""
+app/metrics.py 경량 메트릭과 /metrics 테스트
+
+실행: python -m pytest -q tests
+"""
+
+import re
+import threading
+
+import pytest
+
+from app.metrics import Counter, Gauge, Histogram, gauge_lines
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("t_latency", "test", buckets=(0.1, 1.0), labelnames=("stage",))
+    h.observe(0.05, "a")
+    h.observe_many([0.5, 0.1, 3.0], "a")
+    lines = h.render()
+    assert lines[:2] == ["# HELP t_latency test", "# TYPE t_latency histogram"]
+    assert 't_latency_bucket{stage="a",le="0.1"} 2' in lines
+    assert 't_latency_bucket{stage="a",le="1"} 3' in lines
+    assert 't_latency_bucket{stage="a",le="+Inf"} 4' in lines
+    assert 't_latency_count{stage="a"} 4' in lines
+    (total,) = [line for line in lines if line.startswith("t_latency_sum")]
+    assert float(total.split()[-1]) == pytest.approx(3.65)
+
+
+def test_histogram_is_thread_safe():
+    h = Histogram("t_threads", "test")
+
+    def worker():
+        for _ in range(2000):
+            h.observe(0.001)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert "t_threads_count 16000" in h.render()
+
+
+def test_counter_gauge_and_label_escaping():
+    c = Counter("t_total", "test", labelnames=("label",))
+    c.inc('a "quoted"\nvalue', amount=2)
+    c.inc('a "quoted"\nvalue')
+    assert 't_total{label="a \\"quoted\\"\\nvalue"} 3' in c.render()
+    g = Gauge("t_gauge", "test", labelnames=("model",))
+    g.set("m", value=1.5)
+    g.set("m", value=2.25)
+    assert 't_gauge{model="m"} 2.25' in g.render()
+    assert gauge_lines("t_g", "test", {"": 7})[-1] == "t_g 7"
+    assert gauge_lines("t_g", "test", {"x": 1}, "kind")[-1] == 't_g{kind="x"} 1'
+
+
+def test_metrics_endpoint_records_routes_and_stages(client):
+    client.post("/judge", json={"en": "metrics test", "ko": "지표 테스트"})
+    text = client.get("/metrics").text
+    assert re.search(r'tmi_request_duration_seconds_count\{route="/judge",method="POST",status="200"\} [1-9]', text)
+    for stage in ("threadpool_wait", "similarity"):
+        assert f'tmi_stage_duration_seconds_count{{stage="{stage}"}}' in text
+    assert "tmi_judge_labels_total" in text
+    assert "tmi_embed_cache_entries" in text
+
+
+def test_unmatched_routes_share_one_series(client):
+    client.get("/no-such-route-1")
+    client.get("/no-such-route-2")
+    text = client.get("/metrics").text
+    assert "no-such-route" not in text
+    assert 'route="unmatched",method="GET",status="404"' in text
@@ -0,0 +1,144 @@
+"""
+app/model.py MicroBatcher 동적 배칭 테스트 (스텁 인코더)
+
+실행: python -m pytest -q tests
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.model import InferenceOverloaded, MicroBatcher
+from conftest import stub_encode, stub_vector
+
+
+class GatedEncoder:
+    """gate 가 열릴 때까지 encode 를 막아 두고, 호출마다 입력 텍스트를 기록"""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.calls: list[list[str]] = []
+        self.started = threading.Event()
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        self.started.set()
+        self.gate.wait(5)
+        return stub_encode(texts)
+
+
+def submit_async(batcher, texts, lengths=None):
+    box = {}
+
+    def run():
+        try:
+            box["result"] = batcher.submit(texts, lengths)
+        except Exception as e:
+            box["error"] = e
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t, box
+
+
+def wait_queue_depth(batcher, depth, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while batcher.stats()["queue_depth"] < depth:
+        assert time.monotonic() < deadline, "requests were not queued"
+        time.sleep(0.005)
+
+
+def test_single_request_gets_its_own_rows():
+    batcher = MicroBatcher(stub_encode, max_batch_size=8, max_wait_ms=1)
+    out = batcher.submit(["a", "b", "c"])
+    assert np.allclose(out, stub_encode(["a", "b", "c"]))
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    enc = GatedEncoder()
+    batcher = MicroBatcher(enc, max_batch_size=64, max_wait_ms=200)
+    # 첫 요청이 encode 를 붙잡고 있는 동안 나머지가 대기열에 쌓인다
+    first = submit_async(batcher, ["first"])
+    assert enc.started.wait(2)
+    others = [submit_async(batcher, [f"t{i}", f"u{i}"]) for i in range(5)]
+    wait_queue_depth(batcher, 5)
+    enc.gate.set()
+    for t, _ in [first, *others]:
+        t.join(5)
+
+    assert enc.calls[0] == ["first"]
+    # 나머지 5건(10문장)은 한 번에
+    assert len(enc.calls) == 2 and sorted(enc.calls[1]) == sorted(f"{p}{i}" for i in range(5) for p in "tu")
+    for i, (_, box) in enumerate(others):
+        assert np.allclose(box["result"], np.stack([stub_vector(f"t{i}"), stub_vector(f"u{i}")]))
+    stats = batcher.stats()
+    assert stats["batches"] == 2 and stats["requests"] == 6 and stats["texts"] == 11
+    assert stats["max_batch_size"] == 10
+
+
+def test_batch_respects_max_batch_size():
+    enc = GatedEncoder()
+    batcher = MicroBatcher(enc, max_batch_size=4, max_wait_ms=200)
+    first = submit_async(batcher, ["first"])
+    assert enc.started.wait(2)
+    others = [submit_async(batcher, [f"t{i}", f"u{i}"]) for i in range(4)]
+    wait_queue_depth(batcher, 4)
+    enc.gate.set()
+    for t, _ in [first, *others]:
+        t.join(5)
+    assert [len(c) for c in enc.calls] == [1, 4, 4]
+
+
+def test_encode_error_reaches_every_request_in_the_batch():
+    enc = GatedEncoder()
+
+    def failing(texts):
+        enc(texts)
+        if len(enc.calls) > 1:
+            raise RuntimeError("boom")
+        return stub_encode(texts)
+
+    batcher = MicroBatcher(failing, max_batch_size=64, max_wait_ms=200)
+    first = submit_async(batcher, ["first"])
+    assert enc.started.wait(2)
+    others = [submit_async(batcher, [f"t{i}"]) for i in range(3)]
+    wait_queue_depth(batcher, 3)
+    enc.gate.set()
+    for t, _ in [first, *others]:
+        t.join(5)
+    assert "result" in first[1]
+    assert all(isinstance(box.get("error"), RuntimeError) for _, box in others)
+
+
+def test_full_queue_raises_overloaded():
+    enc = GatedEncoder()
+    batcher = MicroBatcher(enc, max_batch_size=1, max_wait_ms=0, max_queue=1, queue_timeout_ms=20)
+    first = submit_async(batcher, ["first"])
+    assert enc.started.wait(2)
+    queued = submit_async(batcher, ["queued"])
+    wait_queue_depth(batcher, 1)
+    with pytest.raises(InferenceOverloaded):
+        batcher.submit(["rejected"])
+    enc.gate.set()
+    for t, _ in (first, queued):
+        t.join(5)
+    assert "result" in queued[1]
+    assert ["rejected"] not in enc.calls
+
+
+def test_concurrency_runs_batches_in_parallel():
+    enc = GatedEncoder()
+    batcher = MicroBatcher(enc, max_batch_size=1, max_wait_ms=0, concurrency=2)
+    a = submit_async(batcher, ["a"])
+    b = submit_async(batcher, ["b"])
+    deadline = time.monotonic() + 2
+    # 첫 배치가 막혀 있어도 두 번째 스레드가 다음 배치를 처리한다
+    while len(enc.calls) < 2:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    enc.gate.set()
+    for t, _ in (a, b):
+        t.join(5)
+    assert sorted(c[0] for c in enc.calls) == ["a", "b"]
@@ -0,0 +1,100 @@
+"""
+scripts/near_dedup.py 완전/유사 중복 제거 테스트 (MinHash/LSH)
+
+실행: python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import near_dedup  # noqa: E402
+from near_dedup import Deduplicator  # noqa: E402
+
+TEXTS = [
+    "I don't know what you're talking about.",
+    "Where is the nearest subway station?",
+    "I do not know what you are talking about!",   # 0번의 축약형/문장부호 변형
+    "where is the nearest subway station?",        # 1번의 완전 중복 (대소문자)
+    "The weather is really nice today.",
+    "  Where is the nearest subway station?  ",    # 1번의 완전 중복 (앞뒤 공백)
+    "I'd like a cup of coffee, please.",
+    "I would like a cup of coffee please",         # 6번의 변형
+    "She has been studying English for ten years.",
+]
+
+
+def dedup(texts, mode="near", workers=1, **kwargs):
+    d = Deduplicator(mode, workers=workers, **kwargs)
+    for t in texts:
+        d.add(t)
+    return d.finish()
+
+
+def test_normalize():
+    assert near_dedup.normalize("I DON'T think you’re right, I'm sure!") == "i do not think you are right i am sure"
+
+
+def test_exact_mode_keeps_first_seen():
+    keep, stats = dedup(TEXTS, mode="exact")
+    assert keep.tolist() == [True, True, True, False, True, False, True, True, True]
+    assert stats == {"exact_dups": 2, "near_dups": 0, "cluster_sizes": {}}
+
+
+def test_near_mode_merges_variants():
+    keep, stats = dedup(TEXTS)
+    assert [t for t, k in zip(TEXTS, keep) if k] == [TEXTS[0], TEXTS[1], TEXTS[4], TEXTS[6], TEXTS[8]]
+    assert stats["exact_dups"] == 2 and stats["near_dups"] == 2
+    # 클러스터: {0, 2}, {1, 3, 5}, {6, 7}
+    assert stats["cluster_sizes"] == {2: 2, 3: 1}
+
+
+def test_distinct_sentences_are_kept():
+    texts = [
+        "I like apples.", "I like bananas.", "Where is the station?", "Where is the library?",
+        "It is raining today.", "It was sunny yesterday.", "Ok.", "No.",
+    ]
+    keep, stats = dedup(texts)
+    assert keep.all() and stats["near_dups"] == 0
+
+
+def test_threshold_one_only_merges_identical_normal_forms():
+    keep, _ = dedup(["I don't know.", "I do not know", "I don't know it."], threshold=1.0)
+    assert keep.tolist() == [True, False, True]
+
+
+def test_short_texts():
+    keep, _ = dedup(["Hi", "hi!", "Ok", "", "Yes"])
+    assert keep.tolist() == [True, False, True, True, True]
+
+
+def test_empty_input():
+    keep, stats = dedup([])
+    assert len(keep) == 0 and stats["exact_dups"] == 0
+
+
+def test_signatures_do_not_depend_on_chunking():
+    sig, bands = near_dedup.signatures(TEXTS)
+    sig_a, bands_a = near_dedup.signatures(TEXTS[:4])
+    sig_b, bands_b = near_dedup.signatures(TEXTS[4:])
+    assert np.array_equal(sig, np.concatenate([sig_a, sig_b]))
+    assert np.array_equal(bands, np.concatenate([bands_a, bands_b]))
+
+
+def test_union_is_transitive():
+    labels = near_dedup._union_min(np.arange(6), np.array([5, 3, 4]), np.array([3, 1, 5]))
+    # 1-3-5-4 사슬은 모두 1로, 0/2 는 그대로
+    assert labels.tolist() == [0, 1, 2, 1, 1, 1]
+
+
+@pytest.mark.parametrize("chunk_rows", [3, 1000])
+def test_parallel_matches_sequential(monkeypatch, chunk_rows):
+    monkeypatch.setattr(near_dedup, "CHUNK_ROWS", chunk_rows)
+    texts = TEXTS * 3 + [f"Sentence number {i} is unique enough." for i in range(20)]
+    sequential = dedup(texts, workers=1)
+    parallel = dedup(texts, workers=2)
+    assert np.array_equal(sequential[0], parallel[0])
+    assert sequential[1] == parallel[1]
@@ -0,0 +1,74 @@
+"""
+app/model.py 백엔드 선택(torch / onnx / tokenizer) 테스트
+
+sentence_transformers 는 생성 인자만 기록하는 가짜 모듈로 바꿔 끼우므로 onnxruntime 없이 돈다.
+
+실행: python -m pytest -q tests
+"""
+
+import sys
+import types
+
+import pytest
+
+from app import model
+from app.model import MODEL_NAME, _load_model, disk_cache_model_key, onnx_file_name, onnx_model_dir
+
+
+class FakeSentenceTransformer:
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.kwargs = kwargs
+
+
+@pytest.fixture
+def fake_st(monkeypatch):
+    module = types.ModuleType("sentence_transformers")
+    module.SentenceTransformer = FakeSentenceTransformer
+    monkeypatch.setitem(sys.modules, "sentence_transformers", module)
+
+
+def test_onnx_file_name_follows_quant_config():
+    assert onnx_file_name("avx512_vnni") == "onnx/model_qint8_avx512_vnni.onnx"
+    assert onnx_model_dir(MODEL_NAME) == model.ONNX_MODEL_DIR
+    assert onnx_model_dir("org/small-model") == model.ONNX_ROOT / "small-model"
+
+
+def test_onnx_backend_loads_quantized_file(fake_st, tmp_path, monkeypatch):
+    monkeypatch.setattr(model, "ONNX_MODEL_DIR", tmp_path)
+    (tmp_path / "onnx").mkdir()
+    (tmp_path / onnx_file_name()).touch()
+    loaded = _load_model("onnx", MODEL_NAME)
+    assert loaded.name == str(tmp_path)
+    assert loaded.kwargs == {"backend": "onnx", "model_kwargs": {"file_name": onnx_file_name()}}
+
+
+def test_missing_onnx_export_fails_with_hint(fake_st, tmp_path, monkeypatch):
+    monkeypatch.setattr(model, "ONNX_MODEL_DIR", tmp_path)
+    with pytest.raises(RuntimeError, match="export_onnx.py"):
+        _load_model("onnx", MODEL_NAME)
+
+
+def test_torch_and_unknown_backends(fake_st):
+    assert _load_model("torch", MODEL_NAME).kwargs == {}
+    with pytest.raises(ValueError, match="EMBED_BACKEND"):
+        _load_model("tensorrt", MODEL_NAME)
+
+
+@pytest.mark.parametrize("backend, replicas, expected", [
+    ("torch", 0, "torch"), ("torch", 4, "torch"), ("onnx", 0, "onnx"), ("onnx", 4, "tokenizer"),
+])
+def test_parent_loads_only_tokenizer_for_unshareable_pool(monkeypatch, backend, replicas, expected):
+    monkeypatch.setattr(model, "EMBED_BACKEND", backend)
+    monkeypatch.setattr(model, "INFERENCE_REPLICAS", replicas)
+    assert model._parent_backend() == expected
+
+
+def test_disk_cache_key_separates_backends(stub_model, monkeypatch):
+    keys = set()
+    for backend, quant in (("torch", "avx2"), ("onnx", "avx2"), ("onnx", "avx512_vnni")):
+        monkeypatch.setattr(model, "EMBED_BACKEND", backend)
+        monkeypatch.setattr(model, "ONNX_QUANT_CONFIG", quant)
+        keys.add(disk_cache_model_key(MODEL_NAME))
+    assert len(keys) == 3
+    assert f"{MODEL_NAME}|onnx:avx512_vnni|max_tokens=128" in keys
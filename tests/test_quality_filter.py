@@ -0,0 +1,121 @@
+"""
+scripts/quality_filter.py 번역 품질 필터 테스트: 배치 채점, 체크포인트 재개, 스트림 분할 (스텁 인코더)
+
+실행: python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import quality_filter  # noqa: E402
+from conftest import stub_vector  # noqa: E402
+
+PAIRS = [(f"sentence {'x' * (i % 7)} {i}", f"문장 {i}") for i in range(23)]
+BATCH = 4  # 23쌍 → 6배치
+
+
+class CountingEncoder:
+    """스텁 벡터를 돌려주며 호출마다 입력을 기록. fail_after 번째 호출부터 실패 (중단 흉내)"""
+
+    def __init__(self, fail_after=None):
+        self.calls: list[list[str]] = []
+        self.fail_after = fail_after
+
+    def __call__(self, texts):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise RuntimeError("replica died")
+        self.calls.append(list(texts))
+        return np.stack([stub_vector(t) for t in texts])
+
+
+@pytest.fixture
+def use_encoder(stub_model, monkeypatch):
+    def install(enc):
+        monkeypatch.setattr(quality_filter, "_encoder", lambda: (enc, 1))
+        return enc
+
+    return install
+
+
+def expected(pairs) -> np.ndarray:
+    return np.array([stub_vector(en) @ stub_vector(ko) for en, ko in pairs], dtype=np.float32)
+
+
+def test_scores_are_in_input_order(use_encoder, tmp_path):
+    enc = use_encoder(CountingEncoder())
+    scores = quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+    assert scores.dtype == np.float32
+    assert np.allclose(scores, expected(PAIRS), atol=1e-6)
+    assert len(enc.calls) == 6
+
+
+def test_batches_are_sorted_by_length(use_encoder, tmp_path):
+    enc = use_encoder(CountingEncoder())
+    quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+    lengths = {en: len(en) + len(ko) for en, ko in PAIRS}
+    # 배치 하나는 (영어 n개 + 한국어 n개), 배치 순서대로 길이가 줄지 않는다
+    firsts = [[lengths[t] for t in call[:len(call) // 2]] for call in enc.calls]
+    flat = [x for batch in firsts for x in batch]
+    assert flat == sorted(flat)
+
+
+def test_resume_after_interruption(use_encoder, tmp_path):
+    use_encoder(CountingEncoder(fail_after=2))
+    with pytest.raises(RuntimeError):
+        quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+
+    enc = use_encoder(CountingEncoder())
+    scores = quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+    # 끝난 2배치는 다시 인코딩하지 않는다
+    assert len(enc.calls) == 4
+    assert np.allclose(scores, expected(PAIRS), atol=1e-6)
+
+
+def test_finished_run_is_reused_without_encoding(use_encoder, tmp_path):
+    use_encoder(CountingEncoder())
+    first = quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+    enc = use_encoder(CountingEncoder(fail_after=0))
+    assert np.array_equal(quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path), first)
+    assert enc.calls == []
+    assert len(list(tmp_path.iterdir())) == 1 and list(tmp_path.glob("*/meta.json"))
+
+
+@pytest.mark.parametrize("change", [
+    lambda pairs, bs: (pairs[:-1] + [(pairs[-1][0], "다른 번역")], bs),
+    lambda pairs, bs: (pairs, bs + 1),
+])
+def test_changed_input_uses_new_checkpoint(use_encoder, tmp_path, change):
+    use_encoder(CountingEncoder())
+    quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path)
+    pairs, bs = change(list(PAIRS), BATCH)
+    enc = use_encoder(CountingEncoder())
+    scores = quality_filter.score_pairs(pairs, batch_size=bs, checkpoint_dir=tmp_path)
+    assert enc.calls and np.allclose(scores, expected(pairs), atol=1e-6)
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_model_key_is_part_of_fingerprint(stub_model, monkeypatch):
+    before = quality_filter.fingerprint(PAIRS)
+    monkeypatch.setattr(quality_filter, "disk_cache_model_key", lambda name: f"{name}|onnx:other")
+    assert quality_filter.fingerprint(PAIRS) != before
+
+
+def test_stream_matches_single_call(use_encoder, tmp_path):
+    use_encoder(CountingEncoder())
+    whole = quality_filter.score_pairs(PAIRS, batch_size=BATCH, checkpoint_dir=tmp_path / "whole")
+    streamed = quality_filter.score_pair_stream(iter(PAIRS), chunk_pairs=10, batch_size=BATCH,
+                                                checkpoint_dir=tmp_path / "stream")
+    assert np.allclose(streamed, whole, atol=1e-6)
+    # 10 + 10 + 3 쌍, 청크마다 체크포인트
+    assert len(list((tmp_path / "stream").iterdir())) == 3
+
+
+def test_empty_input(use_encoder, tmp_path):
+    enc = use_encoder(CountingEncoder())
+    assert len(quality_filter.score_pairs([], checkpoint_dir=tmp_path)) == 0
+    assert len(quality_filter.score_pair_stream(iter([]), checkpoint_dir=tmp_path)) == 0
+    assert enc.calls == []
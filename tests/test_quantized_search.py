@@ -0,0 +1,142 @@
+"""
+app/search.py int8 / binary 양자화 검색(+ 원본 벡터 재정렬) 테스트 (스텁 벡터)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+import pytest
+
+from app import search
+from app.ref_store import RefEmbeddingStore
+from app.search import QuantizedIndex, SearchIndex, quantize_binary, quantize_int8
+from conftest import stub_vector, write_ref_store
+
+N = 1500
+DIFFICULTIES = ["BEGINNER", "STARTER", "CHALLENGE"]
+CATEGORIES = ["FOOD", "TRAVEL", "DAILY", "SCHOOL"]
+
+
+@pytest.fixture(scope="module")
+def store_dir(tmp_path_factory):
+    rows = [(i + 1, f"english sentence {i}", f"한국어 문장 {i}",
+             DIFFICULTIES[i % 3], CATEGORIES[i % 4]) for i in range(N)]
+    directory = write_ref_store(tmp_path_factory.mktemp("ref"), rows, dtype="float16")
+    store = RefEmbeddingStore(directory)
+    for lang in ("en", "ko"):
+        QuantizedIndex.build(store.vectors[lang], directory, lang, block_rows=256)
+    return directory
+
+
+@pytest.fixture
+def index(store_dir):
+    return SearchIndex(RefEmbeddingStore(store_dir))
+
+
+def test_quantize_int8_reconstructs_vectors():
+    vectors = np.stack([stub_vector(f"v{i}") for i in range(50)])
+    codes, scale = quantize_int8(vectors)
+    assert codes.dtype == np.int8 and scale.dtype == np.float32
+    assert (np.abs(codes).max(axis=1) == 127).all()
+    assert np.allclose(codes * scale[:, None], vectors, atol=scale.max() / 2 + 1e-7)
+    # 0 벡터도 나눗셈 없이
+    codes, scale = quantize_int8(np.zeros((1, 16)))
+    assert not codes.any() and scale[0] == 1.0
+
+
+def test_quantize_binary_keeps_sign_bits():
+    v = np.array([[0.5, -0.1, 0.0, 2.0, -3.0, 1e-3, -1e-3, 0.2, 0.7]])
+    assert quantize_binary(v).tolist() == [[0b10010101, 0b10000000]]
+
+
+def test_build_in_blocks_matches_whole_matrix(index):
+    vectors = np.asarray(index.store.vectors["en"], dtype=np.float32)
+    q8, scale = index.quantized["en"].int8
+    want_codes, want_scale = quantize_int8(vectors)
+    assert np.array_equal(q8, want_codes) and np.array_equal(scale, want_scale)
+    assert np.array_equal(index.quantized["en"].binary, quantize_binary(vectors))
+
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_stored_vector_finds_itself(index, mode):
+    assert mode in index.modes("en") and mode in index.modes("ko")
+    for i in (0, 17, 733, N - 1):
+        for lang, text in (("en", f"english sentence {i}"), ("ko", f"한국어 문장 {i}")):
+            ids, scores = index.search(stub_vector(text), 1, lang=lang, mode=mode)
+            assert ids.tolist() == [i + 1]
+            # 재정렬 점수는 원본 벡터 기준
+            assert scores[0] == pytest.approx(1.0, abs=2e-3)
+
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_rerank_over_every_row_equals_exact(index, mode):
+    q = stub_vector("학습자 답안")
+    exact = index.search(q, 10, mode="exact")
+    got = index.search(q, 10, mode=mode, rerank=N)
+    assert got[0].tolist() == exact[0].tolist()
+    assert np.allclose(got[1], exact[1])
+
+
+def test_int8_recall_with_default_rerank(index):
+    hits = 0
+    for t in range(20):
+        q = stub_vector(f"query {t}")
+        exact = set(index.search(q, 10, mode="exact")[0].tolist())
+        hits += len(exact & set(index.search(q, 10, mode="int8")[0].tolist()))
+    assert hits / 200 >= 0.9
+
+
+@pytest.mark.parametrize("mode", ["int8", "binary"])
+def test_filters_apply_before_rerank(index, mode):
+    q = stub_vector("query")
+    exact = index.search(q, 15, difficulty="STARTER", category="TRAVEL", mode="exact")[0]
+    got = index.search(q, 15, difficulty="STARTER", category="TRAVEL", mode=mode, rerank=N)[0]
+    assert got.tolist() == exact.tolist()
+    assert all((i - 1) % 3 == 1 and (i - 1) % 4 == 1 for i in got.tolist())
+    assert len(index.search(q, 5, category="SPORTS", mode=mode)[0]) == 0
+
+
+@pytest.mark.parametrize("mode, fn", [("int8", "quantize_int8"), ("binary", "quantize_binary")])
+def test_query_is_quantized_once_per_search(index, monkeypatch, mode, fn):
+    monkeypatch.setattr(search, "QUANT_BLOCK_ROWS", 100)
+    calls = []
+    original = getattr(search, fn)
+
+    def counting(vectors):
+        calls.append(len(vectors))
+        return original(vectors)
+
+    monkeypatch.setattr(search, fn, counting)
+    index.search(stub_vector("query"), 5, mode=mode)
+    # 블록이 15개여도 질의 양자화는 한 번
+    assert calls == [1]
+
+
+def test_stale_codes_are_ignored(tmp_path):
+    rows = [(i + 1, f"s{i}", f"문장 {i}", "BEGINNER", "DAILY") for i in range(50)]
+    directory = write_ref_store(tmp_path, rows)
+    store = RefEmbeddingStore(directory)
+    # 행 수가 다른 이전 빌드의 코드
+    QuantizedIndex.build(np.asarray(store.vectors["en"][:30]), directory, "en")
+    index = SearchIndex(store)
+    assert index.quantized["en"] is None and index.modes("en") == ["exact"]
+    with pytest.raises(ValueError, match="int8"):
+        index.search(stub_vector("s1"), 1, mode="int8")
+
+
+def test_default_mode_falls_back_to_exact(index, monkeypatch):
+    monkeypatch.setattr(search, "SEARCH_MODE", "binary")
+    assert index.resolve_mode(None) == "binary"
+    monkeypatch.setattr(search, "SEARCH_MODE", "ivf")
+    assert index.resolve_mode(None) == "exact"
+    with pytest.raises(ValueError):
+        index.resolve_mode("ivf")
+
+
+def test_search_endpoint_with_quantized_mode(client, index, monkeypatch):
+    monkeypatch.setattr(search, "_index", index)
+    resp = client.post("/search", json={"query": "english sentence 9", "k": 3, "mode": "int8"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "int8" and body["results"][0]["sentence_id"] == 10
+    assert client.post("/search", json={"query": "x", "mode": "ivf"}).status_code == 400
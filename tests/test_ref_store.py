@@ -0,0 +1,79 @@
+"""
+app/ref_store.py 참조 임베딩 저장소와 /judge/ref 테스트 (스텁 벡터)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+import pytest
+
+from app import ref_store
+from app.model import MODEL_NAME
+from app.ref_store import RefEmbeddingStore, load_ref_store
+from app.service import judge_similarity
+from conftest import stub_vector, write_ref_store
+
+ROWS = [
+    (3, "I like apples.", "나는 사과를 좋아한다.", "BEGINNER", "FOOD"),
+    (10, "Where is the station?", "역이 어디예요?", "BEGINNER", "TRAVEL"),
+    (42, "It is raining today.", "오늘 비가 온다.", "STARTER", "DAILY"),
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # 다른 테스트에 전역 저장소가 남지 않도록
+    monkeypatch.setattr(ref_store, "_store", None)
+    return load_ref_store(MODEL_NAME, write_ref_store(tmp_path / "ref", ROWS))
+
+
+def test_get_by_sentence_id(store):
+    assert len(store) == 3
+    v = store.get(10, "ko")
+    assert v.dtype == np.float32
+    assert np.allclose(v, stub_vector("역이 어디예요?"), atol=1e-3)
+    # ids 가 연속이 아니어도 이진 탐색으로 찾는다
+    assert store.row_of(42) == 2
+    assert store.get(4, "en") is None
+    assert store.get(100, "en") is None
+
+
+def test_filter_codes(store):
+    assert store.code_of("difficulty", "STARTER") == store.meta["difficulty"].index("STARTER")
+    assert store.code_of("category", "SPORTS") is None
+
+
+def test_vectors_are_memory_mapped(store):
+    assert isinstance(store.vectors["en"], np.memmap)
+
+
+def test_store_built_for_another_model_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(ref_store, "_store", None)
+    directory = write_ref_store(tmp_path / "ref", ROWS, model_name="other-model")
+    assert load_ref_store(MODEL_NAME, directory) is None
+    assert load_ref_store(MODEL_NAME, tmp_path / "missing") is None
+
+
+def test_judge_ref_encodes_only_the_answer(client, store, stub_model, monkeypatch):
+    from app import model
+
+    monkeypatch.setattr(model, "EMBED_CACHE_ENABLED", False)
+    resp = client.post("/judge/ref", json={"sentence_id": 42, "answer": "비가 와요", "against": "ko"})
+    assert resp.status_code == 200
+    sim = float(np.dot(store.get(42, "ko"), stub_vector("비가 와요")))
+    assert resp.json() == {"similarity": round(sim, 6), "label": judge_similarity(sim)}
+    assert stub_model.calls[-1] == ["비가 와요"]
+
+
+def test_judge_ref_errors(client, store, monkeypatch):
+    resp = client.post("/judge/ref", json={"sentence_id": 7, "answer": "x"})
+    assert resp.status_code == 404
+    monkeypatch.setattr(ref_store, "_store", None)
+    assert client.post("/judge/ref", json={"sentence_id": 42, "answer": "x"}).status_code == 503
+
+
+def test_float32_store_keeps_dtype(tmp_path):
+    directory = write_ref_store(tmp_path / "ref", ROWS, dtype="float32")
+    store = RefEmbeddingStore(directory)
+    assert store.dim == store.vectors["en"].shape[1]
+    assert store.vectors["en"].dtype == np.float32
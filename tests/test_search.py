@@ -0,0 +1,136 @@
+"""
+app/search.py exact / IVF 검색과 /search 테스트 (스텁 벡터)
+
+실행: python -m pytest -q tests
+"""
+
+import numpy as np
+import pytest
+
+from app import search
+from app.ref_store import RefEmbeddingStore
+from app.search import IVFIndex, SearchIndex, train_ivf
+from conftest import stub_vector, write_ref_store
+
+N = 2000
+DIFFICULTIES = ["BEGINNER", "STARTER", "CHALLENGE"]
+CATEGORIES = ["FOOD", "TRAVEL", "DAILY", "SCHOOL"]
+
+
+@pytest.fixture(scope="module")
+def store_dir(tmp_path_factory):
+    rows = [(i * 2 + 1, f"english sentence {i}", f"한국어 문장 {i}",
+             DIFFICULTIES[i % 3], CATEGORIES[i % 4]) for i in range(N)]
+    return write_ref_store(tmp_path_factory.mktemp("ref"), rows, dtype="float32")
+
+
+@pytest.fixture
+def store(store_dir):
+    return RefEmbeddingStore(store_dir)
+
+
+def brute_force(store, q, k, lang="en", mask=None):
+    scores = np.asarray(store.vectors[lang], dtype=np.float32) @ q
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    top = np.argsort(-scores, kind="stable")[:k]
+    top = top[np.isfinite(scores[top])]
+    return store.ids[top], scores[top]
+
+
+def test_exact_matches_brute_force(store, monkeypatch):
+    # 블록 경계를 여러 번 넘도록
+    monkeypatch.setattr(search, "SEARCH_BLOCK_ROWS", 300)
+    index = SearchIndex(store)
+    for lang, text in (("en", "english sentence 17"), ("ko", "학습자 답안")):
+        q = stub_vector(text)
+        ids, scores = index.search(q, 10, lang=lang, mode="exact")
+        want_ids, want_scores = brute_force(store, q, 10, lang)
+        assert ids.tolist() == want_ids.tolist()
+        assert np.allclose(scores, want_scores, atol=1e-5)
+    # 자기 자신이 1위
+    assert index.search(stub_vector("english sentence 17"), 1, mode="exact")[0].tolist() == [35]
+
+
+def test_filters_restrict_results(store):
+    index = SearchIndex(store)
+    q = stub_vector("query")
+    ids, _ = index.search(q, 20, difficulty="STARTER", category="TRAVEL", mode="exact")
+    rows = [store.row_of(i) for i in ids.tolist()]
+    assert rows and all(r % 3 == 1 and r % 4 == 1 for r in rows)
+    mask = (store.codes["difficulty"] == store.code_of("difficulty", "STARTER")) \
+        & (store.codes["category"] == store.code_of("category", "TRAVEL"))
+    assert ids.tolist() == brute_force(store, q, 20, mask=mask)[0].tolist()
+    # 없는 값이면 빈 결과
+    assert len(index.search(q, 5, category="SPORTS", mode="exact")[0]) == 0
+
+
+def test_ivf_index_covers_every_row():
+    vectors = np.stack([stub_vector(f"v{i}") for i in range(500)])
+    centroids, offsets, list_rows = train_ivf(vectors, nlist=8, n_iter=5)
+    assert centroids.shape == (8, vectors.shape[1])
+    assert offsets[0] == 0 and offsets[-1] == 500
+    assert sorted(list_rows.tolist()) == list(range(500))
+    # 각 행은 가장 가까운 중심점의 목록에 들어 있다
+    nearest = np.argmax(vectors @ centroids.T, axis=1)
+    for c in range(8):
+        assert (nearest[list_rows[offsets[c]:offsets[c + 1]]] == c).all()
+
+
+def test_ivf_with_all_lists_equals_exact(store_dir, store):
+    nlist = 16
+    for lang in ("en", "ko"):
+        IVFIndex(*train_ivf(store.vectors[lang], nlist, n_iter=5)).save(store_dir, lang)
+    try:
+        index = SearchIndex(store)
+        assert "ivf" in index.modes("en")
+        q = stub_vector("english sentence 3")
+        exact = index.search(q, 10, mode="exact")
+        # 모든 클러스터를 보면 exact 와 같다
+        full = index.search(q, 10, mode="ivf", nprobe=nlist)
+        assert full[0].tolist() == exact[0].tolist()
+        # 일부만 봐도 자기 자신(중심점과 가장 가까운 클러스터)은 찾는다
+        assert index.search(q, 1, mode="ivf", nprobe=1)[0].tolist() == [7]
+    finally:
+        for lang in ("en", "ko"):
+            (store_dir / f"ivf_{lang}.npz").unlink()
+
+
+def test_stale_ivf_index_is_ignored(store_dir, store):
+    vectors = np.asarray(store.vectors["en"][:100])
+    IVFIndex(*train_ivf(vectors, 4, n_iter=2)).save(store_dir, "en")
+    try:
+        index = SearchIndex(store)
+        assert index.ivf["en"] is None
+        assert index.modes("en") == ["exact"]
+    finally:
+        (store_dir / "ivf_en.npz").unlink()
+
+
+@pytest.fixture
+def search_client(client, store, monkeypatch):
+    monkeypatch.setattr(search, "_index", SearchIndex(store))
+    return client
+
+
+def test_search_endpoint_reports_mode(search_client, monkeypatch):
+    resp = search_client.post("/search", json={"query": "english sentence 5", "k": 3})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["mode"] == "exact"
+    assert body["results"][0]["sentence_id"] == 11
+    assert len(body["results"]) == 3
+    # 기본 모드의 인덱스가 없으면 exact 로 대체
+    monkeypatch.setattr(search, "SEARCH_MODE", "ivf")
+    assert search_client.post("/search", json={"query": "x"}).json()["mode"] == "exact"
+
+
+def test_search_endpoint_rejects_unbuilt_mode(search_client):
+    resp = search_client.post("/search", json={"query": "english sentence 5", "mode": "ivf"})
+    assert resp.status_code == 400
+    assert "ivf" in resp.json()["detail"]
+
+
+def test_search_without_store_is_unavailable(client, monkeypatch):
+    monkeypatch.setattr(search, "_index", None)
+    assert client.post("/search", json={"query": "x"}).status_code == 503
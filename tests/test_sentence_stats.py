@@ -0,0 +1,105 @@
+"""
+scripts/load_data.py 적재 시 함께 저장하는 sentence_stats 테스트 (SQLite)
+
+실행: python -m pytest -q tests
+"""
+
+import csv
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import load_data  # noqa: E402
+from sqlalchemy import create_engine, func, select  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+ROWS = [
+    ("I like apples.", "나는 사과를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    ("I like pears.", "나는 배를 좋아한다.", "BEGINNER", "FOOD", "fruit", "manual"),
+    ("Where is the station?", "역이 어디예요?", "BEGINNER", "TRAVEL", "", "manual"),
+    ("It is raining today.", "오늘 비가 온다.", "STARTER", "DAILY", "weather", "tatoeba"),
+    ("The economy is slowing.", "경제가 둔화되고 있다.", "ADVANCED", "DAILY", "", "aihub"),
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sentences.sqlite3'}")
+    monkeypatch.setattr(load_data, "engine", engine)
+    monkeypatch.setattr(load_data, "Session", sessionmaker(bind=engine))
+    monkeypatch.setattr(load_data, "CSV_PATH", tmp_path / "cleansed_sentences.csv")
+    load_data.create_tables()
+    return engine
+
+
+def load(mode, rows, monkeypatch):
+    with open(load_data.CSV_PATH, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(load_data.CSV_COLUMNS)
+        writer.writerows(rows)
+    monkeypatch.setattr(load_data, "LOAD_MODE", mode)
+    return load_data.load_csv()
+
+
+def stats(engine) -> dict[tuple, int]:
+    table = load_data.SentenceStat.__table__
+    with engine.connect() as conn:
+        return {(load_data._text(d), c, s): n for d, c, s, n in conn.execute(select(table))}
+
+
+def grouped(engine) -> dict[tuple, int]:
+    """sentences 를 직접 GROUP BY 한 결과 (저장된 통계와 같아야 한다)"""
+    t = load_data.Sentence.__table__
+    with engine.connect() as conn:
+        return {(load_data._text(d), c, s): n for d, c, s, n in conn.execute(
+            select(t.c.difficulty, t.c.category, t.c.source, func.count()).group_by(
+                t.c.difficulty, t.c.category, t.c.source)
+        )}
+
+
+@pytest.mark.parametrize("mode", ["executemany", "orm", "sync"])
+def test_stats_match_loaded_rows(db, monkeypatch, mode):
+    load(mode, ROWS, monkeypatch)
+    assert stats(db) == grouped(db) == {
+        ("BEGINNER", "FOOD", "manual"): 2,
+        ("BEGINNER", "TRAVEL", "manual"): 1,
+        ("STARTER", "DAILY", "tatoeba"): 1,
+        ("ADVANCED", "DAILY", "aihub"): 1,
+    }
+
+
+@pytest.mark.parametrize("mode", ["executemany", "orm", "sync"])
+def test_reload_replaces_stats(db, monkeypatch, mode):
+    load(mode, ROWS, monkeypatch)
+    load(mode, ROWS[2:], monkeypatch)
+    # 사라진 조합은 남지 않는다
+    assert stats(db) == grouped(db)
+    assert ("BEGINNER", "FOOD", "manual") not in stats(db)
+
+
+def test_failed_load_keeps_previous_stats(db, monkeypatch):
+    load("executemany", ROWS, monkeypatch)
+    before = stats(db)
+    with open(load_data.CSV_PATH, "w", encoding="utf-8", newline="") as f:
+        f.write("wrong,header\n")
+    with pytest.raises(SystemExit):
+        load_data.load_csv()
+    assert stats(db) == before
+
+
+def test_print_stats_reads_stats_table(db, monkeypatch, capsys):
+    load("executemany", ROWS, monkeypatch)
+    # sentences 가 아니라 sentence_stats 만 읽는지: sentences 를 비워도 출력이 같다
+    with db.begin() as conn:
+        conn.execute(load_data.Sentence.__table__.delete())
+    capsys.readouterr()
+    load_data.print_stats()
+    out = capsys.readouterr().out
+    assert "총 문장 수: 5" in out
+    assert "BEGINNER       :        3" in out
+    assert "DAILY          :        2" in out
+    assert "manual         :        3" in out
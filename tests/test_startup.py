@@ -0,0 +1,88 @@
+"""
+app/startup.py 기동 단계 / 준비 상태(/health, /ready) 테스트
+
+실행: python -m pytest -q tests
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.startup import StartupState, state, warmup_texts
+
+
+def test_phases_run_in_order_and_are_timed():
+    s = StartupState()
+    order = []
+    s.run([("a", lambda: order.append("a")), ("b", lambda: order.append("b"))])
+    assert order == ["a", "b"]
+    assert s.ready and s.phase == "ready" and s.error is None
+    assert set(s.timings) == {"a", "b", "total"}
+
+
+def test_failed_phase_stops_startup():
+    s = StartupState()
+    order = []
+
+    def boom():
+        raise RuntimeError("model download failed")
+
+    s.run([("a", lambda: order.append("a")), ("model_load", boom), ("c", lambda: order.append("c"))])
+    assert order == ["a"]
+    assert not s.ready and s.phase == "failed"
+    assert s.error == "RuntimeError: model download failed"
+
+
+def test_background_start_and_wait():
+    s = StartupState()
+    s.start_background([("a", lambda: None)])
+    assert s.wait(timeout=2)
+    failed = StartupState()
+    failed.start_background([("a", lambda: 1 / 0)])
+    assert failed.wait(timeout=2) is False and failed.phase == "failed"
+
+
+@pytest.fixture
+def app_client(stub_model, monkeypatch):
+    for attr, value in (("ready", False), ("phase", "model_load"), ("error", None), ("timings", {})):
+        monkeypatch.setattr(state, attr, value)
+    return TestClient(main.app)
+
+
+def test_not_ready_rejects_model_requests(app_client):
+    assert app_client.get("/health").status_code == 200
+    resp = app_client.get("/ready")
+    assert resp.status_code == 503 and resp.json()["phase"] == "model_load"
+    resp = app_client.post("/judge", json={"en": "a", "ko": "b"})
+    assert resp.status_code == 503 and resp.headers["Retry-After"] == "1"
+
+
+def test_ready_after_startup(app_client):
+    state.run([("model_load", lambda: None)])
+    assert app_client.get("/ready").json()["status"] == "ready"
+    assert app_client.post("/judge", json={"en": "a", "ko": "b"}).status_code == 200
+
+
+def test_failure_after_startup_fails_liveness(app_client):
+    state.run([("model_load", lambda: None)])
+    state.fail("inference pool: replica 0 exited with code -9")
+    assert app_client.get("/health").status_code == 503
+    body = app_client.get("/ready").json()
+    assert body["status"] == "not_ready" and "replica 0" in body["error"]
+
+
+def test_warmup_shapes():
+    batch = warmup_texts(4, 12)
+    assert len(batch) == 4
+    assert len(batch[0].split()) == 12 and batch[0] == batch[2]
+    assert len(batch[1].split()) == 6
+
+
+def test_startup_phases_follow_settings(monkeypatch):
+    monkeypatch.setattr(main, "WARMUP_ENABLED", False)
+    monkeypatch.setattr(main, "CASCADE_ENABLED", False)
+    assert [name for name, _ in main._startup_phases()] == ["model_load", "inference_pool", "ref_store"]
+    monkeypatch.setattr(main, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(main, "CASCADE_ENABLED", True)
+    assert [name for name, _ in main._startup_phases()] == \
+        ["model_load", "cascade_model", "inference_pool", "ref_store", "warmup"]
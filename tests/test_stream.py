@@ -0,0 +1,158 @@
+"""
+app/stream.py NDJSON 스트리밍 채점(/judge/stream) 테스트: 청크 경계, 줄 단위 에러, 과부하 재시도, 흐름 제어
+
+실행: python -m pytest -q tests
+"""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from app import stream
+from app.model import InferenceOverloaded
+
+CHUNK = 2
+
+
+class FakeScorer:
+    """score_pairs 대역: 쌍마다 유사도 = en 길이 / 100, 처음 fail_times 번은 과부하"""
+
+    def __init__(self, fail_times: int = 0):
+        self.calls: list[list[str]] = []
+        self.fail_times = fail_times
+
+    def __call__(self, en, ko):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise InferenceOverloaded("queue full")
+        self.calls.append(list(en))
+        sims = np.array([len(e) / 100 for e in en], dtype=np.float32)
+        return sims, np.array(["ok"] * len(en), dtype=object)
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    fake = FakeScorer()
+    monkeypatch.setattr(stream, "score_pairs", fake)
+    monkeypatch.setattr(stream, "budget_errors", lambda en, ko: [None] * len(en))
+    monkeypatch.setattr(stream, "JUDGE_STREAM_CHUNK", CHUNK)
+    monkeypatch.setattr(stream, "_OVERLOAD_BACKOFF_SEC", 0)
+    return fake
+
+
+def line(en: str, ko: str = "한국어") -> bytes:
+    return json.dumps({"en": en, "ko": ko}).encode("utf-8") + b"\n"
+
+
+async def _body(parts):
+    for p in parts:
+        yield p
+
+
+def run(parts) -> list[dict]:
+    async def collect():
+        return b"".join([out async for out in stream.judge_ndjson(_body(parts))])
+
+    return [json.loads(x) for x in asyncio.run(collect()).splitlines()]
+
+
+def test_indices_follow_input_order_across_chunks(scorer):
+    texts = [f"sentence {'x' * i}" for i in range(5)]
+    out = run([line(t) for t in texts])
+    assert [r["index"] for r in out] == [0, 1, 2, 3, 4]
+    assert [r["similarity"] for r in out] == [pytest.approx(len(t) / 100, abs=1e-6) for t in texts]
+    # 청크 단위로 채점 (마지막은 남은 1줄)
+    assert [len(c) for c in scorer.calls] == [2, 2, 1]
+
+
+def test_lines_split_across_body_messages(scorer):
+    data = line("a") + line("bb") + line("ccc")
+    # 본문 메시지 경계가 줄 중간에 걸려도 같은 결과
+    out = run([data[i:i + 7] for i in range(0, len(data), 7)])
+    assert [r["similarity"] for r in out] == [pytest.approx(x) for x in (0.01, 0.02, 0.03)]
+
+
+def test_bad_lines_become_errors_in_place(scorer):
+    out = run([line("a"), b"{not json\n", b'{"en": "b"}\n', line("c")])
+    assert [r["index"] for r in out] == [0, 1, 2, 3]
+    assert "similarity" in out[0] and "similarity" in out[3]
+    assert "error" in out[1] and "similarity" not in out[1]
+    assert "ko" in out[2]["error"]
+    # 에러 줄은 채점하지 않는다
+    assert sum(scorer.calls, []) == ["a", "c"]
+
+
+def test_blank_lines_are_skipped(scorer):
+    out = run([line("a"), b"\n", b"   \n", line("b"), b"\n"])
+    assert [r["index"] for r in out] == [0, 1]
+
+
+def test_overlong_line_is_rejected_and_skipped(scorer, monkeypatch):
+    monkeypatch.setattr(stream, "JUDGE_STREAM_MAX_LINE_BYTES", 64)
+    long = line("x" * 200)
+    # 긴 줄이 여러 메시지로 나뉘어 와도 한 줄 에러로, 다음 줄은 정상
+    out = run([line("a"), long[:50], long[50:120], long[120:] + line("b")])
+    assert [r["index"] for r in out] == [0, 1, 2]
+    assert "exceeds 64 bytes" in out[1]["error"]
+    assert out[2]["similarity"] == pytest.approx(0.01)
+
+
+def test_last_line_without_newline(scorer):
+    out = run([line("a"), line("b")[:-1]])
+    assert [r["index"] for r in out] == [0, 1]
+
+
+def test_overload_is_retried(scorer):
+    scorer.fail_times = 2
+    out = run([line("a")])
+    assert out[0]["similarity"] == pytest.approx(0.01)
+
+
+def test_persistent_overload_fails_only_that_chunk(scorer, monkeypatch):
+    monkeypatch.setattr(stream, "_OVERLOAD_RETRIES", 2)
+    scorer.fail_times = 2
+    out = run([line("a"), line("b"), line("c")])
+    assert all("queue full" in r["error"] for r in out[:2])
+    assert out[2]["similarity"] == pytest.approx(0.01)
+
+
+def test_budget_errors_are_per_line(scorer, monkeypatch):
+    monkeypatch.setattr(stream, "budget_errors",
+                        lambda en, ko: ["too long" if e == "long" else None for e in en])
+    out = run([line("a"), line("long"), line("b")])
+    assert out[1]["error"] == "too long"
+    assert sum(scorer.calls, []) == ["a", "b"]
+
+
+def test_reading_stops_while_output_is_not_consumed(scorer):
+    read = []
+
+    async def body():
+        for i in range(20):
+            read.append(i)
+            yield line(f"s{i}")
+
+    async def first_output():
+        gen = stream.judge_ndjson(body())
+        first = await gen.__anext__()
+        # 소비자가 다음 출력을 가져가지 않는 동안은 더 읽지도, 더 채점하지도 않는다
+        await asyncio.sleep(0.05)
+        state = len(read), len(scorer.calls)
+        await gen.aclose()
+        return first, state
+
+    first, (n_read, n_scored) = asyncio.run(first_output())
+    assert [json.loads(x)["index"] for x in first.splitlines()] == [0, 1]
+    assert n_read <= 2 * CHUNK and n_scored <= 2
+
+
+def test_judge_stream_endpoint(client):
+    body = line("I like apples.", "나는 사과를 좋아한다.") + b"oops\n" + line("Hi.", "안녕.")
+    r = client.post("/judge/stream", content=body, headers={"content-type": "application/x-ndjson"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    out = [json.loads(x) for x in r.text.splitlines()]
+    assert [r["index"] for r in out] == [0, 1, 2]
+    assert "label" in out[0] and "error" in out[1] and "label" in out[2]
@@ -0,0 +1,113 @@
+"""
+app/model.py 요청별 토큰 예산 (EMBED_MAX_TOKENS / EMBED_OVERLENGTH) 테스트 (스텁 토크나이저: 단어 = 토큰)
+
+실행: python -m pytest -q tests
+"""
+
+import pytest
+
+from app import model
+from app.metrics import TOKEN_BUDGET
+from app.model import InputTooLong, apply_token_budget, encode_bucketed, over_budget, token_budget
+from conftest import StubTokenizer, stub_encode
+
+
+class ZeroWidthTokenizer(StubTokenizer):
+    """SentencePiece 의 단독 "▁" 처럼 단어마다 폭 0 토큰이 앞에 붙는 토크나이저"""
+
+    def spans(self, text):
+        return [span for s, e in super().spans(text) for span in ((s, s), (s, e))]
+
+
+def counter(action: str) -> float:
+    return TOKEN_BUDGET._values.get((action,), 0.0)
+
+
+@pytest.fixture
+def budget(stub_model, monkeypatch):
+    # 특수 토큰 2개 + 단어 4개
+    monkeypatch.setattr(model, "EMBED_MAX_TOKENS", 6)
+    return stub_model
+
+
+def test_budget_is_capped_by_model_max_length(stub_model, monkeypatch):
+    assert token_budget() == stub_model.max_seq_length
+    monkeypatch.setattr(model, "EMBED_MAX_TOKENS", 10_000)
+    assert token_budget() == stub_model.max_seq_length
+    monkeypatch.setattr(model, "EMBED_MAX_TOKENS", 6)
+    assert token_budget() == 6
+
+
+def test_inputs_within_budget_are_untouched(budget):
+    texts = ["one", "one two three four"]
+    out, lengths = apply_token_budget(texts)
+    assert out is texts
+    assert lengths == [3, 6]
+
+
+def test_truncate_cuts_at_last_token_in_budget(budget):
+    before = counter("truncated")
+    out, lengths = apply_token_budget(["short", "one two three four five six", "a  b c d e"])
+    assert out == ["short", "one two three four", "a  b c d"]
+    assert lengths == [3, 6, 6]
+    assert counter("truncated") == before + 2
+
+
+def test_truncate_with_zero_width_tokens(budget):
+    budget.tokenizer = ZeroWidthTokenizer()
+    # 폭 0 토큰 때문에 예산 안의 실제 단어는 2개뿐
+    out, lengths = apply_token_budget(["alpha beta gamma delta", "x"])
+    assert out == ["alpha beta", "x"]
+    assert lengths[0] == 6
+
+
+def test_truncate_when_every_kept_token_is_zero_width(budget):
+    class AllZero(StubTokenizer):
+        def spans(self, text):
+            return [(s, s) for s, _ in super().spans(text)]
+
+    budget.tokenizer = AllZero()
+    out, _ = apply_token_budget(["one two three four five six"])
+    assert out == [""]
+
+
+def test_reject_raises_and_flags_items(budget, monkeypatch):
+    monkeypatch.setattr(model, "EMBED_OVERLENGTH", "reject")
+    before = counter("rejected")
+    with pytest.raises(InputTooLong, match="6 tokens"):
+        apply_token_budget(["fine", "one two three four five"])
+    assert over_budget(["fine", "one two three four five", "a b c d"]) == [False, True, False]
+    assert counter("rejected") == before + 2
+
+
+def test_over_budget_is_a_no_op_when_truncating(budget):
+    assert over_budget(["one two three four five six seven"]) == [False]
+    assert over_budget([]) == []
+
+
+def test_api_reports_over_budget_inputs(client, monkeypatch):
+    monkeypatch.setattr(model, "EMBED_MAX_TOKENS", 6)
+    monkeypatch.setattr(model, "EMBED_OVERLENGTH", "reject")
+    long = "one two three four five"
+    assert client.post("/embed", json={"text": long + " unique"}).status_code == 413
+    results = client.post("/judge/batch", json={"items": [
+        {"en": "fine", "ko": "좋다"}, {"en": long, "ko": "길다"},
+    ]}).json()["results"]
+    assert results[0]["label"] is not None
+    assert results[1]["error"] == "en: input exceeds token budget (6 tokens)"
+
+
+def test_encode_bucketed_groups_by_length_and_keeps_order():
+    calls = []
+
+    def encode(texts):
+        calls.append(list(texts))
+        return stub_encode(texts)
+
+    texts = ["a", "b", "c", "d", "e"]
+    out = encode_bucketed(encode, texts, [3, 20, 5, 40, 18], [16, 32])
+    assert sorted(calls) == [["a", "c"], ["b", "e"], ["d"]]
+    assert (out == stub_encode(texts)).all()
+    calls.clear()
+    encode_bucketed(encode, texts, [3, 4, 5, 6, 7], [16, 32])
+    assert calls == [texts]
@@ -0,0 +1,77 @@
+"""
+app/vector_codec.py 바이너리 직렬화와 /embed/full 응답 형식 테스트 (스텁 인코더)
+
+실행: python -m pytest -q tests
+"""
+
+import base64
+
+import numpy as np
+import pytest
+
+from app import vector_codec
+from conftest import DIM, stub_encode
+
+TEXTS = ["I like apples.", "Where is the station?", "It is raining today."]
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_pack_unpack_round_trip(dtype):
+    vecs = stub_encode(TEXTS)
+    out = vector_codec.unpack(vector_codec.pack(vecs, dtype))
+    assert out.dtype == np.dtype(dtype) and out.shape == vecs.shape
+    assert np.array_equal(out, vecs.astype(dtype))
+
+
+def test_header_layout():
+    vecs = stub_encode(TEXTS)
+    buf = vector_codec.pack(vecs, "float16")
+    assert vector_codec.HEADER.size == 16
+    assert vector_codec.HEADER.unpack_from(buf) == (b"TMIE", 1, 1, 0, 3, DIM)
+    # 본문은 행 우선 float16
+    assert len(buf) == 16 + 3 * DIM * 2
+    assert buf[16:] == vecs.astype("<f2").tobytes()
+
+
+def test_empty_matrix():
+    vecs = np.zeros((0, DIM), dtype=np.float32)
+    assert vector_codec.unpack(vector_codec.pack(vecs)).shape == (0, DIM)
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda b: b"XXXX" + b[4:],          # magic
+    lambda b: b[:4] + b"\x02" + b[5:],  # version
+    lambda b: b[:5] + b"\x07" + b[6:],  # dtype
+])
+def test_unpack_rejects_foreign_buffers(mutate):
+    buf = vector_codec.pack(stub_encode(TEXTS))
+    with pytest.raises(ValueError):
+        vector_codec.unpack(mutate(buf))
+
+
+def test_to_bytes_has_no_header():
+    vecs = stub_encode(TEXTS)
+    assert vector_codec.to_bytes(vecs) == vecs.astype("<f4").tobytes()
+
+
+def test_embed_full_binary(client):
+    r = client.post("/embed/full", json={"texts": TEXTS, "dtype": "float16"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/octet-stream"
+    assert r.headers["x-embedding-shape"] == f"3,{DIM}"
+    assert r.headers["x-embedding-dtype"] == "float16"
+    assert np.array_equal(vector_codec.unpack(r.content), stub_encode(TEXTS).astype("float16"))
+
+
+def test_embed_full_base64(client):
+    r = client.post("/embed/full", json={"texts": TEXTS, "format": "base64"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["shape"] == [3, DIM] and body["dtype"] == "float32" and body["byteorder"] == "little"
+    out = np.frombuffer(base64.b64decode(body["data"]), dtype="<f4").reshape(body["shape"])
+    assert np.allclose(out, stub_encode(TEXTS))
+
+
+def test_embed_full_validates_request(client):
+    assert client.post("/embed/full", json={"texts": []}).status_code == 422
+    assert client.post("/embed/full", json={"texts": ["a"], "dtype": "int8"}).status_code == 422
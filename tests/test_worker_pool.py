@@ -0,0 +1,183 @@
+"""
+app/worker_pool.py 멀티 프로세스 추론 풀 테스트 (레플리카는 실제 spawn 프로세스, 모델은 스텁)
+
+torch 가 없는 환경에서는 풀이 쓰는 부분(multiprocessing, set_num_threads, inference_mode)만 흉내 내는
+최소 대역 패키지를 sys.path 앞에 둔다 (spawn 된 레플리카도 부모의 sys.path 를 그대로 받는다).
+
+실행: python -m pytest -q tests
+"""
+
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app import worker_pool
+from app.metrics import INPUT_TOKENS, STAGE_LATENCY
+from app.worker_pool import InferenceOverloaded, InferencePool, InferenceUnavailable, split_cpus
+from conftest import stub_encode
+
+_TORCH_SHIM = '''
+import contextlib
+import multiprocessing
+
+
+def set_num_threads(n):
+    pass
+
+
+def inference_mode():
+    return contextlib.nullcontext()
+'''
+
+
+class _Mask:
+    def __init__(self, lengths):
+        self.lengths = lengths
+
+    def sum(self, dim):
+        return np.array(self.lengths)
+
+
+class FakeModel:
+    """레플리카로 pickle 되어 넘어가는 스텁 모델. 특정 입력으로 오류/지연/프로세스 종료를 흉내 낸다"""
+
+    def share_memory(self):
+        pass
+
+    def tokenize(self, texts):
+        return {"attention_mask": _Mask([len(t.split()) + 2 for t in texts])}
+
+    def encode(self, texts, output_value="sentence_embedding", **kwargs):
+        self.tokenize(texts)
+        if "crash" in texts:
+            os._exit(3)
+        if "slow" in texts:
+            time.sleep(1.0)
+        if "error" in texts:
+            raise ValueError("bad input")
+        vecs = stub_encode(texts)
+        if output_value is None:
+            return [{"sentence_embedding": v, "token_embeddings": np.stack([v, v])} for v in vecs]
+        return vecs
+
+
+def _die_while_loading():
+    os._exit(4)
+
+
+@pytest.fixture(scope="module")
+def mp_env(tmp_path_factory):
+    shim = None
+    with pytest.MonkeyPatch.context() as mp:
+        try:
+            import torch  # noqa: F401
+        except ImportError:
+            shim = tmp_path_factory.mktemp("torch_shim")
+            (shim / "torch").mkdir()
+            (shim / "torch" / "__init__.py").write_text(_TORCH_SHIM, encoding="utf-8")
+            (shim / "torch" / "multiprocessing.py").write_text(
+                "from multiprocessing import *  # noqa: F401,F403\n", encoding="utf-8")
+            mp.syspath_prepend(str(shim))
+        # 레플리카 사망 감지 주기를 짧게
+        mp.setattr(worker_pool, "_POLL_S", 0.1)
+        yield
+    if shim is not None:
+        # 다른 테스트가 대역 torch 를 보지 않도록
+        for name in ("torch", "torch.multiprocessing"):
+            sys.modules.pop(name, None)
+
+
+@pytest.fixture(scope="module")
+def pool(mp_env):
+    pool = InferencePool(FakeModel(), None, replicas=1, max_pending=1, queue_timeout_ms=100)
+    yield pool
+    pool.close()
+
+
+def count(histogram, *labels) -> int:
+    series = histogram._series.get(labels)
+    return series[-1] if series else 0
+
+
+def test_encode_round_trip(pool):
+    texts = ["I like apples.", "나는 사과를 좋아한다."]
+    assert np.allclose(pool.encode(texts), stub_encode(texts))
+    assert pool.replicas == 1
+
+
+def test_token_vectors_come_back_as_numpy(pool):
+    out = pool.encode(["a b"], output_value=None)
+    assert isinstance(out[0]["token_embeddings"], np.ndarray)
+    assert out[0]["token_embeddings"].shape == (2, out[0]["sentence_embedding"].shape[0])
+
+
+def test_tokenize_metrics_are_recorded_in_parent(pool):
+    seconds, tokens = count(STAGE_LATENCY, "tokenize"), count(INPUT_TOKENS)
+    pool.encode(["one two", "three"])
+    # 결과와 함께 돌아온 지표는 결과 스레드가 기록한다 (encode 반환 전에 기록됨)
+    assert count(STAGE_LATENCY, "tokenize") == seconds + 1
+    assert count(INPUT_TOKENS) == tokens + 2
+
+
+def test_replica_error_fails_only_that_task(pool):
+    with pytest.raises(RuntimeError, match="ValueError: bad input"):
+        pool.encode(["error"])
+    assert pool.error is None
+    assert pool.encode(["fine"]).shape[0] == 1
+
+
+def test_full_pool_rejects_with_overloaded(pool):
+    slow = threading.Thread(target=pool.encode, args=(["slow"],))
+    slow.start()
+    deadline = time.monotonic() + 2
+    while not pool._pending:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+    with pytest.raises(InferenceOverloaded):
+        pool.encode(["rejected"])
+    slow.join(5)
+    assert pool.encode(["after"]).shape[0] == 1
+
+
+def test_task_timeout_frees_the_slot(pool, monkeypatch):
+    monkeypatch.setattr(worker_pool, "INFERENCE_TASK_TIMEOUT_S", 0.2)
+    with pytest.raises(InferenceUnavailable, match="timed out"):
+        pool.encode(["slow"])
+    assert pool._pending == {}
+    monkeypatch.setattr(worker_pool, "INFERENCE_TASK_TIMEOUT_S", 10)
+    # 늦게 도착한 결과는 버려지고 다음 작업은 정상 처리
+    assert np.allclose(pool.encode(["after timeout"]), stub_encode(["after timeout"]))
+
+
+def test_dead_replica_fails_pending_tasks_and_notifies(mp_env):
+    failures = []
+    pool = InferencePool(FakeModel(), None, replicas=1, on_failure=failures.append)
+    try:
+        with pytest.raises(InferenceUnavailable, match="exited with code 3"):
+            pool.encode(["crash"])
+        assert failures and "exited with code 3" in failures[0]
+        assert pool.error is not None and pool._pending == {}
+        # 이후 요청은 기다리지 않고 바로 실패
+        start = time.monotonic()
+        with pytest.raises(InferenceUnavailable):
+            pool.encode(["next"])
+        assert time.monotonic() - start < 0.5
+    finally:
+        pool.close()
+
+
+def test_replica_dying_during_startup_fails_construction(mp_env):
+    with pytest.raises(RuntimeError, match="exited with code 4"):
+        InferencePool(None, _die_while_loading, replicas=1, share_weights=False)
+
+
+def test_split_cpus_partitions_available_cpus():
+    cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    sets = split_cpus(len(cpus))
+    assert sorted(c for s in sets for c in s) == cpus
+    # CPU 보다 레플리카가 많으면 모두 전체 집합을 공유
+    assert split_cpus(len(cpus) + 1) == [cpus] * (len(cpus) + 1)
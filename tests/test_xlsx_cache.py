@@ -0,0 +1,120 @@
+"""
+scripts/xlsx_cache.py 컬럼형 xlsx 캐시 테스트: 원본과 같은 값, 캐시 재사용, 원본 변경 시 재생성
+
+실행: python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import xlsx_cache  # noqa: E402
+from conftest import write_xlsx  # noqa: E402
+
+ROWS = [
+    ("SID", "원문", "번역문", "비고"),
+    (1, "나는 사과를 좋아한다.", "I like apples.", None),
+    (2, "역이 어디예요?", "Where is the station?", 3.5),
+    (3, None, "", True),
+    (4, "이모지 😀 포함", "emoji 😀 inside", False),
+    (5, "짧은 행", "short row"),
+]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "xlsx_cache"
+    monkeypatch.setattr(xlsx_cache, "XLSX_CACHE_DIR", directory)
+    monkeypatch.setattr(xlsx_cache, "XLSX_CACHE", True)
+    return directory
+
+
+def openpyxl_rows(path, **kwargs) -> list[tuple]:
+    wb = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return list(wb[wb.sheetnames[0]].iter_rows(values_only=True, **kwargs))
+    finally:
+        wb.close()
+
+
+def cached_rows(path, **kwargs) -> list[tuple]:
+    wb = xlsx_cache.load_workbook(path)
+    try:
+        return list(wb[wb.sheetnames[0]].iter_rows(values_only=True, **kwargs))
+    finally:
+        wb.close()
+
+
+def test_cached_values_match_openpyxl(cache_dir, tmp_path):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    got = cached_rows(path)
+    assert got == openpyxl_rows(path)
+    # 타입도 그대로 (bool 이 int 로, int 가 str 로 바뀌지 않는다)
+    assert [type(v) for v in got[2]] == [int, str, str, float]
+    assert got[3][3] is True and got[4][3] is False
+
+
+def test_sheet_metadata(cache_dir, tmp_path):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS, sheet="말뭉치")
+    wb = xlsx_cache.load_workbook(path)
+    ws = wb["말뭉치"]
+    assert wb.sheetnames == ["말뭉치"]
+    assert (ws.max_row, ws.max_column, ws.rows) == (6, 4, 6)
+
+
+@pytest.mark.parametrize("kwargs", [{"min_row": 2}, {"min_row": 3, "max_row": 4}, {"max_row": 100}])
+def test_row_ranges(cache_dir, tmp_path, kwargs):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    assert cached_rows(path, **kwargs) == openpyxl_rows(path, **kwargs)
+
+
+def test_small_blocks_give_same_rows(cache_dir, tmp_path, monkeypatch):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    expected = cached_rows(path)
+    monkeypatch.setattr(xlsx_cache, "BLOCK_ROWS", 2)
+    assert cached_rows(path) == expected
+    assert cached_rows(path, min_row=2) == expected[1:]
+
+
+def test_second_load_reads_cache_only(cache_dir, tmp_path, monkeypatch):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    first = xlsx_cache.build_cache(path)
+    expected = openpyxl_rows(path)
+
+    def no_openpyxl(*args, **kwargs):
+        raise AssertionError("xlsx parsed again")
+
+    monkeypatch.setattr(openpyxl, "load_workbook", no_openpyxl)
+    assert xlsx_cache.build_cache(path) == first
+    assert cached_rows(path) == expected
+
+
+def test_changed_source_rebuilds_and_removes_old_cache(cache_dir, tmp_path):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    old = xlsx_cache.build_cache(path)
+    write_xlsx(path, ROWS[:3])
+    assert cached_rows(path) == openpyxl_rows(path)
+    new = xlsx_cache.cache_dir_for(path)
+    assert new != old and new.exists() and not old.exists()
+
+
+def test_file_hash_is_reused_while_file_is_unchanged(cache_dir, tmp_path, monkeypatch):
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    digest = xlsx_cache.file_sha1(path)
+
+    class NoHash:
+        def __init__(self):
+            raise AssertionError("file hashed again")
+
+    monkeypatch.setattr(xlsx_cache.hashlib, "sha1", NoHash)
+    assert xlsx_cache.file_sha1(path) == digest
+
+
+def test_cache_disabled_uses_openpyxl(cache_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(xlsx_cache, "XLSX_CACHE", False)
+    path = write_xlsx(tmp_path / "corpus.xlsx", ROWS)
+    assert cached_rows(path) == openpyxl_rows(path)
+    assert not cache_dir.exists()